@@ -7,6 +7,7 @@ import sys
 import getopt
 from shutil import move
 from os import remove
+from cocopp.pproc import replaceinfo
 
 """Modify meta information in raw experimental data.
 
@@ -137,21 +138,8 @@ def main(argv=None):
                 newline = line
                 # check if something needs to be changed:
                 if line.find('algId =') >= 0 or line.find('algorithm =') >= 0:
-                    s = line.split(', ')
-                    for i, word in enumerate(s):
-                        if word.find('algId') >= 0:
-                            # replace algId:
-                            s[i] = "algId = '" + algId + "'"
-                            if len(s) == i+1:
-                                # algId or algorithm last entry in this line
-                                s[i] = s[i] + "\n"
-                        elif word.find('algorithm') >= 0:
-                            # replace algId:
-                            s[i] = "algorithm = '" + algId + "'"
-                            if len(s) == i+1:
-                                # algId or algorithm last entry in this line
-                                s[i] = s[i] + "\n"
-                    newline = ", ".join(s)
+                    # replace algId, like cocopp reads it, also when it contains ', '
+                    newline = replaceinfo(line, {'algId': algId, 'algorithm': algId})
 
                 else:
                     s = line.split()
@@ -91,31 +91,76 @@ background with
 """
 
 from __future__ import absolute_import
+import os as _os
 import sys as _sys
+import importlib as _importlib
 
-import matplotlib  # just to make sure the following is actually done first
-matplotlib.use('Agg')  # To avoid window popup and use without X forwarding
-del matplotlib
+# To avoid window popup and use without X forwarding, without importing
+# matplotlib before it is needed
+if 'matplotlib' in _sys.modules:
+    _sys.modules['matplotlib'].use('Agg')
+else:
+    _os.environ['MPLBACKEND'] = 'Agg'
 
 from numpy.random import seed as set_seed
 
 from .cococommands import *  # outdated
-from . import config
 from . import archiving
-from . import rungeneric
 from . import genericsettings
 
-from .rungeneric import main
-
 from ._version import __version__
 
 __all__ = []
 
-archives = archiving.official_archives  # just an alias
-if archives is not None:
-    data_archive = archives.all  # another alias, only for historical reasons
-    archives.link_as_attributes_in(_sys.modules['cocopp'],  # more individual aliases
-                                   except_for=['all', 'test'])
+_archive_names = [name.replace('-', '_') for name in archiving.OfficialArchives().names
+                  if name not in ('all', 'test')]
+
+def __getattr__(name):
+    """import `main`, the archives and the submodules on first access.
+
+    `archives` (an alias for `archiving.official_archives`), `data_archive`
+    (alias for ``archives.all``, only for historical reasons), the
+    individual archives like `bbob`, `main` and the plotting modules
+    (which import `matplotlib.pyplot`) are not loaded with ``import
+    cocopp`` but when they are first used (PEP 562).
+    """
+    if name.startswith('__'):
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    if name in ('archives', 'official_archives'):
+        value = archiving.official_archives
+    elif name == 'data_archive':
+        value = archiving.official_archives.all
+    elif name in _archive_names:
+        value = getattr(archiving.official_archives, name)
+    elif name == 'main':
+        from .rungeneric import main as value
+    else:
+        try:
+            return _importlib.import_module('.' + name, __name__)
+        except ImportError as e:
+            if getattr(e, 'name', None) != __name__ + '.' + name:
+                raise
+            raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """return the module attributes including those loaded on first access.
+
+    >>> import cocopp
+    >>> 'main' in dir(cocopp), 'archives' in dir(cocopp)
+    (True, True)
+
+    """
+    return sorted(set(globals()) | {'main', 'archives', 'official_archives',
+                                    'data_archive', 'config', *_archive_names})
+
+class _Lazy(object):
+    """class attribute returning the `cocopp` attribute of the same name"""
+    def __init__(self, name):
+        self.name = name
+    def __get__(self, obj, cls=None):
+        return getattr(_sys.modules[__name__], self.name)
 
 # data_archive = 'use `archives.all` instead'
 # bbob = 'use `archives.bbob` instead'
@@ -140,13 +185,13 @@ class Interface:
     @classmethod
     def dir(cls):
         """return `dict` of non-private class attribute names->values"""
-        return dict(it for it in cls.__dict__.items()
-                    if not it[0].startswith('_') and not it[0] == 'dir')
-    archives = archives
-    config = config
+        return dict((name, getattr(cls, name)) for name in cls.__dict__
+                    if not name.startswith('_') and not name == 'dir')
+    archives = _Lazy('archives')
+    config = _Lazy('config')
     genericsettings = genericsettings
     load = load
-    main = main
+    main = _Lazy('main')
 
 # clean up namespace
 del absolute_import
@@ -74,6 +74,10 @@ import time as _time
 import warnings
 import hashlib
 import ast
+import re
+import json
+import posixpath
+import collections
 import platformdirs
 
 from . import toolsdivers as _td  # StrList
@@ -106,6 +110,16 @@ cocopp_home_archives = default_archive_location
 listing_file_start = 'list_'
 listing_file_extension = '.txt'
 backup_last_filename = ''  # global variable to see whether and where a backup was made
+definitions_ttl = 0
+"""seconds during which a downloaded definition file is considered fresh
+   and `COCODataArchive.update` does not contact the remote location"""
+definitions_timeout = 20
+"""timeout in seconds for the request of a remote definition file"""
+_validators_filename = '.coco_archive_definition_validators.json'
+_file_stats_filename = '.coco_archive_file_stats.json'
+download_pipeline = None
+"""the started `DownloadPipeline` or `None`, while started, `COCODataArchive.get`
+   defers downloads to the pipeline"""
 
 if (not os.path.exists(default_archive_location) and
     os.path.exists(os.path.join(cocopp_home, 'data-archives'))):
@@ -211,8 +225,11 @@ def _definition_file_to_write(local_path_or_filename,
 
 def _hash(file_name, hash_function=hashlib.sha256):
     """compute hash of file `file_name`"""
+    hash_ = hash_function()
     with open(file_name, 'rb') as file_:
-        return hash_function(file_.read()).hexdigest()
+        for block in iter(lambda: file_.read(2**20), b''):  # don't read large files at once
+            hash_.update(block)
+    return hash_.hexdigest()
 
 def _str_to_list(str_or_list):
     """try to return a non-string iterable in either case"""
@@ -250,10 +267,104 @@ def _url_add(folder, url):
         with open(_definition_file_to_write(folder), 'wt') as f:
             f.write(_repr_definitions([('_url_', url)] + defs))
 
-def _download_definitions(url, target_folder):
-    """download definition file and sync url into it"""
-    _urlretrieve(url + '/' + default_definition_filename,
-                 _definition_file_to_write(target_folder))
+def _download_definitions(url, target_folder, ttl=None):
+    """download definition file if it has changed and return the status.
+
+    The request is conditional on the ``ETag`` and ``Last-Modified``
+    validators of the previous download, which are kept in a hidden file
+    in `target_folder`, hence the definition file is only transferred
+    when it has changed. Within `ttl` seconds (default: `definitions_ttl`)
+    after the last successful request, the remote location is not
+    contacted at all. When the request fails, an existing definition
+    file is still used with a warning.
+
+    Return ``'updated'``, ``'not modified'``, ``'fresh'`` (`ttl` has not
+    expired) or ``'stale'`` (the request failed).
+
+    >>> import os, threading, tempfile, warnings, functools
+    >>> from http.server import HTTPServer, SimpleHTTPRequestHandler
+    >>> from cocopp import archiving
+    >>> remote, local = tempfile.mkdtemp(), tempfile.mkdtemp()
+    >>> with open(os.path.join(remote, archiving.default_definition_filename), 'w') as f:
+    ...     _ = f.write("[('a.tgz', '1234', 1)]")
+    >>> class Handler(SimpleHTTPRequestHandler):
+    ...     unavailable = False
+    ...     def log_message(self, *args): pass
+    ...     def do_GET(self):
+    ...         if self.unavailable:
+    ...             return self.send_error(503)
+    ...         return super().do_GET()
+    >>> server = HTTPServer(('127.0.0.1', 0), functools.partial(Handler, directory=remote))
+    >>> threading.Thread(target=server.serve_forever, daemon=True).start()
+    >>> url = 'http://127.0.0.1:%d' % server.server_port
+    >>> archiving._download_definitions(url, local)
+    'updated'
+    >>> archiving._download_definitions(url, local)
+    'not modified'
+    >>> archiving._download_definitions(url, local, ttl=3600)
+    'fresh'
+    >>> Handler.unavailable = True
+    >>> with warnings.catch_warnings():
+    ...     warnings.simplefilter('ignore')
+    ...     archiving._download_definitions(url, local)
+    'stale'
+    >>> server.shutdown(); server.server_close()
+    >>> with warnings.catch_warnings():
+    ...     warnings.simplefilter('ignore')
+    ...     archiving._download_definitions(url, local)
+    'stale'
+    >>> archiving.read_definition_file(local)
+    [('a.tgz', '1234', 1)]
+
+    """
+    from urllib.request import Request, urlopen
+    from urllib.error import HTTPError
+    if ttl is None:
+        ttl = definitions_ttl
+    definition_file = _definition_file_to_read(target_folder)
+    validators_file = os.path.join(os.path.dirname(definition_file), _validators_filename)
+    validators = {}
+    if os.path.isfile(definition_file) and os.path.isfile(validators_file):
+        try:
+            with open(validators_file, 'rt') as f:
+                validators = json.load(f)
+        except Exception:
+            pass
+        if validators.get('url') != url:
+            validators = {}
+    if validators and ttl and _time.time() - validators.get('checked', 0) < ttl:
+        return 'fresh'
+    request = Request(url + '/' + default_definition_filename)
+    if validators.get('etag'):
+        request.add_header('If-None-Match', validators['etag'])
+    if validators.get('last_modified'):
+        request.add_header('If-Modified-Since', validators['last_modified'])
+    try:
+        with urlopen(request, timeout=definitions_timeout) as response:
+            content = response.read()
+            headers = response.headers
+    except Exception as e:
+        if not (isinstance(e, HTTPError) and e.code == 304 and validators):
+            if not os.path.isfile(definition_file):
+                raise
+            warnings.warn('Using the existing definition file\n  %s\nbecause requesting'
+                          ' %s failed with\n  %s' % (definition_file, request.full_url, e))
+            return 'stale'
+        status = 'not modified'
+    else:
+        status = 'updated'
+        with open(_definition_file_to_write(target_folder), 'wb') as f:
+            f.write(content)
+        validators = {'url': url, 'etag': headers.get('ETag'),
+                      'last_modified': headers.get('Last-Modified')}
+    validators['checked'] = _time.time()
+    try:
+        with open(validators_file, 'wt') as f:
+            json.dump(validators, f)
+    except Exception as e:
+        warnings.warn('could not write %s (%s)' % (validators_file, str(e)))
+    if status == 'not modified':
+        return status
     try:
         read_definition_file(_definition_file_to_read(target_folder))
     except:
@@ -264,24 +375,28 @@ def _download_definitions(url, target_folder):
                       % (url + '/' + default_definition_filename,
                          _definition_file_to_read(target_folder)))
         raise
+    return status
 
-def _get_remote(url, target_folder=None, redownload=False):
+def _get_remote(url, target_folder=None, redownload=False, ttl=None):
     """return remote data archive as `COCODataArchive` instance.
 
     If necessary, the archive is "created" by downloading the definition file
-    from `url` to `target_folder` which doesn't need to exist.
+    from `url` to `target_folder` which doesn't need to exist. With
+    `redownload`, the definition file is downloaded if it has changed,
+    see `_download_definitions` for `ttl`.
     
     Details: The target folder name is by default derived from the `url` and
     created within ``default_archive_location == .../Caches/cocopp/das``.
     """
     key = url
+    official_archives = _get_official_archives()
     url = official_archives.url(url) or url.rstrip('/')
     target_folder = target_folder or _url_to_folder_name(url)
     # if key in official_archives.names:  # old code
     #     _move_official_local_data()  # once and for all
     if redownload or not os.path.exists(_definition_file_to_read(target_folder)):
         _makedirs(target_folder)
-        _download_definitions(url, target_folder)
+        _download_definitions(url, target_folder, ttl)
         _url_add(target_folder, url)
         if not official_archives.url(key) and url not in official_archives.urls.values():
             ArchivesKnown.register(url)
@@ -335,6 +450,7 @@ def get(url_or_folder=None):
 
     See also: `get_all`, `get_extended`.
     """
+    official_archives = _get_official_archives()
     if url_or_folder in (None, 'help'):
         raise ValueError(
                   '"Officially" available archives are\n    %s\n'
@@ -360,7 +476,7 @@ def read_definition_file(local_path_or_definition_file):
                 "\n  '%s'\nThe file may have the wrong format." % filename)
             raise
 
-def create(local_path):
+def create(local_path, full=False, max_workers=None):
     """create a definition file for an existing local "archive" of data.
 
     The archive in `local_path` must have been prepared such that it
@@ -371,6 +487,12 @@ def create(local_path):
     files carefully as they become the displayed algorithm names.
 
     If a definition file already exists it is backed up and replaced.
+    The hashes of its entries are reused for files which have the same
+    size in bytes and modification time as when the definition file was
+    written, unless `full` is true. Sizes and times are kept in a hidden
+    file next to the definition file. All other files are hashed in
+    parallel with `max_workers` threads (by default as chosen by
+    `concurrent.futures.ThreadPoolExecutor`).
 
     The "created" archive is registered with `ArchivesLocal` serving as a
     user-owned machine-wide memory. ``cocopp.archiving.ArchivesLocal()``
@@ -399,13 +521,30 @@ def create(local_path):
     immediately, but only "on demand".
 
     """
+    import concurrent.futures
     backup_file = backup_last_filename
     definition_file = _definition_file_to_write(local_path)
     if backup_file != backup_last_filename:
         warnings.warn("previous definition file has been back upped to %s"
                       % backup_last_filename)
     full_local_path = os.path.split(definition_file)[0]
+    stats_file = os.path.join(full_local_path, _file_stats_filename)
+    known = {}  # name: (hash, size in kB) of files unchanged since the last `create`
+    known_stats = {}  # name: [size in bytes, modification time in ns]
+    if not full and os.path.isfile(definition_file) and os.path.isfile(stats_file):
+        definition_mtime = os.path.getmtime(definition_file)
+        try:
+            known = dict((entry[0], entry[1:]) for entry in read_definition_file(definition_file)
+                         if len(entry) == 3)
+            with open(stats_file, 'rt') as f:
+                known_stats = json.load(f)
+        except Exception as e:
+            known = {}
+            warnings.warn("hashing all files, because reading %s failed with %s"
+                          % (definition_file, str(e)))
     res = []
+    stats = {}
+    to_hash = []  # (name, path, size in kB)
     for dirpath, _dirnames, filenames in os.walk(full_local_path):
         for filename in filenames:
             fnlower = filename.lower()
@@ -426,23 +565,262 @@ def create(local_path):
                 # print(dirpath, local_path, name, filename)
                 name = '/'.join([name, filename]) if name else filename
                 path = os.path.join(dirpath, filename)
-                res += [(name,
-                         _hash(path),
-                         int(os.path.getsize(path) // 1000))] # or os.stat(path).st_size
+                stat = os.stat(path)
+                size = int(stat.st_size // 1000)
+                stats[name] = [stat.st_size, stat.st_mtime_ns]
+                if (name in known and known_stats.get(name) == stats[name]
+                        and stat.st_mtime < definition_mtime):
+                    res += [(name, known[name][0], size)]
+                else:
+                    to_hash += [(name, path, size)]
                 if 'L)' in name:
                     raise ValueError("Name '%s' at %s contains 'L)' which"
                                      " is not allowed."
                                      "\nPlease change the filename."
                                      % (name, path))
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        hashes = executor.map(_hash, [path for _name, path, _size in to_hash])
+        res += [(name, hash_, size) for (name, _path, size), hash_ in zip(to_hash, hashes)]
     if not len(res):
         warnings.warn('cocopp.archiving.create: no data found in %s' % local_path)
         return
     with open(definition_file, 'wt') as file_:
         file_.write(_repr_definitions(res).replace('L)', ')'))
+    try:
+        with open(stats_file, 'wt') as f:
+            json.dump(stats, f)
+    except Exception as e:
+        warnings.warn('could not write %s (%s)' % (stats_file, str(e)))
     ArchivesLocal.register(full_local_path)  # to find splattered local archives easily
     return COCODataArchive(full_local_path)
 
 
+def _data_file_references(info_text):
+    """return the data file names referenced in the text of an ``.info`` file"""
+    res = []
+    for line in info_text.splitlines():
+        if not line.strip().startswith('%'):
+            res += re.findall(r'(?:^|,)\s*([^,=%]+\.dat)\s*(?=,|$)', line.strip())
+    return [name.strip().replace('\\', '/') for name in res]
+
+def _audit_file(path, known_hash):
+    """return a `dict` with the results of checking the data file `path`.
+
+    The file hash is compared to `known_hash` and the ``.info``, ``.dat``
+    and ``.tdat`` members of the (tar or zip) file are checked for
+    completeness, without extracting them to disk.
+    """
+    import tarfile, zipfile
+    res = {'path': path, 'hash': 'missing', 'members': {}, 'errors': []}
+    if not os.path.isfile(path):
+        res['errors'].append('file not found')
+        return res
+    computed_hash = _hash(path)
+    res['hash'] = ('unknown' if known_hash is None else
+                   'ok' if computed_hash == known_hash else 'wrong')
+    if res['hash'] == 'wrong':
+        res['errors'].append('hash %s differs from %s' % (computed_hash, known_hash))
+    names, infos = set(), {}  # member names and the text of .info members
+    try:
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as zip_:
+                bad_member = zip_.testzip()
+                if bad_member:
+                    res['errors'].append('corrupt member %s' % bad_member)
+                names.update(n for n in zip_.namelist() if not n.endswith('/'))
+                for name in names:
+                    if name.endswith('.info'):
+                        infos[name] = zip_.read(name).decode('latin-1')
+        else:
+            with tarfile.open(path) as tar:
+                for member in tar:  # reads through the entire (compressed) file
+                    if member.isfile():
+                        names.add(member.name)
+                        if member.name.endswith('.info'):
+                            infos[member.name] = tar.extractfile(member).read().decode('latin-1')
+    except Exception as e:
+        res['errors'].append('cannot read archive (%s: %s)' % (type(e).__name__, str(e)))
+        return res
+    for extension in ('.info', '.dat', '.tdat'):
+        res['members'][extension.lstrip('.')] = sum(n.endswith(extension) for n in names)
+    if not infos:
+        res['errors'].append('no .info member')
+    has_tdat = res['members']['tdat'] > 0
+    for info_name, text in sorted(infos.items()):
+        folder = posixpath.dirname(info_name)
+        for reference in _data_file_references(text):
+            dat = posixpath.normpath(posixpath.join(folder, reference))
+            if dat not in names:
+                res['errors'].append('%s referenced in %s is missing' % (dat, info_name))
+            elif has_tdat and dat[:-4] + '.tdat' not in names:
+                res['errors'].append('%s is missing' % (dat[:-4] + '.tdat'))
+    return res
+
+def audit(archives=None, filename=None, max_workers=None):
+    """check the locally available data of `archives` and return a report.
+
+    `archives` is a list of `COCODataArchive` instances or of arguments
+    to `get`. By default, all official archives whose definition file
+    is available locally are checked, nothing is downloaded.
+
+    Each data file is checked once with `_audit_file`, the files are
+    checked in parallel with `max_workers` threads. The returned report
+    is a `dict` which is also written as json into `filename` if given.
+    Its ``'files'`` entry is a `list` of `dict` with keys ``'archive'``,
+    ``'name'``, ``'path'``, ``'status'`` (``'ok'`` or ``'failed'``),
+    ``'hash'`` (``'ok'``, ``'wrong'``, ``'unknown'`` or ``'missing'``),
+    ``'members'`` (the number of ``.info``, ``.dat`` and ``.tdat``
+    members) and ``'errors'``.
+    """
+    import concurrent.futures
+    if archives is None:
+        official_archives = _get_official_archives()
+        archives = [name for name in official_archives.names
+                    if os.path.isfile(_definition_file_to_read(
+                        _url_to_folder_name(official_archives.url(name))))]
+    archives = [a if isinstance(a, COCODataArchive) else get(a) for a in archives]
+    jobs = collections.OrderedDict()  # path: (archive, name, known hash)
+    for archive in archives:
+        for name in archive.downloaded:
+            jobs.setdefault(archive.full_path(name),
+                            (archive.local_data_path, name, archive._known_hash(name)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        results = executor.map(_audit_file, list(jobs), [job[2] for job in jobs.values()])
+        files = []
+        for (archive, name, _known), result in zip(jobs.values(), results):
+            result.update(archive=archive, name=name,
+                          status='failed' if result['errors'] or result['hash'] != 'ok' else 'ok')
+            files.append(result)
+    report = {'date': _time.strftime('%Y-%m-%d %H:%M:%S'),
+              'archives': [a.local_data_path for a in archives],
+              'checked': len(files),
+              'failed': sum(f['status'] != 'ok' for f in files),
+              'files': files}
+    if filename:
+        with open(filename, 'wt') as file_:
+            json.dump(report, file_, indent=1)
+    return report
+
+class DownloadPipeline(object):
+    """Download and hash-check archived data in a background thread.
+
+    While the pipeline is started, `COCODataArchive.get` only resolves
+    the name and returns the full local path immediately. The data are
+    downloaded, or checked when already present, in a single background
+    thread in the order of the `get` calls. `wait` blocks until a path
+    is ready and raises the exception of its failed download.
+
+    At most `ahead` data sets are prepared beyond the last one waited
+    for, hence parsing a data set overlaps with downloading the next
+    ones without filling up the disk far ahead of the parsing.
+
+    >>> from cocopp import archiving
+    >>> with archiving.DownloadPipeline() as pipeline:
+    ...     archiving.download_pipeline is pipeline
+    True
+    >>> archiving.download_pipeline is None
+    True
+
+    """
+    def __init__(self, ahead=2):
+        self.ahead = ahead
+        self._thread = None
+
+    def start(self):
+        """start the background thread and make this the active pipeline"""
+        import threading, queue
+        global download_pipeline
+        self._order = []  # paths in the order of submission
+        self._ready = {}  # path: threading.Event
+        self._errors = {}  # path: exception
+        self._consumed = 0  # number of paths in _order which are waited for
+        self._queue = queue.Queue()
+        self._slots = threading.Semaphore(self.ahead)
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='cocopp-download',
+                                        daemon=True)
+        self._thread.start()
+        download_pipeline = self
+        return self
+
+    def stop(self):
+        """skip pending downloads and stop the background thread"""
+        global download_pipeline
+        if download_pipeline is self:
+            download_pipeline = None
+        if self._thread is None:
+            return
+        self._stopped = True
+        self._queue.put(None)
+        for _ in range(len(self._order) + 1):
+            self._slots.release()  # unblock the thread
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+        return False
+
+    def is_worker(self):
+        """return `True` when called from the background thread"""
+        import threading
+        return threading.current_thread() is self._thread
+
+    def submit(self, archive, name):
+        """queue `name` of `archive` for `archive.get` and return its full path"""
+        import threading
+        path = archive.full_path(name)
+        if path not in self._ready:
+            self._ready[path] = threading.Event()
+            self._order.append(path)
+            self._queue.put((path, archive, name))
+        return path
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            path, archive, name = job
+            self._slots.acquire()
+            try:
+                if not self._stopped:
+                    archive.get(name)
+            except BaseException as e:
+                self._errors[path] = e
+            finally:
+                self._ready[path].set()
+
+    def wait(self, path):
+        """return `path` when its download is finished.
+
+        Raise the exception of a failed download. Paths which were not
+        submitted are returned immediately.
+        """
+        if path not in self._ready:
+            return path
+        index = self._order.index(path)
+        while self._consumed <= index:  # earlier paths are regarded as consumed too
+            self._consumed += 1
+            self._slots.release()
+        self._ready[path].wait()
+        if path in self._errors:
+            raise self._errors[path]
+        return path
+
+def wait_for_download(path):
+    """return `path` after its pending download, if any, is finished.
+
+    Raise the exception of a failed download, see `DownloadPipeline`.
+    """
+    pipeline = download_pipeline
+    if pipeline is None or not isinstance(path, str):
+        return path
+    return pipeline.wait(path)
+
 class COCODataArchive(_td.StrList):
     """Data archive based on an archive definition file.
 
@@ -698,27 +1076,33 @@ class COCODataArchive(_td.StrList):
                 "`get_first` method, or use the ! (first) or * (all)\n"
                 "marker and try again."
                 % (substr, '\n   '.join(names)))
+        return self._get_resolved(names[0], remote)
+
+    def _get_resolved(self, name, remote=True):
+        """return the full data pathname of the archive entry `name`, see `get`"""
         # create full path
-        full_name = self.full_path(names[0])
+        full_name = self.full_path(name)
+        if remote and download_pipeline is not None and not download_pipeline.is_worker():
+            return download_pipeline.submit(self, name)
         if os.path.exists(full_name):
             try:
                 self.check_hash(full_name)
             except ValueError:
-                if names[0] in self._redownload_if_changed:
-                    self._download(names[0])
+                if name in self._redownload_if_changed:
+                    self._download(name)
                     self.check_hash(full_name)
-                elif 11 < 3 and not input("\n\n  ** wrong hash, download {} again? [n=no, return=yes] **".format(names[0])).lower().startswith('n'):
+                elif 11 < 3 and not input("\n\n  ** wrong hash, download {} again? [n=no, return=yes] **".format(name)).lower().startswith('n'):
                     # seems to break tests?
-                    self._download(names[0])
+                    self._download(name)
                     self.check_hash(full_name)
                 else:
                     raise
-            try: self._redownload_if_changed.remove(names[0])
+            try: self._redownload_if_changed.remove(name)
             except ValueError: pass
             return full_name
         if not remote:
             return ''  # like this string operations don't bail out
-        self._download(names[0])
+        self._download(name)
         return full_name
 
     def _download(self, name):
@@ -758,22 +1142,37 @@ class COCODataArchive(_td.StrList):
         """
         res = []
         args = _str_to_list(args)
-        for name in args:
-            name = name.strip()
+        # resolve the names in one batch, see `find_all`
+        names = [name.strip() for name in args]
+        to_find = [name for name in names if not os.path.exists(name)
+                   and not name.endswith(('!', '*'))]
+        try:
+            leading = [self.name.split()[0] + '/']
+        except (AttributeError, TypeError):
+            leading = []
+        found = dict(zip(to_find, self.find_all(to_find)))
+        found_leading = dict(zip(to_find, self.find_all(to_find, leading_strs=leading)))
+        for name in names:
             if os.path.exists(name):
                 res.append(name)
                 continue
             for try_ in range(2):
                 more = []
+                if try_ > 0 and name in found:  # the definitions have been updated
+                    found[name] = self.find(name)
+                    found_leading[name] = self.find(name, leading_strs=leading)
                 if name.endswith('!'):  # take first match
                     more.append(self.get_first([name[:-1]], remote=remote))
                 elif name.endswith('*'):  # take all matches
                     more.extend(self.get_all(name[:-1], remote=remote))
                 elif '*' in name:  # use find which also handles regular expressions
-                    more.extend(self.get(found, remote=remote)
-                                for found in self.find(name))
-                elif self.find(name):  # get will bail out if there is not exactly one match
-                    more.append(self.get(name, remote=remote))
+                    more.extend(self.get(match, remote=remote)
+                                for match in found[name])
+                elif found[name]:  # get will bail out if there is not exactly one match
+                    if len(found_leading[name]) == 1:
+                        more.append(self._get_resolved(found_leading[name][0], remote=remote))
+                    else:
+                        more.append(self.get(name, remote=remote))
                 if more and more[-1] is not None:
                     if try_ == 1:
                         print('2nd try succeeded')
@@ -852,6 +1251,8 @@ class COCODataArchive(_td.StrList):
         """basic quick consistency check of downloaded data.
 
         return ``(number_of_checked_data, number_of_all_data)``
+
+        See `audit` for a more thorough check of many archives in parallel.
         """
         for name in self.downloaded:
             self.check_hash(name)
@@ -902,9 +1303,14 @@ class COCODataArchive(_td.StrList):
         except KeyError:
             return None
 
-    def update(self):
+    def update(self, ttl=None):
         """update definition file, either from remote location or from local data.
-        
+
+        The remote definition file is only downloaded when it has changed
+        and the remote location is not contacted within `ttl` seconds
+        after the last check (default: `definitions_ttl`). Without
+        connection the current definition file is used with a warning.
+
         As remote archives may grow or change, a common usecase may be
         
         >>> import cocopp.archiving as ac
@@ -921,10 +1327,13 @@ class COCODataArchive(_td.StrList):
         now. `create` makes a backup of the existing definition file.
         """
         if self.remote_data_path:
+            definition_file = _definition_file_to_read(self.local_data_path)
+            mtime = os.path.getmtime(definition_file) if os.path.isfile(definition_file) else None
             _get_remote(self.remote_data_path, self.local_data_path,
-                        redownload=True)  # redownload definition file
-            # allow to re-download data by tagging possibly outdated data
-            self._redownload_if_changed = self.downloaded
+                        redownload=True, ttl=ttl)  # redownload definition file if changed
+            if mtime is None or os.path.getmtime(definition_file) != mtime:
+                # allow to re-download data by tagging possibly outdated data
+                self._redownload_if_changed = self.downloaded
         else:
             print('This archive has no remote URL. If you intended to update the\n'
                   'definition file from the local data, call\n'
@@ -1429,21 +1838,28 @@ class OfficialArchives(object):
         """class of archive named `name` when returned by `get`"""
         return self._get(name, 1) or COCODataArchive
 
-    def update_all(self):
+    def update_all(self, ttl=None, max_workers=None):
         """update archive definition files from their remote location.
 
         The update is necessary to account for newly added data. This
-        method requires www connectivity with only a few KB of transmitted
-        data.
+        method requires www connectivity with a single request per
+        archive, definition files are only transferred when they have
+        changed. The archives are updated concurrently with `max_workers`
+        threads, see `COCODataArchive.update` for `ttl`.
         """
+        import concurrent.futures
         # self.set_as_attributes_in(update=True)
+        archives = []
         for name in self.names:
             name = name.replace('-', '_')
             try:
-                getattr(self, name).update()
+                archives.append(getattr(self, name))
             except AttributeError:
                 if name != 'test':
                     raise
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            for future in [executor.submit(archive.update, ttl) for archive in archives]:
+                future.result()
 
     def _make_folder_skeleton(self):
         """workaround to avoid bailing when www is not reachable during
@@ -1466,29 +1882,47 @@ class OfficialArchives(object):
                 with open(df, 'w') as f:
                     f.write("[('_url_', '{}')]\n".format(url))
 
-# official_archives = OfficialArchives()
-for url in coco_urls[-1::-1]:  # loop over possible URLs until successful
-    official_archives = OfficialArchives(url)  # lazy init, does kinda nothing
-    coco_url = url
-    try:
-        # TODO-decide: when should we (try to) update/check these?
-        # The following `set_as_attributes_in` calls `cocopp.archiving.get(url)` and works if the
-        # connection was successful at least once (before or now)
-        official_archives.set_as_attributes_in()  # set "official" archives as attributes by suite name
-        break
-    except ZeroDivisionError:
-        raise
-    except Exception as e:  # (HTTPError, TimeoutError, URLError)
-        warnings.warn("failed to connect to {0} with exception {1}".format(url, e))
-else:
-    warnings.warn("Failed fo find workable URL or local folder for official archives."
-                  "\n If your internet connection is stable, consider to update cocopp"
-                  "\n         pip install -U cocopp"
-                  "\n Otherwise, after the www connection is restored, you may need to call"
-                  "\n `cocopp.archiving.official_archives.update_all()` to create"
-                  "\n valid definition files.")
-    official_archives._make_folder_skeleton()      
-    official_archives.set_as_attributes_in()
+def _get_official_archives():
+    """return the module attribute `official_archives` and create it on
+    the first call.
+
+    The creation loops over `coco_urls` until the archive definition files
+    can be read, which may need a www connection when they were never
+    downloaded before on this machine.
+    """
+    global official_archives, coco_url
+    if 'official_archives' in globals():
+        return official_archives
+    # official_archives = OfficialArchives()
+    for url in coco_urls[-1::-1]:  # loop over possible URLs until successful
+        official_archives = OfficialArchives(url)  # lazy init, does kinda nothing
+        coco_url = url
+        try:
+            # TODO-decide: when should we (try to) update/check these?
+            # The following `set_as_attributes_in` calls `cocopp.archiving.get(url)` and works if the
+            # connection was successful at least once (before or now)
+            official_archives.set_as_attributes_in()  # set "official" archives as attributes by suite name
+            break
+        except ZeroDivisionError:
+            raise
+        except Exception as e:  # (HTTPError, TimeoutError, URLError)
+            warnings.warn("failed to connect to {0} with exception {1}".format(url, e))
+    else:
+        warnings.warn("Failed fo find workable URL or local folder for official archives."
+                      "\n If your internet connection is stable, consider to update cocopp"
+                      "\n         pip install -U cocopp"
+                      "\n Otherwise, after the www connection is restored, you may need to call"
+                      "\n `cocopp.archiving.official_archives.update_all()` to create"
+                      "\n valid definition files.")
+        official_archives._make_folder_skeleton()
+        official_archives.set_as_attributes_in()
+    return official_archives
+
+def __getattr__(name):
+    """create `official_archives` only when it is first used (PEP 562)"""
+    if name == 'official_archives':
+        return _get_official_archives()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 class _old_ArchivesOfficial(ListOfArchives):
     """superseded by `OfficialArchives`
@@ -1549,3 +1983,26 @@ class RemoteListOfArchives(_td.StrList):
     
     def save(self):
         raise NotImplementedError("a remote list cannot be saved")
+
+if __name__ == "__main__":
+    """``python -m cocopp.archiving [--full] local_path`` calls `create`,
+    ``--full`` hashes all files anew.
+
+    ``python -m cocopp.archiving --audit [--report=filename] [archive...]``
+    calls `audit` and exits with status 1 when a file failed.
+    """
+    import sys, getopt
+    opts, args = getopt.getopt(sys.argv[1:], '', ['full', 'audit', 'report='])
+    opts = dict(opts)
+    if '--audit' in opts:
+        report = audit(args or None, opts.get('--report'))
+        for file_ in report['files']:
+            if file_['status'] != 'ok':
+                print('%s: %s' % (file_['path'], '; '.join(file_['errors'] or
+                                                          ['hash ' + file_['hash']])))
+        print('%d of %d files failed' % (report['failed'], report['checked']))
+        sys.exit(1 if report['failed'] else 0)
+    if len(args) != 1:
+        raise ValueError('usage: python -m cocopp.archiving [--full] local_path\n'
+                         '       python -m cocopp.archiving --audit [--report=filename] [archive...]')
+    print(create(args[0], full='--full' in opts))
@@ -0,0 +1,21 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmarks of the post-processing on synthetic data.
+
+`datagen.write_experiment` writes deterministic synthetic experiment data
+in the formats of the `bbob`, `bbob-biobj`, `bbob-constrained` and
+`bbob-largescale` suites. The benchmarks in `harness` time loading,
+aligning, statistics and rendering on these data and compare the
+timings to a stored baseline. From the command line::
+
+    python -m cocopp.benchmark --save  # store a baseline
+    python -m cocopp.benchmark  # compare to the baseline
+
+see ``python -m cocopp.benchmark -h`` for more options.
+
+"""
+
+from __future__ import absolute_import
+from .datagen import write_experiment
+from .harness import benchmarks, run, compare, report, save_baseline, load_baseline
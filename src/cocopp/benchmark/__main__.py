@@ -0,0 +1,128 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Run the benchmarks of `cocopp.benchmark` and report regressions.
+
+Synopsis::
+
+    python -m cocopp.benchmark [options] [name_substring ...]
+
+Only benchmarks with a name containing any of the given substrings are
+run, by default all but the slow ones.
+
+Options:
+
+    -h, --help
+
+        display this message
+
+    --suite=SUITES
+
+        comma separated suite names of the synthetic data, default is
+        ``bbob``, available are ``bbob,bbob-biobj,bbob-constrained,bbob-largescale``
+
+    --baseline=FILENAME
+
+        baseline json file, default is ``cocopp-benchmark-baseline.json``
+
+    --save
+
+        save the timings into the baseline file (without comparison)
+
+    --tolerance=FLOAT
+
+        relative slowdown reported as regression, default is 0.25
+
+    --repeat=INT
+
+        number of repetitions of each benchmark, the minimum time is used
+
+    --slow
+
+        also run the slow benchmarks, e.g. a full `rungenericmany.main`
+
+    --functions=LIST, --dimensions=LIST, --instances=LIST
+
+        comma separated numbers passed to the data generator, by
+        default those of the suite
+
+    --budget-multiplier=FLOAT, --success-rate=FLOAT
+
+        parameters of the synthetic runs
+
+The exit status is 1 when a regression was found.
+"""
+
+from __future__ import absolute_import, print_function
+import os
+import sys
+import getopt
+import matplotlib
+
+matplotlib.use('Agg')  # To avoid window popup and use without X forwarding
+
+from . import harness
+
+def _int_list(s):
+    return [int(i) for i in s.split(',')]
+
+def main(argv=None):
+    """run the benchmarks as given in `argv` and return the exit status"""
+    if argv is None:
+        argv = sys.argv[1:]
+    try:
+        opts, args = getopt.getopt(argv, 'h', [
+            'help', 'suite=', 'baseline=', 'save', 'tolerance=', 'repeat=', 'slow',
+            'functions=', 'dimensions=', 'instances=', 'budget-multiplier=',
+            'success-rate='])
+    except getopt.error as msg:
+        print(msg, file=sys.stderr)
+        print('For help use -h or --help', file=sys.stderr)
+        return 2
+    suites = ['bbob']
+    baseline_file = 'cocopp-benchmark-baseline.json'
+    save = slow = False
+    tolerance = harness.default_tolerance
+    repeat = None
+    kwargs = {}
+    for o, a in opts:
+        if o in ('-h', '--help'):
+            print(__doc__)
+            return 0
+        elif o == '--suite':
+            suites = a.split(',')
+        elif o == '--baseline':
+            baseline_file = a
+        elif o == '--save':
+            save = True
+        elif o == '--tolerance':
+            tolerance = float(a)
+        elif o == '--repeat':
+            repeat = int(a)
+        elif o == '--slow':
+            slow = True
+        elif o in ('--functions', '--dimensions', '--instances'):
+            kwargs[o[2:]] = _int_list(a)
+        elif o == '--budget-multiplier':
+            kwargs['budget_multiplier'] = float(a)
+        elif o == '--success-rate':
+            kwargs['success_rate'] = float(a)
+
+    print('Running benchmarks on synthetic %s data...' % ', '.join(suites))
+    results = harness.run(args, suites, repeat=repeat, slow=slow, **kwargs)
+    if save:
+        harness.save_baseline(results, baseline_file)
+        print('Baseline written to %s' % baseline_file)
+        return 0
+    if not os.path.exists(baseline_file):
+        print('No baseline file %s found, use --save to write one' % baseline_file)
+        return 0
+    regressions = harness.report(harness.compare(results, harness.load_baseline(baseline_file),
+                                                 tolerance))
+    if regressions:
+        print('%d regression%s found' % (regressions, 's' if regressions > 1 else ''))
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Deterministic generator of synthetic COCO experiment data.
+
+`write_experiment` writes ``.info``, ``.dat`` and ``.tdat`` files as the
+experiment loggers of the `bbob`, `bbob-biobj`, `bbob-constrained` and
+`bbob-largescale` suites do, such that the data can be post-processed
+like a real experiment.
+
+Each run follows a best-so-far value which decreases linearly in log-log
+scale from an initial value down to its final value. With probability
+`success_rate` the final value is below the suite precision and the run
+stops when it is reached, otherwise the run uses the full budget. All
+random numbers derive from `seed` and the problem, hence the same
+arguments give always the same files.
+
+>>> import os
+>>> from cocopp.benchmark import datagen
+>>> from cocopp.toolsdivers import InfolderGoneWithTheWind
+>>> with InfolderGoneWithTheWind():
+...     folder = datagen.write_experiment('.', 'bbob', functions=[1, 2],
+...                                       dimensions=[2, 3], instances=range(1, 4))
+...     sorted(os.listdir(folder))
+['bbobexp_f1.info', 'bbobexp_f2.info', 'data_f1', 'data_f2']
+
+"""
+
+from __future__ import absolute_import, division, print_function
+import os
+import numpy as np
+
+coco_version = '2.6.3'
+"""written into the ``.info`` files"""
+
+suites = {
+    'bbob': dict(functions=range(1, 25), dimensions=(2, 3, 5, 10, 20, 40),
+                 instances=range(1, 16), precision=1e-8, data_format='bbob-new2',
+                 initial_values=(1, 3)),
+    'bbob-biobj': dict(functions=range(1, 56), dimensions=(2, 3, 5, 10, 20, 40),
+                       instances=range(1, 11), precision=1e-5, data_format='bbob-biobj',
+                       initial_values=(-0.5, 0.5)),
+    'bbob-constrained': dict(functions=range(1, 55), dimensions=(2, 3, 5, 10, 20, 40),
+                             instances=range(1, 16), precision=1e-8, data_format='bbob-new2',
+                             initial_values=(1, 4)),
+    'bbob-largescale': dict(functions=range(1, 25), dimensions=(20, 40, 80, 160, 320, 640),
+                            instances=range(1, 16), precision=1e-8, data_format='bbob-new2',
+                            initial_values=(2, 4)),
+}
+"""default functions, dimensions and instances, the smallest target
+   precision, the data format, and the range of the decimal logarithm of
+   the initial best-so-far value for each supported suite"""
+
+targets_per_decade = 5
+"""number of ``.dat`` lines per decade of f-values"""
+evaluations_per_decade = 10
+"""number of ``.tdat`` lines per decade of evaluations"""
+log_variables_max_dimension = 5
+"""dimensions up to which the solution is written, like the default
+   ``log_variables: low_dim`` of the loggers"""
+
+def _random_state(seed, *problem):
+    """return a `RandomState` depending only on `seed` and `problem`"""
+    return np.random.RandomState([seed] + [int(i) for i in problem])
+
+class _Run(object):
+    """a single synthetic run on problem ``(function, dimension, instance)``"""
+    def __init__(self, suite, function, dimension, instance,
+                 budget_multiplier, success_rate, seed):
+        settings = suites[suite]
+        rand = _random_state(seed, function, dimension, instance)
+        budget = max((2, int(budget_multiplier * dimension)))
+        self.f0 = 10**rand.uniform(*settings['initial_values'])
+        # the optimal f-value as logged by the bbob loggers, rounded like in the suite
+        self.fopt = np.round(rand.uniform(-1000, 1000), 2)
+        if rand.rand() < success_rate:
+            self.final_evaluation = int(max((2, 10**rand.uniform(np.log10(budget) - 2,
+                                                                  np.log10(budget)))))
+            self.final_value = settings['precision'] * 10**rand.uniform(-1, 0)
+        else:
+            self.final_evaluation = budget
+            self.final_value = 10**rand.uniform(np.log10(settings['precision']) + 1,
+                                                np.log10(self.f0) - 1)
+        self.xopt = rand.uniform(-4, 4, dimension)
+        self.reference_value = rand.uniform(0.5, 1)  # of the hypervolume indicator
+
+    def best_values(self, evaluations):
+        """return the best-so-far values after `evaluations`"""
+        exponent = np.log(evaluations) / np.log(self.final_evaluation)
+        return self.f0 * (self.final_value / self.f0)**exponent
+
+    def dat_evaluations(self):
+        """return the evaluations when the next target value was reached"""
+        targets = 10**(np.arange(np.ceil(targets_per_decade * np.log10(self.f0)) - 1,
+                                 targets_per_decade * np.log10(self.final_value),
+                                 -1) / targets_per_decade)
+        evaluations = np.ceil(np.exp(np.log(self.final_evaluation) *
+                                     np.log(targets / self.f0) /
+                                     np.log(self.final_value / self.f0)))
+        return np.unique(np.hstack([[1], evaluations[evaluations < self.final_evaluation],
+                                    [self.final_evaluation]])).astype(int)
+
+    def tdat_evaluations(self):
+        """return the evaluations when a ``.tdat`` line is written"""
+        evaluations = np.floor(10**(np.arange(
+            0, evaluations_per_decade * np.log10(self.final_evaluation)) / evaluations_per_decade))
+        return np.unique(np.hstack([evaluations, [self.final_evaluation]])).astype(int)
+
+def _bbob_lines(run, evaluations, constraints):
+    """return the lines of a single run in a ``.dat`` or ``.tdat`` file"""
+    dimension = len(run.xopt)
+    lines = ['%% f evaluations | g evaluations | best noise-free fitness - Fopt (%.12e) '
+             '+ sum g_i+ | measured fitness | best measured fitness or single-digit g-values'
+             ' | x1 | x2...' % run.fopt]
+    best = run.best_values(evaluations)
+    for evals, f in zip(evaluations, best):
+        line = '%d %d %+.9e %+.9e %+.9e' % (evals, evals if constraints else 0,
+                                            f, run.fopt + 1.01 * f, run.fopt + f)
+        if dimension <= log_variables_max_dimension:
+            line += ' ' + ' '.join('%+.4e' % x for x in run.xopt + f**0.5)
+        lines.append(line)
+    return lines
+
+def _biobj_lines(run, instance, evaluations):
+    """return the lines of a single run in a bbob-biobj ``.dat`` or ``.tdat`` file"""
+    lines = ['%% instance = %d, reference value = %.15e' % (instance, run.reference_value),
+             '% function evaluation | indicator value | target hit']
+    for evals, f in zip(evaluations, run.best_values(evaluations)):
+        target_hit = 10**(np.floor(targets_per_decade * np.log10(f)) / targets_per_decade)
+        lines.append('%d\t%.9e\t%.9e' % (evals, f, target_hit))
+    return lines
+
+def write_experiment(folder, suite='bbob', algorithm='SYNTH',
+                     functions=None, dimensions=None, instances=None,
+                     budget_multiplier=1000, success_rate=0.5, seed=1):
+    """write synthetic data of `algorithm` on `suite` into `folder`.
+
+    `functions`, `dimensions` and `instances` default to those of the
+    suite, see `suites`. The runs use at most ``budget_multiplier *
+    dimension`` evaluations and reach the final target with probability
+    `success_rate`. Return the folder of the written algorithm data,
+    which can be passed to `cocopp.main` or `cocopp.pproc.DataSetList`.
+    """
+    if suite not in suites:
+        raise ValueError('suite "%s" is not in %s' % (suite, sorted(suites)))
+    settings = suites[suite]
+    functions = settings['functions'] if functions is None else functions
+    dimensions = settings['dimensions'] if dimensions is None else dimensions
+    instances = settings['instances'] if instances is None else instances
+    biobj = suite == 'bbob-biobj'
+    constraints = suite == 'bbob-constrained'
+    algorithm_folder = os.path.join(folder, algorithm)
+    comment = ('%% synthetic data of cocopp.benchmark.datagen with seed=%d, '
+               'budget_multiplier=%s, success_rate=%s'
+               % (seed, str(budget_multiplier), str(success_rate)))
+    for function in functions:
+        data_folder = 'data_f%d' % function
+        if not os.path.exists(os.path.join(algorithm_folder, data_folder)):
+            os.makedirs(os.path.join(algorithm_folder, data_folder))
+        if biobj:
+            info_lines = ["algorithm = '%s', indicator = 'hyp', suite = '%s', coco_version = '%s'"
+                          % (algorithm, suite, coco_version), comment]
+        else:
+            info_lines = []
+        for dimension in dimensions:
+            name = os.path.join(data_folder, 'bbobexp_f%d_DIM%d' % (function, dimension))
+            dat_lines, tdat_lines, runs_info = [], [], []
+            for instance in instances:
+                run = _Run(suite, function, dimension, instance,
+                           budget_multiplier, success_rate, seed)
+                if biobj:
+                    dat_lines += _biobj_lines(run, instance, run.dat_evaluations())
+                    tdat_lines += _biobj_lines(run, instance, run.tdat_evaluations())
+                else:
+                    dat_lines += _bbob_lines(run, run.dat_evaluations(), constraints)
+                    tdat_lines += _bbob_lines(run, run.tdat_evaluations(), constraints)
+                runs_info.append('%d:%d|%.1e' % (instance, run.final_evaluation, run.final_value))
+            for extension, lines in (('.dat', dat_lines), ('.tdat', tdat_lines)):
+                with open(os.path.join(algorithm_folder, name + extension), 'w') as f:
+                    f.write('\n'.join(lines) + '\n')
+            if biobj:
+                info_lines.append('function = %d, dim = %d, %s, %s' % (
+                    function, dimension, name + '.dat', ', '.join(runs_info)))
+            else:
+                info_lines += ["suite = '%s', funcId = %d, DIM = %d, Precision = %.3e, "
+                               "algId = '%s', coco_version = '%s', logger = 'bbob', "
+                               "data_format = '%s'" % (suite, function, dimension,
+                                                       settings['precision'], algorithm,
+                                                       coco_version, settings['data_format']),
+                               comment,
+                               '%s, %s' % (name + '.dat', ', '.join(runs_info))]
+        with open(os.path.join(algorithm_folder, 'bbobexp_f%d.info' % function), 'w') as f:
+            f.write('\n'.join(info_lines) + '\n')
+    return algorithm_folder
@@ -0,0 +1,339 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Timing of post-processing stages on synthetic data with baselines.
+
+A benchmark is a function decorated with `benchmark` which receives a
+`SyntheticData` instance and returns the function to be timed. `run`
+times all (or selected) benchmarks, `save_baseline` stores the timings
+in a json file and `compare` reports the ratio to a stored baseline and
+flags regressions.
+
+>>> from cocopp.benchmark import harness
+>>> 'readalign.split' in harness.benchmarks
+True
+
+"""
+
+from __future__ import absolute_import, division, print_function
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import warnings
+import subprocess
+import contextlib
+import collections
+import numpy as np
+from . import datagen
+
+benchmarks = collections.OrderedDict()
+"""all registered benchmarks by name"""
+
+default_tolerance = 0.25
+"""relative slowdown compared to the baseline which is reported as
+   regression"""
+
+class Benchmark(object):
+    """a named function which returns the function to be timed.
+
+    Benchmarks with `slow` set are only run when explicitly asked for.
+    """
+    def __init__(self, name, setup, repeat=5, slow=False):
+        self.name = name
+        self.setup = setup
+        self.repeat = repeat
+        self.slow = slow
+
+    def __call__(self, data, repeat=None):
+        """return a `dict` with the timings in seconds"""
+        with _quiet():
+            timed = self.setup(data)
+            times = []
+            for _ in range(repeat or self.repeat):
+                t0 = time.perf_counter()
+                timed()
+                times.append(time.perf_counter() - t0)
+        return {'min': min(times), 'median': float(np.median(times)),
+                'repeat': len(times)}
+
+def benchmark(name, repeat=5, slow=False):
+    """return a decorator which registers a benchmark under `name`"""
+    def decorator(setup):
+        benchmarks[name] = Benchmark(name, setup, repeat, slow)
+        return setup
+    return decorator
+
+@contextlib.contextmanager
+def _quiet():
+    """suppress the output and warnings of the post-processing"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+
+class SyntheticData(object):
+    """synthetic experiment data written into a temporary folder.
+
+    Keyword arguments are passed to `datagen.write_experiment`. The data
+    of each algorithm are written on first use and the folder is removed
+    by `cleanup`.
+    """
+    def __init__(self, suite='bbob', folder=None, **kwargs):
+        self.suite = suite
+        self.kwargs = kwargs
+        self._remove_folder = folder is None
+        self.folder = tempfile.mkdtemp(prefix='cocopp-benchmark-') if folder is None else folder
+        self._algorithm_folders = {}
+        self._dataset_lists = {}
+
+    def algorithm_folder(self, algorithm='A', seed=1, success_rate=0.5):
+        """return the folder with the data of `algorithm`"""
+        key = (algorithm, seed, success_rate)
+        if key not in self._algorithm_folders:
+            self._algorithm_folders[key] = datagen.write_experiment(
+                self.folder, self.suite, algorithm,
+                seed=seed, success_rate=success_rate, **self.kwargs)
+        return self._algorithm_folders[key]
+
+    def dataset_list(self, algorithm='A'):
+        """return the loaded `DataSetList` of `algorithm`"""
+        from .. import pproc
+        if algorithm not in self._dataset_lists:
+            self._dataset_lists[algorithm] = pproc.DataSetList(self.algorithm_folder(algorithm))
+        return self._dataset_lists[algorithm]
+
+    def data_files(self, algorithm='A', extension='.dat'):
+        """return the sorted list of data files with `extension`"""
+        res = []
+        for root, _dirs, files in os.walk(self.algorithm_folder(algorithm)):
+            res += [os.path.join(root, name) for name in files if name.endswith(extension)]
+        return sorted(res)
+
+    def cleanup(self):
+        if self._remove_folder:
+            shutil.rmtree(self.folder, ignore_errors=True)
+
+def run(names=None, suites=('bbob',), repeat=None, slow=False, verbose=True, **kwargs):
+    """run the benchmarks and return the results as `dict`.
+
+    `names` is a list of substrings, a benchmark is run when its name
+    contains any of them, by default all benchmarks which are not `slow`
+    are run unless `slow` is given. Keyword arguments are passed to
+    `datagen.write_experiment`. The keys of the results are ``"suite:
+    benchmark name"``.
+    """
+    from .. import testbedsettings, bestalg
+    results = collections.OrderedDict()
+    for suite in suites:
+        # like in `rungeneric.main`, testbed and reference data are set anew
+        testbedsettings.reset_current_testbed()
+        testbedsettings.reset_reference_values()
+        bestalg.reset_reference_algorithm()
+        data = SyntheticData(suite, **kwargs)
+        try:
+            for name, bench in benchmarks.items():
+                if names:
+                    if not any(n in name for n in names):
+                        continue
+                elif bench.slow and not slow:
+                    continue
+                key = '%s: %s' % (suite, name)
+                results[key] = bench(data, repeat)
+                if verbose:
+                    print('  %-60s %10.4f s' % (key, results[key]['min']))
+        finally:
+            data.cleanup()
+    return results
+
+def environment():
+    """return a `dict` describing the machine and package versions"""
+    from .. import toolsdivers
+    return {'cocopp': toolsdivers.get_version_label(None),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'date': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+def save_baseline(results, filename):
+    """save `results` from `run` as baseline into json file `filename`.
+
+    Results of benchmarks which are not in `results` are kept.
+    """
+    baseline = load_baseline(filename) if os.path.exists(filename) else {}
+    baseline.setdefault('results', {}).update(results)
+    baseline['environment'] = environment()
+    with open(filename, 'w') as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+
+def load_baseline(filename):
+    """return the baseline `dict` saved in `filename`"""
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+def compare(results, baseline, tolerance=None):
+    """return a list of ``(name, time, baseline time, ratio, status)``.
+
+    `status` is ``'REGRESSION'`` when the minimal time exceeds the
+    baseline time by more than `tolerance`, ``'improved'`` when it is
+    faster by this factor, ``'new'`` without baseline and otherwise
+    ``'ok'``.
+    """
+    if tolerance is None:
+        tolerance = default_tolerance
+    baseline_results = baseline.get('results', {})
+    res = []
+    for name, result in results.items():
+        if name not in baseline_results:
+            res.append((name, result['min'], np.nan, np.nan, 'new'))
+            continue
+        ratio = result['min'] / baseline_results[name]['min']
+        if ratio > 1 + tolerance:
+            status = 'REGRESSION'
+        elif ratio < 1 / (1 + tolerance):
+            status = 'improved'
+        else:
+            status = 'ok'
+        res.append((name, result['min'], baseline_results[name]['min'], ratio, status))
+    return res
+
+def report(comparison, stream=None):
+    """print the `comparison` from `compare` as table and return the
+    number of regressions"""
+    stream = stream or sys.stdout
+    print('%-60s %10s %10s %7s  %s' % ('benchmark', 'time[s]', 'base[s]', 'ratio', 'status'),
+          file=stream)
+    for name, t, t_base, ratio, status in comparison:
+        print('%-60s %10.4f %10.4f %7.2f  %s' % (name, t, t_base, ratio, status), file=stream)
+    return sum(c[-1] == 'REGRESSION' for c in comparison)
+
+def _python(code):
+    """return a function running `code` in a new python process which
+    imports this `cocopp` package"""
+    env = dict(os.environ)
+    path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env['PYTHONPATH'] = os.pathsep.join([path] + [p for p in [env.get('PYTHONPATH')] if p])
+    command = [sys.executable, '-c', code]
+    return lambda: subprocess.check_call(command, env=env)
+
+# benchmarks
+
+@benchmark('import cocopp', repeat=3)
+def _import(data):
+    return _python('import cocopp')
+
+@benchmark('import cocopp and load data without pyplot', repeat=3)
+def _import_and_load(data):
+    return _python('import sys, cocopp\n'
+                   'cocopp.pproc.DataSetList(%r)\n'
+                   'assert "matplotlib.pyplot" not in sys.modules, "pyplot was imported"'
+                   % data.algorithm_folder())
+
+@benchmark('pproc.parseinfo and parseinfo_data')
+def _parse_info(data):
+    from .. import pproc
+    entries = []
+    for name in data.data_files(extension='.info'):
+        with open(name) as f:
+            entries += list(pproc._index_entries(f, name))
+    def parse():
+        for header, _comment, line in entries:
+            pproc.parseinfo(header)
+            pproc.parseinfo_data(line)
+    return parse
+
+@benchmark('readalign.split')
+def _split(data):
+    from .. import readalign
+    files = data.data_files() + data.data_files(extension='.tdat')
+    return lambda: readalign.split(files)
+
+@benchmark('readalign.align_data')
+def _align_data(data):
+    from .. import readalign, dataformatsettings
+    data_format = dataformatsettings.data_format_name_to_class_mapping[
+        data.dataset_list()[0].get_data_format()]()
+    splits = [readalign.split([name])[0] for name in data.data_files()]
+    def align():
+        dataformatsettings.current_data_format = data_format
+        for datasets in splits:
+            readalign.align_data(readalign.HMultiReader(datasets),
+                                 data_format.evaluation_idx,
+                                 data_format.function_value_idx)
+    return align
+
+@benchmark('DataSet construction')
+def _dataset_construction(data):
+    from .. import pproc
+    folder = data.algorithm_folder()
+    return lambda: pproc.DataSetList(folder)
+
+@benchmark('DataSet.detEvals')
+def _det_evals(data):
+    from .. import testbedsettings
+    dsl = data.dataset_list()
+    targets = testbedsettings.current_testbed.pprldmany_target_values
+    def det_evals():
+        for ds in dsl:
+            ds.detEvals(targets((ds.funcId, ds.dim)))
+    return det_evals
+
+@benchmark('DataSet.detERT')
+def _det_ert(data):
+    from .. import testbedsettings
+    dsl = data.dataset_list()
+    targets = testbedsettings.current_testbed.pprldmany_target_values
+    def det_ert():
+        for ds in dsl:
+            ds.detERT(targets((ds.funcId, ds.dim)))
+    return det_ert
+
+@benchmark('DataSet.evals_with_simulated_restarts')
+def _simulated_restarts(data):
+    from .. import testbedsettings
+    dsl = data.dataset_list()
+    targets = testbedsettings.current_testbed.pprldmany_target_values
+    def simulated_restarts():
+        for ds in dsl:
+            ds.evals_with_simulated_restarts(targets((ds.funcId, ds.dim)))
+    return simulated_restarts
+
+@benchmark('pprldmany.main (no figure files)', repeat=3)
+def _pprldmany(data):
+    from .. import config, genericsettings, pproc
+    from ..compall import pprldmany
+    import matplotlib.pyplot as plt
+    dsl = data.dataset_list()
+    config.config(dsl[0].suite_name)
+    dict_dim = pproc.dictAlgByDim(dsl.dictByAlg())
+    outputdir = tempfile.mkdtemp(dir=data.folder)
+    def collect():
+        formats = genericsettings.figure_file_formats
+        genericsettings.figure_file_formats = []
+        try:
+            for dim, dict_alg in sorted(dict_dim.items()):
+                pprldmany.main(dict_alg, outputdir=outputdir, info='%02dD' % dim,
+                               settings=genericsettings)
+                plt.close('all')
+        finally:
+            genericsettings.figure_file_formats = formats
+    return collect
+
+@benchmark('rungenericmany.main', repeat=1, slow=True)
+def _rungenericmany(data):
+    from .. import rungeneric, genericsettings
+    folders = [data.algorithm_folder('A'),
+               data.algorithm_folder('B', seed=2, success_rate=0.7)]
+    outputdir = tempfile.mkdtemp(dir=data.folder)
+    def postprocess():
+        interactive_mode = genericsettings.interactive_mode
+        try:
+            rungeneric.main(['--no-interactive', '-o', outputdir] + folders)
+        finally:
+            genericsettings.interactive_mode = interactive_mode
+    return postprocess
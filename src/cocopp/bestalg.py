@@ -22,17 +22,17 @@ from __future__ import print_function
 
 import os
 import sys
+import collections
 import pickle
 import gzip
 import warnings
 import numpy as np
 import tarfile
-from six import advance_iterator
+import concurrent.futures
 
 from . import readalign, pproc
 from .toolsdivers import print_done
-from .ppfig import Usage
-from . import toolsstats, toolsdivers, testbedsettings, genericsettings
+from . import toolsstats, toolsdivers, testbedsettings, genericsettings, profiling
 from .pproc import DataSet
 
 bestAlgorithmEntries = {}
@@ -114,6 +114,7 @@ class BestAlgSet(DataSet):
                 pr = max(pr, max(j.precision for j in i))
 
         if len(f) > 1 or len(d) > 1:
+            from .ppfig import Usage
             Usage('Expect the data of algorithms for only one function and '
                   'one dimension.')
 
@@ -155,59 +156,30 @@ class BestAlgSet(DataSet):
                     for i in sortedAlgs)
         res = readalign.alignArrayData(readalign.HArrayMultiReader(erts))
 
-        resalgs = []
-        reserts = []
-        instance_numbers = []
-        # For each function value
-        for i in res:
-            # Find best algorithm
-            curerts = i[1:]
-            assert len((np.isnan(curerts) == False)) > 0
-            currentbestert = np.inf
-            currentbestalg = ''
-            for j, tmpert in enumerate(curerts):
-                if np.isnan(tmpert):
-                    continue  # TODO: don't disregard these entries
-                if tmpert == currentbestert:
-                    # TODO: what do we do in case of ties?
-                    # look at function values corresponding to the ERT?
-                    # Look at the function evaluations? the success ratio?
-                    pass
-                elif tmpert < currentbestert:
-                    currentbestert = tmpert
-                    currentbestalg = sortedAlgs[j]
-            reserts.append(currentbestert)
-            resalgs.append(currentbestalg)
-            sorted_instance_numbers = list(set(dict_alg[currentbestalg].instancenumbers))
-            sorted_instance_numbers.sort()
-            instance_numbers.append(sorted_instance_numbers)
-
-        dictiter = {}
-        dictcurLine = {}
-        resDataSet = []
-
-        # write down the #fevals to reach the function value.
-        for funval, alg in zip(res[:, 0], resalgs):
-            it = dictiter.setdefault(alg, iter(dict_alg[alg].evals))  # TODO: do we want evals_appended here?
-            curLine = dictcurLine.setdefault(alg, np.array([np.inf, 0]))
-            while curLine[0] > funval:
-                try:
-                    curLine = advance_iterator(it)
-                except StopIteration:
-                    break
-            dictcurLine[alg] = curLine.copy()
-            tmp = curLine.copy()
-            tmp[0] = funval
-            resDataSet.append(tmp)
+        # Find best algorithm for each function value (row of res)
+        ibest, reserts = _argmin_erts(res[:, 1:])
+        resalgs = [sortedAlgs[j] for j in ibest]
+        instance_numbers = len(resalgs) * [None]
+
+        # write down the #fevals to reach the function value
+        resDataSet = len(resalgs) * [None]
+        for j in np.unique(ibest):
+            alg = sortedAlgs[j]
+            idx = np.nonzero(ibest == j)[0]
+            sorted_instance_numbers = sorted(set(dict_alg[alg].instancenumbers))
+            # TODO: do we want evals_appended here?
+            lines = _evals_lines(dict_alg[alg].evals, res[idx, 0])
+            for i, line in zip(idx, lines):
+                resDataSet[i] = line
+                instance_numbers[i] = list(sorted_instance_numbers)
 
         setalgs = set(resalgs)
         dictFunValsNoFail = {}
         for alg in setalgs:
-            for curline in dict_alg[alg].funvals:
-                if (curline[1:] == dict_alg[alg].finalfunvals).any():
-                    # only works because the funvals are monotonous
-                    break
-            dictFunValsNoFail[alg] = curline.copy()
+            funvals = dict_alg[alg].funvals
+            # only works because the funvals are monotonous
+            inofail = np.nonzero(np.any(funvals[:, 1:] == dict_alg[alg].finalfunvals, axis=1))[0]
+            dictFunValsNoFail[alg] = funvals[inofail[0] if len(inofail) else -1].copy()
 
         self._evals = resDataSet
         # evals is not a np array but a list of arrays because they may not
@@ -378,12 +350,250 @@ class BestAlgSet(DataSet):
         return successful_runs, all_runs
 
 
+class VirtualBestOracle(object):
+    """Virtual best algorithm of any subset of a given set of algorithms.
+
+    The aligned ERTs and the evals of all algorithms are computed only
+    once per (dimension, function) pair. Queries for a subset of the
+    algorithms, like its virtual best ERT (see `ert`), the best
+    algorithm per target (see `best`) or an ECDF of the ERTs (see
+    `ert_ecdf`), are then reduced to a minimum over the respective
+    columns. With the subset of all algorithms, the result coincides
+    with `BestAlgSet`.
+
+    The targets of a (dimension, function) pair are the aligned
+    targets of all algorithms together.
+
+    >>> import warnings
+    >>> import cocopp
+    >>> from cocopp import bestalg, pproc, toolsdivers
+    >>> path = toolsdivers.path_in_package('refalgs')
+    >>> with warnings.catch_warnings():
+    ...     warnings.simplefilter('ignore')
+    ...     print('ESC'); dsl, algs, dict_alg = pproc.processInputArgs(
+    ...         [path + '/best2009-bbob.tar.gz', path + '/best09-16-bbob.tar.gz']
+    ...     )  # doctest:+ELLIPSIS
+    ESC...
+    >>> oracle = bestalg.VirtualBestOracle(dict_alg)
+    >>> len(oracle.algorithms), len(oracle.problems)
+    (2, 144)
+    >>> erts = oracle.ert()[5, 1]
+    >>> best_erts = bestalg.BestAlgSet(pproc.dictAlgByDim(
+    ...                 pproc.dictAlgByFun(dict_alg)[1])[5]).ert
+    >>> assert all(erts == best_erts)
+    >>> assert all(oracle.ert(algs[:1])[5, 1] >= erts)
+
+    """
+
+    def __init__(self, dict_alg):
+        """`dict_alg` is a dictionary of `DataSetList` with algorithm
+        names as keys, as returned by `pproc.processInputArgs`.
+
+        `algorithms` is the list of the algorithm names defining the
+        column order of the precomputed arrays.
+        """
+        self.algorithms = list(dict_alg.keys())
+        self.targets = collections.OrderedDict()
+        """aligned target f-values per (dimension, function) key"""
+        self.erts = collections.OrderedDict()
+        """arrays of shape ``(len(targets), len(algorithms))`` of ERTs,
+           ``inf`` when an algorithm has no data"""
+        self.evals = collections.OrderedDict()
+        """per key a list with per algorithm ``len(targets)`` rows of
+           `DataSet.evals` or ``None`` when the algorithm has no data"""
+        for f, i in pproc.dictAlgByFun(dict_alg).items():
+            for d, j in pproc.dictAlgByDim(i).items():
+                self._add_problem((d, f), j)
+
+    def _add_problem(self, key, dict_alg):
+        """align the data of all algorithms in `dict_alg` on problem `key`"""
+        datasets = {}
+        for alg, dsl in dict_alg.items():
+            if len(dsl) > 1:
+                warnings.warn('Algorithm %s has a problem on f%d %d-D.'
+                              % (alg, key[1], key[0]))
+            elif len(dsl) == 1:
+                datasets[alg] = dsl[0]
+        algs = [alg for alg in self.algorithms if alg in datasets]
+        if not algs:
+            return
+        res = readalign.alignArrayData(readalign.HArrayMultiReader(
+            list(np.transpose(np.vstack([datasets[alg].target, datasets[alg].ert]))
+                 for alg in algs)))
+        erts = np.inf * np.ones((len(res), len(self.algorithms)))
+        evals = len(self.algorithms) * [None]
+        for k, alg in enumerate(algs):
+            j = self.algorithms.index(alg)
+            erts[:, j] = res[:, 1 + k]
+            evals[j] = _evals_lines(datasets[alg].evals, res[:, 0])[:, 1:]
+        self.targets[key] = res[:, 0]
+        self.erts[key] = np.where(np.isnan(erts), np.inf, erts)
+        self.evals[key] = evals
+
+    @property
+    def problems(self):
+        """list of (dimension, function) keys with data"""
+        return list(self.targets)
+
+    def _columns(self, algorithms):
+        """return column indices of `algorithms`, all if `None`"""
+        if algorithms is None:
+            return np.arange(len(self.algorithms))
+        return np.asarray([self.algorithms.index(alg) for alg in algorithms], dtype=int)
+
+    def ert(self, algorithms=None):
+        """return a `dict` of virtual best ERT arrays of `algorithms`.
+
+        Keys are (dimension, function), values are aligned to `targets`.
+        """
+        columns = self._columns(algorithms)
+        return dict((key, np.min(erts[:, columns], axis=1))
+                    for key, erts in self.erts.items())
+
+    def best(self, algorithms=None):
+        """return a `dict` of the best algorithm name per target.
+
+        Ties are resolved in favor of the first algorithm in `algorithms`
+        (like in `BestAlgSet`), `None` means no algorithm reached the
+        target.
+        """
+        columns = self._columns(algorithms)
+        res = {}
+        for key, erts in self.erts.items():
+            ibest, best_erts = _argmin_erts(erts[:, columns])
+            res[key] = [self.algorithms[columns[i]] if np.isfinite(e) else None
+                        for i, e in zip(ibest, best_erts)]
+        return res
+
+    def best_evals(self, key, algorithms=None):
+        """return ``len(targets[key])`` evals rows of the virtual best of
+        `algorithms` on problem `key` = (dimension, function).
+        """
+        columns = self._columns(algorithms)
+        ibest, _ = _argmin_erts(self.erts[key][:, columns])
+        evals = self.evals[key]
+        return [evals[columns[i]][k] if evals[columns[i]] is not None
+                else np.asarray([np.nan])
+                for k, i in enumerate(ibest)]
+
+    def _pairs(self, dimensions=None, target_lb=1e-8, target_ub=1e2):
+        """return ERTs of all (problem, target) pairs as one array.
+
+        The returned array is of shape ``(number of pairs,
+        len(algorithms))``. Only targets between `target_lb` and
+        `target_ub` in `dimensions` (all if `None`) are used.
+        """
+        erts = [erts[(self.targets[key] >= target_lb) *
+                     (self.targets[key] <= target_ub)]
+                for key, erts in self.erts.items()
+                if dimensions is None or key[0] in dimensions]
+        if not erts:
+            return np.zeros((0, len(self.algorithms)))
+        return np.vstack(erts)
+
+    def ert_ecdf(self, budgets, dimension, algorithms=None,
+                 target_lb=1e-8, target_ub=1e2):
+        """return the fraction of (function, target) pairs in `dimension`
+        where the virtual best ERT of `algorithms` is ``<= budgets * dimension``.
+        """
+        erts = self._pairs([dimension], target_lb, target_ub)[
+            :, self._columns(algorithms)]
+        if not len(erts):
+            return np.nan * np.asarray(budgets)
+        erts = np.sort(np.min(erts, axis=1))
+        return np.searchsorted(erts, dimension * np.asarray(budgets),
+                               side='right') / float(len(erts))
+
+    def contributions(self, algorithms=None, target_lb=1e-8, target_ub=1e2):
+        """return a `dict` counting per (dimension, algorithm) how often
+        the algorithm is best for a (function, target) pair.
+
+        Only targets between `target_lb` and `target_ub` are taken
+        into account, as in `getAllContributingAlgorithmsToBest`.
+        """
+        columns = self._columns(algorithms)
+        res = {}
+        for key, erts in self.erts.items():
+            ibest, best_erts = _argmin_erts(erts[:, columns])
+            idx = ((self.targets[key] >= target_lb) *
+                   (self.targets[key] <= target_ub) * np.isfinite(best_erts))
+            for j, count in zip(*np.unique(ibest[idx], return_counts=True)):
+                alg = self.algorithms[columns[j]]
+                res[(key[0], alg)] = res.get((key[0], alg), 0) + int(count)
+        return res
+
+    def greedy_subset(self, k, dimensions=None, f_factor=1,
+                      target_lb=1e-8, target_ub=1e2):
+        """return a list of at most `k` algorithms selected greedily.
+
+        In each step, the algorithm is added which covers the most
+        (problem, target) pairs, where a pair is covered when the ERT
+        of the virtual best of the selected algorithms is within a
+        factor of `f_factor` of the virtual best of all algorithms.
+        Ties are resolved in favor of the first algorithm in
+        `algorithms`. The selection stops early when no algorithm
+        covers any additional pair.
+        """
+        erts = self._pairs(dimensions, target_lb, target_ub)
+        best_erts = np.min(erts, axis=1) if len(erts) else np.zeros(0)
+        idx = np.isfinite(best_erts)
+        erts, thresholds = erts[idx], f_factor * best_erts[idx, None]
+        current = np.inf * np.ones((len(erts), 1))
+        selected = []
+        while len(selected) < min((k, len(self.algorithms))):
+            covered = np.sum(np.minimum(current, erts) <= thresholds, axis=0)
+            covered[selected] = -1
+            j = np.argmax(covered)
+            if selected and covered[j] <= np.sum(current <= thresholds):
+                break
+            selected.append(j)
+            current = np.minimum(current, erts[:, [j]])
+        return [self.algorithms[j] for j in selected]
+
+
 # FUNCTION DEFINITIONS
+def _argmin_erts(erts):
+    """return indices and values of the row-wise smallest ERT in `erts`.
+
+    NaN entries are disregarded (TODO: don't disregard these entries).
+    Ties are resolved in favor of the first column, as `np.argmin`
+    returns the first index of the minimum. Unlike `np.nanargmin`, this
+    does not raise when all entries are NaN but returns ``0, inf``.
+
+    TODO: what do we do in case of ties? Look at function values
+    corresponding to the ERT? Look at the function evaluations? The
+    success ratio?
+    """
+    erts = np.asarray(erts, dtype=float)
+    erts = np.where(np.isnan(erts), np.inf, erts)
+    ibest = np.argmin(erts, axis=1)
+    return ibest, erts[np.arange(len(ibest)), ibest]
+
+
+def _evals_lines(evals, fvalues):
+    """return for each f-value the first `evals` line reaching it.
+
+    The returned lines have the f-value as first entry. If an f-value is
+    not reached, the last line of `evals` is used. `evals` are expected
+    to be sorted by decreasing f-values as in `DataSet.evals`.
+    """
+    evals = np.asarray(evals)
+    fvalues = np.asarray(fvalues)
+    if len(evals) == 0:
+        lines = np.tile([np.inf, 0.], (len(fvalues), 1))
+    else:  # -evals[:, 0] is sorted
+        iline = np.searchsorted(-evals[:, 0], -fvalues, side='left')
+        lines = evals[np.minimum(iline, len(evals) - 1)]
+    lines[:, 0] = fvalues
+    return lines
+
+
 def reset_reference_algorithm():
     global bestAlgorithmEntries
     bestAlgorithmEntries = {}
 
 
+@profiling.profiled('load_reference_algorithm')
 def load_reference_algorithm(best_algo_filename, force=False, relative_load=True):
     """Assigns :py:data:`bestAlgorithmEntries`.
 
@@ -463,17 +673,49 @@ def usage():
     print(__doc__)  # same as: sys.modules[__name__].__doc__, was: main.__doc__
 
 
-def generate(dict_alg, algId):
+def generate(dict_alg, algId, processes=None):
     """Generates dictionary of best algorithm data set.
+
+    The `BestAlgSet` for each (dimension, function) pair is computed in
+    `processes` worker processes, by default as many as given in
+    `genericsettings.number_of_processes`, where ``1`` means sequential
+    and ``0`` means ``os.cpu_count()``. The result does not depend on
+    the number of processes. The data sets are passed to the workers in
+    shared memory, see `shareddata.SharedDataSets`.
     """
 
     # dsList, sortedAlgs, dictAlg = processInputArgs(args)
-    res = {}
+    problems = []
     for f, i in pproc.dictAlgByFun(dict_alg).items():
         for d, j in pproc.dictAlgByDim(i).items():
-            tmp = BestAlgSet(j, algId)
-            res[(d, f)] = tmp
-    return res
+            problems.append(((d, f), j))
+
+    if processes is None:
+        processes = genericsettings.number_of_processes
+    if processes == 0:
+        processes = os.cpu_count() or 1
+    processes = min((processes, len(problems)))
+
+    if processes <= 1:
+        return dict((key, BestAlgSet(j, algId)) for key, j in problems)
+
+    from . import shareddata
+    with shareddata.SharedDataSets(
+            ds for key, j in problems for dsl in j.values() for ds in dsl) as shared, \
+         concurrent.futures.ProcessPoolExecutor(
+            processes, initializer=_init_generate_worker,
+            initargs=(testbedsettings.current_testbed,
+                      genericsettings.balance_instances)) as executor:
+        futures = [executor.submit(BestAlgSet, shared.handles(j), algId)
+                   for key, j in problems]
+        return dict((key, future.result())
+                    for (key, j), future in zip(problems, futures))
+
+
+def _init_generate_worker(current_testbed, balance_instances):
+    """set the global state `BestAlgSet` depends on in a worker process"""
+    testbedsettings.current_testbed = current_testbed
+    genericsettings.balance_instances = balance_instances
 
 
 def deprecated_customgenerate(args=algs2009):
@@ -510,13 +752,14 @@ def deprecated_customgenerate(args=algs2009):
     print('done with writing pickle...')
 
 
-def custom_generate(args=algs2009, algId='bestCustomAlg', suite=None):
+def custom_generate(args=algs2009, algId='bestCustomAlg', suite=None,
+                    processes=None):
     """Generates best algorithm data set from a given set of algorithms.
 
     It will create a folder named as algId in the current working directory
     corresponding to the bestalg dataSet of the algorithms listed in
     variable args. This folder is furthermore added to a `.tar.gz` file
-    of the same name.
+    of the same name. `processes` is passed to `generate`.
 
     This method is called from the python command line from a directory
     containing all necessary data folders::
@@ -543,7 +786,7 @@ def custom_generate(args=algs2009, algId='bestCustomAlg', suite=None):
         if genericsettings.verbose:
             print('Folder %s was created.' % output_dir)
 
-    result = generate(dictAlg, algId)
+    result = generate(dictAlg, algId, processes)
 
     create_data_files(output_dir, result, suite)
 
@@ -65,8 +65,7 @@ import numpy as np
 
 from .pproc import get_DataSetList as _DataSetList
 from .toolsdivers import StringList as _StringList
-from .archiving import official_archives
-from . import config as _config
+from . import archiving as _archiving
 from . import pproc as _pproc
 from . import genericsettings as _genericsettings
 from . import testbedsettings as _testbedsettings
@@ -212,7 +211,7 @@ class DataWithFewSuccesses:
         return len(self.result)
 
 
-def load(filename):
+def load(filename, dims=None, funcs=None, instances=None):
     """[currently broken when further used within `cocopp`, see `load2`] Create a :py:class:`DataSetList` instance from a file or folder.
 
     Input argument filename can be a single :file:`info` file name, a
@@ -220,11 +219,27 @@ def load(filename):
     folder is browsed recursively for :file:`info` or :file:`pickle`
     files.
 
+    `dims`, `funcs` and `instances` select the dimensions, function IDs
+    and instances to load, each is a number, a container or a callable.
+    Data files of not selected data are not read, see
+    `cocopp.pproc.DataSetList.__init__`.
+
+    >>> import cocopp
+    >>> from cocopp.benchmark import datagen
+    >>> with cocopp.toolsdivers.InfolderGoneWithTheWind():
+    ...     folder = datagen.write_experiment('.', 'bbob', functions=[1, 2, 3], dimensions=[2, 3])
+    ...     print('load data set'); dsl = cocopp.load(folder, dims=3, funcs=lambda f: f < 3,
+    ...                                               instances=range(1, 6))  # doctest:+ELLIPSIS
+    load data set...
+    >>> sorted((ds.funcId, ds.dim) for ds in dsl), sorted(set(dsl[0].instancenumbers))
+    ([(1, 3), (2, 3)], [1, 2, 3, 4, 5])
+
     Details: due to newly implemented side effects when data are read in,
     the returned data set list may not work anymore when used with plotting
     functions of the `cocopp` module, see also `load2`.
     """
-    return _DataSetList(official_archives.all.get_extended(_StringList(filename)))
+    return _DataSetList(_archiving.official_archives.all.get_extended(_StringList(filename)),
+                        dims=dims, funcs=funcs, instances=instances)
 
 def load2(args, keep=None, remove=None):
     """[WIP] return a `dict` of `dict` of `DataSetLists` with dimension and pathname as keys.
@@ -264,7 +279,7 @@ def load2(args, keep=None, remove=None):
         >> assert len(ddsl31[3]) == 31, ddsl
 
     """
-    args2 = official_archives.all.get_extended(args)
+    args2 = _archiving.official_archives.all.get_extended(args)
     dsList, _sortedAlgs, dictAlg = _pproc.processInputArgs(args2, True)  # takes ~1 minutes per 10 data sets
     dsList2 = _pproc.DataSetList(_testbedsettings.current_testbed.filter(dsList))
     if keep:
@@ -272,6 +287,7 @@ def load2(args, keep=None, remove=None):
     if remove:
         dsList2.remove_if(remove)
     dictAlg = dsList2.dictByAlgName()
+    from . import config as _config
     _config.config() # make sure that the filtered settings are taken into account?
     return _pproc.dictAlgByDim(dictAlg)
 
@@ -13,7 +13,6 @@ import matplotlib.pyplot as plt
 from .. import toolsstats, pproc, toolsdivers
 from ..ppfig import save_figure, consecutiveNumbers, plotUnifLogXMarkers
 from pdb import set_trace
-from six import advance_iterator
 
 #__all__ = []
 
@@ -91,6 +90,44 @@ def computeERT(fevals, maxevals):
     res = toolsstats.sp(data, issuccessful=success)
     return res[0]
 
+def _ert(evals, maxevals, firsts=None):
+    """return the ERT of each row of runtimes `evals`, where `nan` means
+    no success and `maxevals` gives the budgets of the runs (columns).
+
+    Like `computeERT` for each row, `inf` without any success. With
+    `firsts`, the ERT is computed for each group of consecutive columns
+    starting at the indices `firsts`.
+    """
+    success = numpy.isfinite(evals)
+    total = numpy.where(success, evals, maxevals)
+    if firsts is None:
+        nsuccesses, total = success.sum(axis=-1), total.sum(axis=-1)
+    else:
+        nsuccesses = numpy.add.reduceat(success, firsts, axis=-1)
+        total = numpy.add.reduceat(total, firsts, axis=-1)
+    return numpy.where(nsuccesses > 0, total / numpy.maximum(nsuccesses, 1), numpy.inf)
+
+def _fvalues_at(entry, budgets):
+    """return a (budgets x runs) array of the f-values of `entry` in the
+    last line of `entry.funvals` with less evaluations than the budget"""
+    return entry.funvals_at(budgets, side='left')
+
+def _runtimes_to(entry, fvalues, runs=None, firsts=None):
+    """return for each of `fvalues` the runtimes of the first line in
+    `entry.evals` with a target not larger than the f-value, the last
+    line if there is none.
+
+    With the column indices `runs` of groups starting at `firsts`, the
+    columns of `fvalues` are the f-values for each group and only the
+    runtimes of the `runs` are returned.
+    """
+    idx = numpy.searchsorted(-entry.evals[:, 0], -numpy.asarray(fvalues), side='left')
+    idx = numpy.minimum(idx, len(entry.evals) - 1)
+    if runs is None:
+        return entry.evals[idx, 1:]
+    counts = numpy.diff(numpy.append(firsts, len(runs)))
+    return entry.evals[numpy.repeat(idx, counts, axis=-1), 1 + numpy.asarray(runs)]
+
 def plotLogAbs(dsList0, dsList1, dim, targetValuesToReach):
     """Creates ECDF of run length ratios.
 
@@ -230,89 +267,59 @@ def plotLogRel(indexEntries0, indexEntries1, isByInstance=True):
     funIndexEntries0 = indexEntries0.dictByFunc()
     funIndexEntries1 = indexEntries1.dictByFunc()
     #Suppose we only have one dimension...
-    curevals = indexEntries0[0].dim # is supposed to be the same as i1.dim    
-
+    dim = indexEntries0[0].dim  # is supposed to be the same as i1.dim
+    budgets = []
+    curevals = dim
     while curevals < maxevals:
-        x = []
-        nn = 0
-        for func in set(funIndexEntries0.keys()).union(funIndexEntries1.keys()):
-            try:
-                i0 = funIndexEntries0[func][0]
-                i1 = funIndexEntries1[func][0]
-            except KeyError:
-                continue
-
-            #Could gain time by storing the iterators over all functions...
-            #Get the curDf
-            it0 = iter(i0.funvals)
-            it1 = iter(i1.funvals)
-            try:
-                nline0 = advance_iterator(it0)
-                while nline0[0] < curevals:
-                    line0 = nline0
-                    nline0 = advance_iterator(it0)
-            except StopIteration:
-                pass #we keep the last line obtained.
-            try:
-                nline1 = advance_iterator(it1)
-                while nline1[0] < curevals:
-                    line1 = nline1
-                    nline1 = advance_iterator(it1)
-            except StopIteration:
-                pass #we keep the last line obtained.
-
-            ERT = []
-            if not isByInstance:
-                curDf = min(numpy.append(line0[1:], line1[1:]))
-                for i, entry in enumerate((i0, i1)):
-                    for j in entry.evals:
-                        if j[0] <= curDf:
-                            break
-                    ERT.append(computeERT(j, entry.maxevals))
-
-                if not numpy.isnan(ERT[1]/ERT[0]):
-                    x.append(ERT[1]/ERT[0])
-                    nn += 1
-                #TODO check it is the same as ERT[1] ???
-            else:
-                lines = (line0, line1)
-                #Set curDf
-                curDf = {}
-                for k in (set(i0.instancenumbers) & set(i1.instancenumbers)):
-                    curDf[k] = []
-                    for i, entry in enumerate((i0, i1)):
-                        for j in range(len(entry.instancenumbers)):
-                            if entry.instancenumbers[j] == k:
-                                curDf[k].append(lines[i][1+j])
-                    curDf[k] = min(curDf[k])
-
-                for i, entry in enumerate((i0, i1)):
-                    dictinstance = {}
-                    for j in range(len(entry.instancenumbers)):
-                        dictinstance.setdefault(entry.instancenumbers[j], []).append(j)
-                    ERT.append(dictinstance.copy())
-                    for k in dictinstance:
-                        for j in entry.evals:
-                            if j[0] <= curDf[k]:
-                                break
-                        ERT[i][k] = computeERT(j[list(1+i for i in dictinstance[k])],
-                            entry.maxevals[list(i for i in dictinstance[k])])
-
-                s0 = set(ERT[0])
-                s1 = set(ERT[1])
-                #Could be done simpler
-                for j in s0 - s1:
-                    x.append(0)
-                    nn += 1
-                for j in s0 & s1:
-                    if not numpy.isnan(ERT[1][j]/ERT[0][j]):
-                        x.append(ERT[1][j]/ERT[0][j])
-                        nn += 1
-                for j in s1 - s0:
-                    x.append(numpy.inf)  # 12/02/25: was inf and therefore could never execute
-                    nn += 1
-
-        label = '1e%+d * DIM' % numpy.log10(curevals/indexEntries0[0].dim)
+        budgets.append(curevals)
+        curevals *= 10
+    budgets = numpy.asarray(budgets, dtype=float)
+
+    # ERT ratios for all budgets at once, one list per budget
+    xs = [[] for _ in budgets]
+    nns = numpy.zeros(len(budgets), dtype=int)
+    def append(ert1, ert0=1.):
+        """append the non-nan ratios ``ert1 / ert0``, one per budget"""
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            ratios = numpy.broadcast_to(numpy.asarray(ert1, dtype=float) / ert0, budgets.shape)
+        for ib, ratio in enumerate(ratios):
+            if not numpy.isnan(ratio):
+                xs[ib].append(ratio)
+                nns[ib] += 1
+    for func in set(funIndexEntries0.keys()).union(funIndexEntries1.keys()):
+        try:
+            i0 = funIndexEntries0[func][0]
+            i1 = funIndexEntries1[func][0]
+        except KeyError:
+            continue
+        # f-values of all runs at all budgets, a (budgets x runs) array each
+        lines = (_fvalues_at(i0, budgets), _fvalues_at(i1, budgets))
+        if not isByInstance:
+            curDf = numpy.fmin.reduce(numpy.hstack(lines), axis=1)
+            append(_ert(_runtimes_to(i1, curDf), i1.maxevals),
+                   _ert(_runtimes_to(i0, curDf), i0.maxevals))
+            continue
+        # all instances at once, the runs of each entry grouped by instance
+        indices = [entry.instance_index_lists() for entry in (i0, i1)]
+        common = [k for k in indices[0] if k in indices[1]]
+        for k in set(indices[0]) - set(common):
+            append(0.)
+        for k in set(indices[1]) - set(common):
+            append(numpy.inf)
+        if not common:
+            continue
+        runs = [numpy.hstack([idx[k] for k in common]) for idx in indices]
+        firsts = [numpy.cumsum([0] + [len(idx[k]) for k in common[:-1]]) for idx in indices]
+        # the best f-value of the runs on each instance, a (budgets x instances) array
+        curDf = numpy.fmin(*[numpy.fmin.reduceat(line[:, r], f, axis=1)
+                             for line, r, f in zip(lines, runs, firsts)])
+        ERT = [_ert(_runtimes_to(entry, curDf, r, f), numpy.asarray(entry.maxevals)[r], f)
+               for entry, r, f in zip((i0, i1), runs, firsts)]
+        for k in range(len(common)):
+            append(ERT[1][:, k], ERT[0][:, k])
+
+    for curevals, x, nn in zip(budgets, xs, nns):
+        label = '1e%+d * DIM' % numpy.log10(curevals / dim)
         n = len(x)
         x.sort()
         #Catch negative values, those could be a problem with the log scale...
@@ -339,9 +346,6 @@ def plotLogRel(indexEntries0, indexEntries1, isByInstance=True):
                                (n-tmp2)/float(nn), (n-tmp2)/float(nn)])
             res.append(plt.plot(x2, y2, label=label))
 
-        #Update the curDf
-        curevals *= 10
-
     return res#, fsolved, funcs
 
 def main(dsList0, dsList1, dim, targetsOfInterest=None,
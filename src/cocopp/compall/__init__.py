@@ -8,3 +8,13 @@ Contains routines for the comparison of multiple algorithms.
 
 """
 
+import importlib as _importlib
+
+def __getattr__(name):
+    """import submodules on first access, like ``cocopp.compall.pprldmany``"""
+    try:
+        return _importlib.import_module('.' + name, __name__)
+    except ImportError as e:
+        if getattr(e, 'name', None) != __name__ + '.' + name:
+            raise
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
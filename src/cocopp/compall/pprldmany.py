@@ -41,6 +41,7 @@ from .. import toolsdivers  # strip_pathname, str_to_latex
 from .. import pprldistr  # plotECDF, beautifyECDF
 from .. import ppfig  # consecutiveNumbers, save_figure, plotUnifLogXMarkers, logxticks
 from .. import pptex  # numtotex
+from .. import watch  # affected
 
 PlotType = ppfig.enum('ALG', 'DIM', 'FUNC')
 
@@ -510,7 +511,11 @@ def plot(dsList, targets=None, craftingeffort=0., **kwargs):
 
 
 def all_single_functions(dict_alg, is_single_algorithm, sorted_algs=None,
-                         output_dir='.', parent_html_file_name=None, settings=genericsettings):
+                         output_dir='.', parent_html_file_name=None, settings=genericsettings,
+                         problems=None):
+    """generate the ECDF figures of single functions and of function
+    groups, with `problems` only those affected by these ``(funcId,
+    dim)`` pairs, see `watch.affected`"""
     single_fct_output_dir = (output_dir.rstrip(os.sep) + os.sep +
                              'pprldmany-single-functions'
                              # + os.sep + ('f%03d' % fg)
@@ -518,7 +523,7 @@ def all_single_functions(dict_alg, is_single_algorithm, sorted_algs=None,
     if not os.path.exists(single_fct_output_dir):
         os.makedirs(single_fct_output_dir)
 
-    if is_single_algorithm:
+    if is_single_algorithm and watch.affected(dict_alg, problems):
         main(dict_alg,
              order=sorted_algs,
              outputdir=single_fct_output_dir,
@@ -529,6 +534,8 @@ def all_single_functions(dict_alg, is_single_algorithm, sorted_algs=None,
 
         dictFG = pp.dictAlgByFuncGroup(dict_alg)
         for fg, entries in sorted(dictFG.items()):
+            if not watch.affected(entries, problems):
+                continue
             main(entries,
                  order=sorted_algs,
                  outputdir=single_fct_output_dir,
@@ -541,6 +548,8 @@ def all_single_functions(dict_alg, is_single_algorithm, sorted_algs=None,
     for fg, tempDictAlg in sorted(dictFG.items()):
 
         if is_single_algorithm:
+            if not watch.affected(tempDictAlg, problems):
+                continue
             main(tempDictAlg,
                  order=sorted_algs,
                  outputdir=single_fct_output_dir,
@@ -553,6 +562,8 @@ def all_single_functions(dict_alg, is_single_algorithm, sorted_algs=None,
             dims = sorted(dictDim)
             for i, d in enumerate(dims):
                 entries = dictDim[d]
+                if not watch.affected(entries, problems):
+                    continue
                 main(entries,
                      order=sorted_algs,
                      outputdir=single_fct_output_dir,
@@ -579,6 +590,8 @@ def all_single_functions(dict_alg, is_single_algorithm, sorted_algs=None,
             next_dim = dims[i+1] if i + 1 < len(dims) else dims[0]  # noqa: F841
             dictFG = pp.dictAlgByFuncGroup(tempDictAlg)
             for fg, entries in sorted(dictFG.items()):
+                if not watch.affected(entries, problems):
+                    continue
                 main(entries,
                      order=sorted_algs,
                      outputdir=single_fct_output_dir,
@@ -13,6 +13,7 @@ from .. import genericsettings, bestalg, toolsstats, pproc, ppfigparam, testbeds
 from ..pptex import writeFEvals2, writeFEvalsMaxPrec, tableXLaTeX, numtotext
 from ..toolsstats import significancetest, significance_all_best_vs_other, best_alg_indices
 from ..toolsdivers import str_to_latex, strip_pathname1, strip_pathname3, replace_in_file, get_version_label, prepend_to_file
+from ..toolsdivers import read_lines, write_lines
 
 
 def get_table_caption():
@@ -252,8 +253,13 @@ def get_top_indices_of_columns(table, max_rank=None):
 
 
 # TODO: function_headings argument need to be tested, default should be changed according to templates
-def main(dict_alg, sorted_algs, output_dir='.', function_targets_line=True, latex_commands_file=''):  # [1, 13, 101]
-    """Generate one table per func with results of multiple algorithms."""
+def main(dict_alg, sorted_algs, output_dir='.', function_targets_line=True, latex_commands_file='',
+         write_tex=True):  # [1, 13, 101]
+    """Generate one table per func with results of multiple algorithms.
+
+    The tables are always inserted into the html page, the ``.tex``
+    files are only written with `write_tex`.
+    """
     """Difference with the first version:
 
     * numbers aligned using the decimal separator
@@ -683,40 +689,32 @@ def main(dict_alg, sorted_algs, output_dir='.', function_targets_line=True, late
 
         # Write table
         res = tableXLaTeX(table, spec=spec, extra_eol=extraeol, add_begin_tabular=False, add_end_tabular=False)
-        try:
+        if write_tex:
             filename = os.path.join(output_dir, 'pptables_f%03d_%02dD.tex' % (df[1], df[0]))
-            f = open(filename, 'w')
-            if with_table_heading:
-                f.write(header + '\n')
-            f.write(res)
-
-            res = "".join(str(item) for item in tableHtml)
-            res = '\n<table class=\"sortable\" >\n%s</table>\n<p/>\n' % res
-
-            if True:
-                filename = os.path.join(output_dir, genericsettings.pptables_file_name + '.html')
-
-                lines = []
-                html_string = '<!--pptablesHtml_%d-->' % df[0]
-                with open(filename) as infile:
-                    for line in infile:
-                        if html_string in line:
-                            lines.append(res)
-                        lines.append(line)
-
-                with open(filename, 'w') as outfile:
-                    for line in lines:
-                        outfile.write(line)
-                
-                replace_in_file(filename, '??COCOVERSION??', '<br />Data produced with COCO %s' % (get_version_label(None)))
-
-            if genericsettings.verbose:
-                print('Wrote table in %s' % filename)
-        except:
-            raise
-        else:
-            f.close()
-            # TODO: return status
+            with open(filename, 'w') as f:
+                if with_table_heading:
+                    f.write(header + '\n')
+                f.write(res)
+
+        res = "".join(str(item) for item in tableHtml)
+        res = '\n<table class=\"sortable\" >\n%s</table>\n<p/>\n' % res
+
+        filename = os.path.join(output_dir, genericsettings.pptables_file_name + '.html')
+
+        lines = []
+        html_string = '<!--pptablesHtml_%d-->' % df[0]
+        for line in read_lines(filename):
+            if html_string in line:
+                lines.append(res)
+            lines.append(line)
+
+        write_lines(filename, lines)
+
+        replace_in_file(filename, '??COCOVERSION??', '<br />Data produced with COCO %s' % (get_version_label(None)))
+
+        if genericsettings.verbose:
+            print('Wrote table in %s' % filename)
+        # TODO: return status
 
     if len(additional_commands) > 0:
         for command in additional_commands:
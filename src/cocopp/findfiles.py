@@ -11,11 +11,16 @@ This module can be called from the shell, it will recursively look for
 
 displays found (extracted) files.
 
+The files are found with `manifest`, which scans the folder tree with
+`os.scandir` in parallel and caches the result per folder, such that a
+repeated search over unchanged data does not list the folders again.
+
 TODO: we do not use pickle files anymore.
 """
 from __future__ import absolute_import, division, print_function
 import os
 import sys
+import json
 import time
 import warnings
 import tarfile
@@ -31,6 +36,18 @@ else:
 from .toolsdivers import StringList  # def StringList(list_): return list_
 from . import genericsettings
 
+manifest_version = 1
+"""version of the manifest format, a cached manifest with another
+   version is discarded"""
+manifests_max_number = 1000
+"""number of most recently written manifests kept in the cache, see
+   `manifest`"""
+_manifests_pruned = False
+output_folder_time = None
+"""time stamp in the output folder names, the current time when `None`,
+   fixed while `rungeneric.main` watches for new data to update the
+   same folders, see `get_output_directory_sub_folder`"""
+
 # Initialization
 
 
@@ -57,30 +74,231 @@ def main(directory='.'):
     are extracted.
 
     The "data" files have :file:`info` and :file:`pickle` extensions.
+    They are listed in the order of `os.walk`, see also `manifest`.
 
     TODO: not only recognize .tar and .tar.gz and .tgz but .zip...
 
     """
 
-    file_list = list()
-    root = ''
     directory = get_directory(directory, True)
-
-    # Search through the directory directory and all its subfolders.
-    for root, _dirs, files in os.walk(directory):
-        if genericsettings.verbose:
-            print('Searching in %s ...' % root)
-
-        for elem in files:
-            if elem.endswith('.info') or elem.endswith('.pickle') or elem.endswith('.pickle.gz'):
-                file_list.append(os.path.join(root, elem))
+    res = manifest(directory, cache=genericsettings.cache_file_manifests)
+    if genericsettings.verbose:
+        for folder in res['directories']:
+            print('Searching in %s ...' % os.path.join(directory, folder))
+    file_list = [os.path.join(directory, name) for name in res['files']]
 
     if genericsettings.verbose:
         print('Found %d file(s).' % (len(file_list)))
     if not file_list:
-        warnings.warn('Could not find any file of interest in %s!' % root)
+        warnings.warn('Could not find any file of interest in %s!' % directory)
     return file_list
 
+def _is_data_file(name):
+    return name.endswith('.info') or name.endswith('.pickle') or name.endswith('.pickle.gz')
+
+def _scan_directory(path):
+    """return files, subfolders to descend into, and the mtime of folder `path`.
+
+    Like in `os.walk`, symbolic links to folders are not followed and
+    an unreadable folder is regarded as empty.
+    """
+    files, folders = [], []
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.name)
+                elif not entry.is_symlink():
+                    folders.append(entry.name)
+    except OSError:
+        return [], [], None
+    return files, folders, mtime
+
+def _walk(directory, max_workers=None):
+    """return ``[(relative folder, files, mtime_ns), ...]`` in the order of
+    `os.walk` (top-down), the folders are scanned in parallel threads"""
+    import concurrent.futures
+    tree = {}  # relative folder: (files, subfolders, mtime_ns)
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        pending = {executor.submit(_scan_directory, directory): ''}
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                folder = pending.pop(future)
+                tree[folder] = future.result()
+                for name in tree[folder][1]:
+                    sub = os.path.join(folder, name)
+                    pending[executor.submit(_scan_directory, os.path.join(directory, sub))] = sub
+    res, stack = [], ['']
+    while stack:
+        folder = stack.pop()
+        files, folders, mtime = tree[folder]
+        res.append((folder, files, mtime))
+        stack.extend(os.path.join(folder, name) for name in reversed(folders))
+    return res
+
+def _scan(directory, max_workers=None):
+    """return a new manifest of `directory`, see `manifest`"""
+    from .archiving import _data_file_references
+    res = {'version': manifest_version, 'directory': os.path.abspath(directory),
+           'directories': {}, 'files': [], 'info': {}}
+    for folder, files, mtime in _walk(directory, max_workers):
+        if mtime is None:
+            continue
+        res['directories'][folder] = mtime
+        res['files'].extend(os.path.join(folder, name) for name in files if _is_data_file(name))
+    for name in res['files']:
+        if not name.endswith('.info'):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path, 'rt', encoding='latin-1') as f:
+                references = _data_file_references(f.read())
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        data = []
+        for reference in references:
+            dat = os.path.normpath(os.path.join(os.path.dirname(name), reference))
+            for data_file in (dat, dat[:-4] + '.tdat'):
+                try:
+                    size = os.stat(os.path.join(directory, data_file)).st_size
+                except OSError:
+                    size = None
+                data.append([data_file, size])
+        res['info'][name] = {'mtime_ns': mtime, 'data': data}
+    return res
+
+def _is_current(manifest_, directory):
+    """return `True` if no folder or ``.info`` file changed since the
+    manifest was made"""
+    try:
+        return (manifest_.get('version') == manifest_version and
+                manifest_['directory'] == os.path.abspath(directory) and
+                all(os.stat(os.path.join(directory, folder)).st_mtime_ns == mtime
+                    for folder, mtime in manifest_['directories'].items()) and
+                all(os.stat(os.path.join(directory, name)).st_mtime_ns == info['mtime_ns']
+                    for name, info in manifest_['info'].items()))
+    except (OSError, KeyError, TypeError, AttributeError):
+        return False
+
+def _prune_manifests(folder):
+    """remove cached manifests of directories which do not exist anymore
+    and all but the `manifests_max_number` most recent manifests"""
+    kept = []
+    for entry in os.scandir(folder):
+        if not entry.name.endswith('.json'):
+            continue
+        try:
+            with open(entry.path, 'rt') as f:
+                directory = json.load(f).get('directory')
+            if directory and os.path.isdir(directory):
+                kept.append((entry.stat().st_mtime, entry.path))
+                continue
+        except (OSError, ValueError, AttributeError):
+            pass
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+    for _mtime, path in sorted(kept, reverse=True)[manifests_max_number:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def manifest(directory, max_workers=None, cache=True):
+    """return a `dict` describing the data files found in `directory`.
+
+    The folder tree is scanned with `os.scandir`, the subfolders in
+    parallel with `max_workers` threads. The returned `dict` has keys
+
+    - ``'directories'``: the scanned folders relative to `directory`,
+      in the order of `os.walk`, with their modification time in ns
+    - ``'files'``: the ``.info`` and ``.pickle`` files relative to
+      `directory` in the order of `os.walk`
+    - ``'info'``: for each ``.info`` file, its modification time and
+      ``'data'``, a list of ``[name, size]`` of the referenced ``.dat``
+      and corresponding ``.tdat`` files, `size` is `None` when the file
+      is missing
+
+    With `cache`, the manifest is stored as json file in
+    ``archiving.cocopp_home`` and reused as long as the modification
+    times of the scanned folders and of the ``.info`` files did not
+    change. Adding, removing or renaming a file changes the time of its
+    folder, whereas sizes of data files changed in place may be outdated.
+    When the first manifest of a session is written, cached manifests of
+    removed directories are deleted and at most `manifests_max_number`
+    manifests are kept.
+
+    >>> import os
+    >>> from cocopp import findfiles
+    >>> from cocopp.benchmark import datagen
+    >>> from cocopp.toolsdivers import InfolderGoneWithTheWind
+    >>> with InfolderGoneWithTheWind():
+    ...     folder = datagen.write_experiment('.', 'bbob', functions=[1, 2], dimensions=[2, 3])
+    ...     m = findfiles.manifest(folder, cache=False)
+    ...     walked = [os.path.relpath(os.path.join(root, name), folder)
+    ...               for root, _, files in os.walk(folder) for name in files
+    ...               if name.endswith('.info')]
+    ...     m['files'] == walked, m['info']['bbobexp_f2.info']['data'][1][0]
+    (True, 'data_f2/bbobexp_f2_DIM2.tdat')
+
+    With `cache`, the folder is only scanned again when it has changed:
+
+    >>> scans = []
+    >>> scan = findfiles._scan
+    >>> findfiles._scan = lambda *args: scans.append(args[0]) or scan(*args)
+    >>> with InfolderGoneWithTheWind():
+    ...     folder = datagen.write_experiment('.', 'bbob', functions=[1, 2], dimensions=[2])
+    ...     m1 = findfiles.manifest(folder)
+    ...     m2 = findfiles.manifest(folder)  # from the cache
+    ...     info = os.path.join(folder, 'bbobexp_f1.info')
+    ...     os.utime(info, ns=(os.stat(info).st_atime_ns, os.stat(info).st_mtime_ns + 10**9))
+    ...     m3 = findfiles.manifest(folder)  # the .info file was touched
+    ...     _ = datagen.write_experiment('.', 'bbob', functions=[3], dimensions=[2])
+    ...     m4 = findfiles.manifest(folder)  # a .info file was added
+    >>> findfiles._scan = scan
+    >>> len(scans), m1 == m2, m3 == m1, sorted(m4['info'])
+    (3, True, False, ['bbobexp_f1.info', 'bbobexp_f2.info', 'bbobexp_f3.info'])
+
+    """
+    global _manifests_pruned
+    filename = None
+    if cache:
+        from .archiving import cocopp_home
+        filename = os.path.join(cocopp_home, 'manifests',
+                                hash(os.path.abspath(directory)) + '.json')
+        try:
+            with open(filename, 'rt') as f:
+                res = json.load(f)
+        except (OSError, ValueError):
+            pass
+        else:
+            if _is_current(res, directory):
+                return res
+    res = _scan(directory, max_workers)
+    if filename and res['files']:
+        try:
+            if not os.path.exists(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+            with open(filename + '.tmp', 'wt') as f:
+                json.dump(res, f)
+            os.replace(filename + '.tmp', filename)  # never leave a partially written file
+            if not _manifests_pruned:
+                _manifests_pruned = True
+                _prune_manifests(os.path.dirname(filename))
+        except OSError as e:
+            warnings.warn("could not write manifest file {} getting exception {}"
+                          .format(filename, e))
+    return res
+
 
 def get_directory(directory, extract_files):
 
@@ -179,7 +397,7 @@ def get_output_directory_sub_folder(args, addhash=0, addtime=True):
         raise ValueError(args)
 
     return testbedname + ('_' if testbedname else '') + directory + (
-        '_' + time.strftime("%m%d%Hh%M%S")
+        '_' + (output_folder_time or time.strftime("%m%d%Hh%M%S"))
         # + '{:.2f}'.format(time.time()).split('.')[1]
             if addtime else '') + (
         '_' + hash(''.join(args), addhash) if addhash else '')
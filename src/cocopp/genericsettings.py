@@ -42,6 +42,10 @@ in_a_hurry = 1000  # [0, 1000] lower resolution, no eps, saves 30% time
 warning_level = 1  # higher levels show more warnings, experimental, will not work on all warnings
 maxevals_fix_display = None  # 3e2 is the expensive setting only used in config, yet to be improved!?
 runlength_based_targets = False  # may be overwritten by expensive setting
+persist_runlength_based_targets = False
+"""write the targets computed in `pproc.RunlengthBasedTargetValues` to a
+   file in ``archiving.cocopp_home`` and reuse them in later runs with the
+   same reference algorithm data"""
 figure_file_formats = ['svg', 'pdf']
 scaling_figures_with_boxes = True
 scaling_plots_with_axis_labels = False
@@ -50,6 +54,12 @@ balance_instances = True
 """ give even weight to all instances by added columns with copies of
     underrepresented instances in DataSet.evals
     """
+balance_instances_with_weights = True
+""" when balancing instances, compute runtimes, ERT and success rates from
+    the raw data with a weight per column, see `DataSet.instance_weights`,
+    rather than from the widened `DataSet.evals`, which is then only built
+    on direct access. The results are the same.
+    """
 appended_evals_minimal_trials = 6
 """ minimum number of instances required in the ``appended_evals`` array such
     that `DataSet.appended_evals` is created to be different from `DataSet.evals`
@@ -104,6 +114,13 @@ simulated_runlength_bootstrap_sample_size = 30 + int(970 / (1 + 10 * max((0, in_
    for a final camera-ready paper version.
    """
 
+number_of_processes = 1
+"""number of worker processes used for tasks which can run in parallel,
+   like generating the best algorithm data set per (dimension, function)
+   in `bestalg.generate`. ``1`` means sequential processing and ``0``
+   means to use ``os.cpu_count()`` processes.
+   """
+
 _current_args = None
 '''arguments found in rungeneric.main, namely a list of folders
    returned by `COCODataArchive.get_extended` of ``cocopp.archives.all``.'''
@@ -246,6 +263,9 @@ ppfigdim_file_name = 'ppfigdim'
 latex_commands_for_html = 'latex_commands_for_html'
 
 extraction_folder_prefix = '.extracted_'
+cache_file_manifests = True
+'''cache the data files found in a folder and reuse them while the folder
+   tree is unchanged, see `findfiles.manifest`'''
 
 # default settings for rungeneric, rungeneric1 and rungenericmany
 inputCrE = 0.
@@ -255,6 +275,10 @@ isNoisy = False
 isNoiseFree = False
 isConv = False
 verbose = False
+profile = False
+"""record timing spans and counters with `cocopp.profiling` and write
+   ``cocopp_profile.json`` (Chrome trace format) and ``cocopp_profile.txt``
+   into the output folder, see also the ``--profile`` option"""
 outputdir = 'ppdata'
 inputsettings = 'color'
 isExpensive = False
@@ -269,6 +293,24 @@ background = {}
    ``background = {None: cocopp.archives.bbob_mixint.get_all('')}`` for all algorithms
    benchmarked on the bbob-mixint test suite.'''
 background_default_style = (3 * (0.9,), '-')  # very light gray
+compact_background = True
+'''reduce the memory of the data sets of `background` algorithms with
+   `pproc.DataSet.compact`, their `nbytes` attribute gives the memory'''
+background_float32 = False
+'''store the `funvals` of `background` algorithms in single precision,
+   which roughly halves their memory, see `pproc.DataSet.compact`'''
+background_summaries = True
+'''load `background` algorithms as summaries without `funvals`, which are
+   not displayed, and cache these on disk by the hash of the data, see
+   `pproc.get_DataSetList_summary`'''
+download_ahead = 2
+'''number of archived data sets downloaded in the background ahead of the
+   one being parsed, see `archiving.DownloadPipeline`, with 0 all data are
+   downloaded before parsing begins'''
+
+watch_interval = 10
+'''seconds between two checks of the input folders for new data with
+   option ``--watch``, see `watch.watch`'''
 
 foreground_algorithm_list = []
 '''a list of data files/folders as those specified in cocopp.main'''
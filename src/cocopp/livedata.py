@@ -0,0 +1,162 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Incremental loading of data from running experiments.
+
+`LiveDataSetList` loads the data of experiment folders like
+`pproc.DataSetList` and `LiveDataSetList.refresh` updates them while
+the experiments progress. Data files are read with
+`readalign.TailReader`, hence only lines appended since the last refresh
+are parsed. Data sets whose ``.info`` entries or data files changed are
+aligned anew from the already parsed runs and updated in place, all
+other data sets are left untouched. Entries for new functions,
+dimensions or instances are added as they appear in the ``.info`` files.
+
+>>> import cocopp
+>>> from cocopp import livedata
+>>> from cocopp.benchmark import datagen
+>>> with cocopp.toolsdivers.InfolderGoneWithTheWind():
+...     folder = datagen.write_experiment('.', 'bbob', functions=[1, 2], dimensions=[2],
+...                                       instances=[1, 2, 3])
+...     print('load data set'); dsl = livedata.LiveDataSetList(folder)  # doctest:+ELLIPSIS
+...     ds = dsl[0]
+...     _ = datagen.write_experiment('.', 'bbob', functions=[1, 2, 3], dimensions=[2],
+...                                  instances=[1, 2, 3, 4, 5])  # appends to the files
+...     print('refresh'); changed = dsl.refresh()  # doctest:+ELLIPSIS
+load data set...
+refresh...
+>>> len(dsl), len(changed), ds is dsl[0], ds.instancenumbers
+(3, 3, True, [1, 2, 3, 4, 5])
+
+"""
+
+from __future__ import absolute_import, division, print_function
+import os
+import warnings
+from six import string_types
+from . import findfiles, pproc, readalign, testbedsettings
+from .readalign import openfile
+
+
+class LiveDataSetList(pproc.DataSetList):
+    """A `pproc.DataSetList` of growing experiment data.
+
+    `args` are folders, archives or ``.info`` files like for
+    `pproc.DataSetList`. The parsed runs of all data files are kept in
+    memory by `refresh`, such that updating a data set does not read its
+    data files again.
+    """
+    def __init__(self, args=()):
+        super(LiveDataSetList, self).__init__()
+        self.args = [args] if isinstance(args, string_types) else list(args)
+        self._alg_names = dict((arg, pproc._alg_name_from_path(arg)) for arg in self.args)
+        self._readers = {}  # data file name: readalign.TailReader
+        self._data_files = {}  # entry: data file names
+        self._groups = []  # entries merged into the data set at the same index
+        self.refresh()
+
+    def _current_entries(self):
+        """return a `dict` of all ``(index file, header, comment, data)``
+        entries in the order of reading, mapped to their algorithm name"""
+        res = {}
+        for arg in self.args:
+            if findfiles.is_recognized_repository_filetype(arg):
+                names = findfiles.main(arg)
+            else:
+                names = [arg]
+            for index_file in names:
+                if not index_file.endswith('.info'):
+                    continue
+                try:
+                    with openfile(index_file, errors='replace') as f:
+                        for header, comment, data in pproc._index_entries(f, index_file):
+                            res[(index_file, header, comment, data)] = self._alg_names[arg]
+                except IOError as e:
+                    warnings.warn('could not read "%s" (%s)' % (index_file, e))
+        return res
+
+    def _build(self, entry, alg_name):
+        """return the data set of `entry` or `None`"""
+        index_file, header, comment, data = entry
+        try:
+            ds = pproc.DataSet(header, comment, data, index_file)
+        except (IOError, ValueError) as e:  # a line may be written just now
+            warnings.warn('entry "%s" of "%s" is skipped (%s)' % (data.strip(), index_file, e))
+            return None
+        if alg_name is not None:
+            ds.algId = alg_name
+        folder = os.path.dirname(index_file)
+        self._data_files[entry] = [os.path.join(folder, os.path.splitext(name)[0] + extension)
+                                   for name in ds.dataFiles for extension in ('.dat', '.tdat')]
+        return ds if len(ds.instancenumbers) > 0 else None
+
+    def refresh(self):
+        """read new data and return the list of added or updated data sets.
+
+        Updated data sets keep their identity, all their attributes are
+        replaced, which also discards cached values like `DataSet.ert`.
+        """
+        changed_files = set()
+        for name, reader in self._readers.items():
+            try:
+                if reader.update():
+                    changed_files.add(name)
+            except IOError:
+                changed_files.add(name)
+        entries = self._current_entries()
+        group_of = dict((entry, i) for i, group in enumerate(self._groups) for entry in group)
+        affected = set(group_of[entry] for entry in group_of if entry not in entries or
+                       any(name in changed_files for name in self._data_files.get(entry, ())))
+        tail_readers, readalign.tail_readers = readalign.tail_readers, self._readers
+        try:
+            with warnings.catch_warnings():
+                # runs in progress are not finalized yet
+                warnings.filterwarnings('ignore', message='Caught an ill-finalized run')
+                built = {}
+                for entry, alg_name in entries.items():
+                    if entry not in group_of:
+                        built[entry] = ds = self._build(entry, alg_name)
+                        affected.update(i for i, old in enumerate(self) if ds is not None and old == ds)
+                merged = pproc.DataSetList()
+                merged_entries = []
+                for entry, alg_name in entries.items():
+                    if entry in built or group_of[entry] in affected:
+                        ds = built[entry] if entry in built else self._build(entry, alg_name)
+                        if ds is None:
+                            continue
+                        merged.append(ds)
+                        j = next(j for j, merged_ds in enumerate(merged) if merged_ds == ds)
+                        if j == len(merged_entries):
+                            merged_entries.append([])
+                        merged_entries[j].append(entry)
+        finally:
+            readalign.tail_readers = tail_readers
+        res = []
+        unmatched = sorted(affected)
+        for ds, group in zip(merged, merged_entries):
+            i = next((i for i in unmatched if self[i] == ds), None)
+            if i is None:
+                list.append(self, ds)
+                self._groups.append(group)
+                res.append(ds)
+                continue
+            unmatched.remove(i)
+            self[i].__dict__.clear()
+            self[i].__dict__.update(ds.__dict__)
+            self._groups[i] = group
+            res.append(self[i])
+        for i in sorted(unmatched, reverse=True):  # data sets without entries
+            del self[i]
+            del self._groups[i]
+        groups = dict((id(ds), group) for ds, group in zip(self, self._groups))
+        self.sort()  # like DataSetList
+        self._groups = [groups[id(ds)] for ds in self]
+        self.current_testbed = testbedsettings.current_testbed
+        for entry in list(self._data_files):
+            if entry not in entries:
+                del self._data_files[entry]
+        used = set(name for names in self._data_files.values() for name in names)
+        for name in list(self._readers):
+            if name not in used:
+                del self._readers[name]
+        return res
@@ -27,15 +27,13 @@ def rearrange(blist, flist):
        corresponding flist"""
     final_b = []
     final_f = []
-    for i in range(0, len(blist)): #runs over dimensions
-        erg_b = numpy.empty((0), float)
-        erg_f = [numpy.empty((0), float), numpy.empty((0), float), numpy.empty((0), float)]
-        for j in range(0, len(blist[i])): #runs over function evaluations
-            erg_b = numpy.append(erg_b, blist[i][j])
-            erg_f[0] = numpy.append(erg_f[0], numpy.median(flist[i][j]))
-            erg_f[1] = numpy.append(erg_f[1], prctile(flist[i][j], [0.25]))
-            erg_f[2] = numpy.append(erg_f[2], prctile(flist[i][j], [0.75]))
-        final_b.append(erg_b)
+    for b, f in zip(blist, flist): #runs over dimensions
+        f = numpy.asarray(f, dtype=float)
+        f = f.reshape(len(b), f.size // max(len(b), 1))  # rows are function evaluations
+        erg_f = [numpy.median(f, axis=1) if len(f) else numpy.empty((0), float),
+                 numpy.array([prctile(row, [0.25])[0] for row in f], dtype=float),
+                 numpy.array([prctile(row, [0.75])[0] for row in f], dtype=float)]
+        final_b.append(numpy.array(b, dtype=float))
         final_f.append(erg_f)
     return final_b, final_f
 
@@ -17,7 +17,7 @@ from six import advance_iterator
 # from pdb import set_trace
 
 # absolute_import => . refers to where ppfig resides in the package:
-from . import genericsettings, testbedsettings, toolsstats, htmldesc, toolsdivers
+from . import genericsettings, testbedsettings, toolsstats, htmldesc, toolsdivers, profiling
 
 
 # CLASS DEFINITIONS
@@ -39,6 +39,7 @@ HtmlPage = enum('NON_SPECIFIED', 'ONE', 'MANY', 'PPRLDMANY_BY_GROUP', 'PPRLDMANY
 _figsize_warnings = 1  # couldn't convince filterwarnings('once') to work as desired
 '''remaining number of warnings to be issued'''
 
+@profiling.profiled('save_figure')
 def save_figure(filename,
                 algorithm=None,
                 format=None,
@@ -111,6 +112,7 @@ def save_figure(filename,
                         bbox_inches=bbox_inches,
                         # pad_inches=0,  # default is 0.1?, 0 leads to cut label text
                         )
+            profiling.count('figures written (%s)' % format)
             if genericsettings.verbose:
                 print('Wrote figure in %s.' % (filename + '.' + format))
         except IOError:
@@ -166,6 +168,7 @@ def add_link(current_dir, folder, file_name, label,
 
 
 def save_index_html_file(filename):
+    toolsdivers.text_file_buffer.discard(filename + '.html')
     with open(filename + '.html', 'w') as f:
         text = ''
         f.write(html_header % tuple(2 * ['COCO Post-Processing Results'] + [text]))
@@ -239,16 +242,13 @@ def save_folder_index_file(filename, image_file_extension):
                 i = i + 1
 
     lines = []
-    with open(filename) as infile:
-        for line in infile:
-            lines.append(line)
-            if links_placeholder in line:
-                lines.append("%s\n</BODY>\n</HTML>" % links)
-                break
+    for line in toolsdivers.read_lines(filename):
+        lines.append(line)
+        if links_placeholder in line:
+            lines.append("%s\n</BODY>\n</HTML>" % links)
+            break
 
-    with open(filename, 'w') as outfile:
-        for line in lines:
-            outfile.write(line)
+    toolsdivers.write_lines(filename, lines)
 
     save_index_html_file(os.path.join(current_dir, '..', genericsettings.index_html_file_name))
 
@@ -326,6 +326,7 @@ def save_single_functions_html(filename,
 
     name = filename.split(os.sep)[-1]
     current_dir = os.path.dirname(os.path.realpath(filename))
+    toolsdivers.text_file_buffer.discard(filename + add_to_names + '.html')
     with open(filename + add_to_names + '.html', 'w') as f:
         header_title = algname + ', ' + name + add_to_names
         links = get_parent_link(htmlPage, parentFileName)
@@ -62,7 +62,7 @@ from six import advance_iterator
 
 from . import genericsettings, toolsstats, bestalg, pproc, ppfig, ppfigparam, htmldesc, toolsdivers
 from . import testbedsettings
-from . import captions
+from . import captions, watch
 
 xlim_max = None
 ynormalize_by_dimension = True  # not at all tested yet
@@ -518,7 +518,7 @@ def plot_previous_algorithms(func, target=None):  # lambda x: [1e-8]):
                    zorder= -2)
     return res
 
-def main(dsList, _valuesOfInterest, outputdir):
+def main(dsList, _valuesOfInterest, outputdir, problems=None):
     """From a DataSetList, returns a convergence and ERT/dim figure vs dim.
     
     If available, uses data of a reference algorithm as specified in 
@@ -530,6 +530,9 @@ def main(dsList, _valuesOfInterest, outputdir):
                                   There will be as many graphs as there are 
                                   elements in this input. 
     :param string outputdir: output directory
+    :param set problems: if given, only the figures of functions with a
+                         ``(funcId, dim)`` pair in `problems` are drawn,
+                         see `watch.affected`
     
     """
 
@@ -569,6 +572,8 @@ def main(dsList, _valuesOfInterest, outputdir):
     fontSize = ppfig.getFontSize(funInfos.values())
 
     for func in dictFunc:
+        if not watch.affected(dictFunc[func], problems):
+            continue
         plot(dictFunc[func], _valuesOfInterest, styles=styles)  # styles might have changed via config
         beautify(axesLabel=False)
         
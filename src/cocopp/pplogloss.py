@@ -119,17 +119,41 @@ medianscolor = 'r'
 capscolor = 'k'
 flierscolor = 'b'
 
-def detERT(entry, funvals):
-    # could be more efficient given that funvals is sorted...
-    res = []
-    for f in funvals:
-        idx = (entry.target <= f)
-        try:
-            res.append(entry.ert[idx][0])
-        except IndexError:
-            res.append(np.inf)
+def _padded(arrays, value):
+    """return the 1-D `arrays` as rows of a 2-D array padded with `value`"""
+    res = np.full((len(arrays), max(len(a) for a in arrays)), value, dtype=float)
+    for i, a in enumerate(arrays):
+        res[i, :len(a)] = a
     return res
 
+def _ert_at(targets, erts, funvals):
+    """return the ERT of the first target not larger than each f-value
+    or `np.inf`, vectorized over rows.
+
+    `targets` and `erts` are (functions x targets) arrays padded with
+    `np.nan` and `np.inf`, `funvals` is a (functions x budgets) array.
+    """
+    reached = targets[:, None, :] <= funvals[:, :, None]
+    idx = np.argmax(reached, axis=2)  # first reached target
+    erts = np.take_along_axis(erts, idx, axis=1)
+    return np.where(reached.any(axis=2), erts, np.inf)
+
+def _f_at(targets, erts, evals):
+    """return the smallest target f-value with an ERT not larger than each
+    of `evals` for each row of `targets` and `erts`, see `detf`"""
+    below = erts[:, None, :] <= np.asarray(evals, dtype=float)[None, :, None]
+    # the index of the smallest target among those below refers to the
+    # targets from the start, as in the previous loop implementation
+    idx = np.argmin(np.where(below, targets[:, None, :], np.inf), axis=2)
+    idx = np.take_along_axis(np.cumsum(below, axis=2), idx[..., None], axis=2)[..., 0] - 1
+    return np.maximum(np.take_along_axis(targets, idx, axis=1), f_thresh)
+
+def detERT(entry, funvals):
+    """return the ERT of `entry` for the first target not larger than each
+    of `funvals`, `np.inf` if there is none"""
+    return list(_ert_at(entry.target[None, :], entry.ert[None, :],
+                        np.asarray(funvals, dtype=float)[None, :])[0])
+
 def detf(entry, evals):
     """Determines a function value given a number of evaluations.
 
@@ -143,73 +167,89 @@ def detf(entry, evals):
     :Returns: list of the target function values
 
     """
-    res = []
-    for fevals in evals:
-        tmp = (entry.ert <= fevals)
-        #set_trace()
-        #if len(entry.target[tmp]) == 0:
-            #set_trace()
-        idx = np.argmin(entry.target[tmp])
-        res.append(max(entry.target[idx], f_thresh))
-        #res2.append(entry.ert[dix])
-        #TODO np.min(empty)
-    return res
+    return list(_f_at(entry.target[None, :], entry.ert[None, :], evals)[0])
 
 def generateData(dsList, evals, CrE_A):
-    res = {}
+    """return a `dict` with the array of ERT loss ratios at the budgets
+    `evals` for each function of `dsList` in a single dimension.
 
+    The loss ratios of all functions and budgets are computed at once
+    in (functions x budgets) arrays.
+    """
     D = set(i.dim for i in dsList).pop() # should have only one element
-    #if D == 3:
-       #set_trace()
 
     refalgentries = bestalg.load_reference_algorithm(testbedsettings.current_testbed.reference_algorithm_filename)
 
+    funcs = []
+    entries = []
+    refalgentries_ = []
     for fun, tmpdsList in dsList.dictByFunc().items():
         assert len(tmpdsList) == 1
-        entry = tmpdsList[0]
-
-        refalgentry = refalgentries[(D, fun)]
-
-        #ERT_A
-        f_A = detf(entry, evals)
-
-        ERT_ref = detERT(refalgentry, f_A)
-        ERT_A = detERT(entry, f_A)
-        nextreff = []
-        for i in f_A:
-            if i == 0.:
-                nextreff.append(0.)
-            else:
-                tmp = refalgentry.target[refalgentry.target < i]
-                try:
-                    nextreff.append(tmp[0])
-                except IndexError:
-                    nextreff.append(i * 10.**(-0.2)) # TODO: this is a hack
-
-        ERT_ref_nextreff = detERT(refalgentry, nextreff)
-
-        for i in range(len(ERT_A)):
-            # nextreff[i] >= f_thresh: this is tested because if it is not true
-            # ERT_ref_nextreff[i] is supposed to be infinite.
-            if nextreff[i] >= f_thresh and ERT_ref_nextreff[i] < evals[i]: # is different from the specification...
-                ERT_A[i] = evals[i]
-
-        # For test purpose:
-        #if fun % 10 == 0:
-        #    ERT_A[-2] = 1.
-        #    ERT_ref[-2] = np.inf
-        ERT_A = np.array(ERT_A)
-        ERT_ref = np.array(ERT_ref)
-        loss_A = np.exp(CrE_A) * ERT_A / ERT_ref
-        assert (np.isnan(loss_A) == False).all()
-        #set_trace()
-        #if np.isnan(loss_A).any() or np.isinf(loss_A).any() or (loss_A == 0.).any():
-        #    txt = 'Problem with entry %s' % str(entry)
-        #    warnings.warn(txt)
-        #    #set_trace()
-        res[fun] = loss_A
-
-    return res
+        funcs.append(fun)
+        entries.append(tmpdsList[0])
+        refalgentries_.append(refalgentries[(D, fun)])
+    if not funcs:
+        return {}
+    evals = np.asarray(evals, dtype=float)
+    targets, erts = (_padded([e.target for e in entries], np.nan),
+                     _padded([e.ert for e in entries], np.inf))
+    ref_targets, ref_erts = (_padded([e.target for e in refalgentries_], np.nan),
+                             _padded([e.ert for e in refalgentries_], np.inf))
+
+    #ERT_A
+    f_A = _f_at(targets, erts, evals)
+
+    ERT_ref = _ert_at(ref_targets, ref_erts, f_A)
+    ERT_A = _ert_at(targets, erts, f_A)
+    below = ref_targets[:, None, :] < f_A[:, :, None]
+    nextreff = np.take_along_axis(ref_targets, np.argmax(below, axis=2), axis=1)
+    nextreff = np.where(below.any(axis=2), nextreff, f_A * 10.**(-0.2)) # TODO: this is a hack
+    nextreff[f_A == 0.] = 0.
+
+    ERT_ref_nextreff = _ert_at(ref_targets, ref_erts, nextreff)
+
+    # nextreff >= f_thresh: this is tested because if it is not true
+    # ERT_ref_nextreff is supposed to be infinite.
+    replace = (nextreff >= f_thresh) & (ERT_ref_nextreff < evals) # is different from the specification...
+    ERT_A = np.where(replace, evals, ERT_A)
+
+    loss_A = np.exp(CrE_A) * ERT_A / ERT_ref
+    assert (np.isnan(loss_A) == False).all()
+    return dict(zip(funcs, loss_A))
+
+def _evals_of_interest(dsList):
+    """return the budgets of the loss ratios of the data sets `dsList` of
+    a single dimension, twice the dimension and ``10**i * dimension`` up to
+    the largest finite ERT"""
+    d = dsList[0].dim
+    maxevals = max(max(i.ert[np.isfinite(i.ert)]) for i in dsList)
+    EVALS = [2.*d]
+    EVALS.extend(10.**(np.arange(1, np.ceil(1e-9 + np.log10(maxevals * 1./d))))*d)
+    return EVALS
+
+def loss_ratios(dsList, CrE=0.):
+    """return ``(EVALS, data)`` with the budgets of interest and the
+    `dict` of ERT loss ratios per function for `dsList` of one dimension.
+
+    The result can be passed as `data` to `generateTable`,
+    `generateFigure` and `main` for any subset of the functions of
+    `dsList`, such that the loss ratios are computed only once. Return
+    `None` if there is no reference algorithm.
+    """
+    if not bestalg.load_reference_algorithm(testbedsettings.current_testbed.reference_algorithm_filename):
+        return None
+    EVALS = _evals_of_interest(dsList)
+    return EVALS, generateData(dsList, EVALS, CrE)
+
+def _data_for(dsList, EVALS, CrE, data):
+    """return the loss ratios of `dsList` at `EVALS` from `data`, the
+    result of `loss_ratios` for a superset of `dsList`, or computed anew"""
+    if data is not None:
+        all_evals, all_data = data
+        funcs = dsList.dictByFunc()
+        if list(EVALS) == list(all_evals[:len(EVALS)]) and all(f in all_data for f in funcs):
+            return dict((f, all_data[f][:len(EVALS)]) for f in funcs)
+    return generateData(dsList, EVALS, CrE)
 
 def boxplot(x, notch=0, sym='b+', positions=None, widths=None):
     """Makes a box and whisker plot.
@@ -475,13 +515,16 @@ def beautify():
     #a.yaxis.grid(True, which='minor')
     a.yaxis.grid(True, which='major')
 
-def generateTable(dsList, CrE=0., outputdir='.', info='default'):
+def generateTable(dsList, CrE=0., outputdir='.', info='default', data=None):
     """Generates ERT loss ratio tables.
 
     :param DataSetList dsList: input data set
     :param float CrE: crafting effort (see COCO documentation)
     :param string outputdir: output folder (must exist)
     :param string info: string suffix for output file names
+    :param tuple data: result of `loss_ratios` with the same `CrE` for a
+                       superset of `dsList` in a single dimension, or
+                       `None`
 
     """
 
@@ -492,26 +535,16 @@ def generateTable(dsList, CrE=0., outputdir='.', info='default'):
     #Set variables
     prcOfInterest = [0, 10, 25, 50, 75, 90]
     for d, dsdim in dsList.dictByDim().items():
-        maxevals = []
-        funcs = []
-        mFE = []
-
-        for i in dsdim:
-            maxevals.append(max(i.ert[np.isfinite(i.ert)]))  #  was: .isinf(i.ert) == False]))
-            funcs.append(i.funcId)
-            mFE.append(max(i.maxevals))
-
-        maxevals = max(maxevals)
-        mFE = max(mFE)
-        EVALS = [2.*d]
-        EVALS.extend(10.**(np.arange(1, np.log10(1e-9 + maxevals * 1./d))) * d)
+        funcs = [i.funcId for i in dsdim]
+        mFE = max(max(i.maxevals) for i in dsdim)
+        EVALS = _evals_of_interest(dsdim)
         #Set variables: Done
-        data = generateData(dsList, EVALS, CrE)
+        dimdata = _data_for(dsdim, EVALS, CrE, data)
 
         generateSingleTableTex(dsList, funcs, mFE, d, prcOfInterest, EVALS,
-                               data, outputdir, info)
+                               dimdata, outputdir, info)
         generateSingleTableHtml(dsList, funcs, mFE, d, prcOfInterest, EVALS,
-                                data, outputdir, info)
+                                dimdata, outputdir, info)
 
 
 def generateSingleTableTex(dsList, funcs, mFE, d, prcOfInterest, EVALS, data,
@@ -720,15 +753,12 @@ def generateSingleTableHtml(dsList, funcs, mFE, d, prcOfInterest, EVALS, data,
 
     filename = os.path.join(outputdir, 'pplogloss.html')
     lines = []
-    with open(filename) as infile:
-        for line in infile:
-            if '<!--tables-->' in line:
-                lines.append(res)
-            lines.append(line)
+    for line in toolsdivers.read_lines(filename):
+        if '<!--tables-->' in line:
+            lines.append(res)
+        lines.append(line)
 
-    with open(filename, 'w') as outfile:
-        for line in lines:
-            outfile.write(line)
+    toolsdivers.write_lines(filename, lines)
 
     toolsdivers.replace_in_file(os.path.join(outputdir, 'pplogloss.html'), '??COCOVERSION??',
                     '<br />Data produced with COCO %s' % (toolsdivers.get_version_label(None)))
@@ -737,7 +767,7 @@ def generateSingleTableHtml(dsList, funcs, mFE, d, prcOfInterest, EVALS, data,
         print("Wrote ERT loss ratio table in %s." % filename)
 
 def generateFigure(dsList, CrE=0., isStoringXRange=True, outputdir='.',
-                   info='default'):
+                   info='default', data=None):
     """Generates ERT loss ratio figures.
 
     :param DataSetList dsList: input data set
@@ -749,6 +779,7 @@ def generateFigure(dsList, CrE=0., isStoringXRange=True, outputdir='.',
                                  in the generated figures.
     :param string outputdir: output folder (must exist)
     :param string info: string suffix for output file names
+    :param tuple data: see `generateTable`
 
     """
 
@@ -763,17 +794,15 @@ def generateFigure(dsList, CrE=0., isStoringXRange=True, outputdir='.',
 
     # do not aggregate over dimensions
     for d, dsdim in sorted(dsList.dictByDim().items()):
-        maxevals = max(max(i.ert[np.isinf(i.ert) == False]) for i in dsdim)
-        EVALS = [2.*d]
-        EVALS.extend(10.**(np.arange(1, np.ceil(1e-9 + np.log10(maxevals * 1./d))))*d)
+        EVALS = _evals_of_interest(dsdim)
         if not evalf:
             evalf = (np.log10(EVALS[0]/d), np.log10(EVALS[-1]/d))
 
-        data = generateData(dsdim, EVALS, CrE)
+        dimdata = _data_for(dsdim, EVALS, CrE, data)
         ydata = []
         for i in range(len(EVALS)):
             #Aggregate over functions.
-            ydata.append(np.log10(list(data[f][i] for f in data)))
+            ydata.append(np.log10(list(dimdata[f][i] for f in dimdata)))
 
         xdata = np.log10(np.asarray(EVALS)/d)
         xticklabels = ['']
@@ -812,10 +841,11 @@ def generateFigure(dsList, CrE=0., isStoringXRange=True, outputdir='.',
         plt.close()
 
 
-def main(dsList, CrE=0., isStoringXRange=True, outputdir='.', info='default'):
+def main(dsList, CrE=0., isStoringXRange=True, outputdir='.', info='default',
+         data=None):
     """Generates ERT loss ratio boxplot figures.
 
     Calls method generateFigure.
 
     """
-    generateFigure(dsList, CrE, isStoringXRange, outputdir, info)
+    generateFigure(dsList, CrE, isStoringXRange, outputdir, info, data)
@@ -520,14 +520,11 @@ def plotFVDistr(dsList, budget, min_f=None, **plotArgs):
     x = []
     nn = 0
     for ds in dsList:
-        for i, fvals in enumerate(ds.funvals):
-            if fvals[0] > budget * ds.dim:
-                assert i > 0, 'first entry ' + str(fvals[0]) + \
-                        'was smaller than maximal budget ' + str(budget * ds.dim)
-                fvals = ds.funvals[i - 1]
-                break
-        # vals = fvals[1:].copy() / target[i.funcId]
-        vals = fvals[1:].copy()
+        assert ds.funvals[0, 0] <= budget * ds.dim, 'first entry ' + str(ds.funvals[0, 0]) + \
+                'was smaller than maximal budget ' + str(budget * ds.dim)
+        fvals = ds.funvals_at([budget * ds.dim])[0]
+        # vals = fvals.copy() / target[i.funcId]
+        vals = fvals.copy()
         # replace negative values to prevent problem with log of vals
         vals[vals <= 0] = min(np.append(vals[vals > 0], [min_f])) # works also when vals[vals > 0] is empty
         if genericsettings.runlength_based_targets:
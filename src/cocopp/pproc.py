@@ -22,23 +22,24 @@ from __future__ import absolute_import, print_function
 import sys
 import os
 import ast
+import atexit
 import re
 import pickle, gzip  # gzip is for future functionality: we probably never want to pickle without gzip anymore
 import warnings
 import json
 import hashlib
 import functools
+import numbers
+import weakref
 import collections
 from pdb import set_trace
 from six import string_types, advance_iterator
 import numpy, numpy as np
-import matplotlib.pyplot as plt
 from collections import OrderedDict
-from . import genericsettings, findfiles, toolsstats, toolsdivers
+from . import genericsettings, findfiles, toolsstats, toolsdivers, profiling
 from . import testbedsettings, dataformatsettings
 from .readalign import split, align_data, HMultiReader, VMultiReader, openfile
 from .readalign import HArrayMultiReader, VArrayMultiReader, alignArrayData
-from .ppfig import consecutiveNumbers, Usage
 from . import archiving
 
 do_assertion = genericsettings.force_assertions # expensive assertions
@@ -325,6 +326,17 @@ class RunlengthBasedTargetValues(TargetValues):
         self.reference_algorithm = ''
         self.initialized = False
 
+    @property
+    def reference_data(self):
+        return self._reference_data
+
+    @reference_data.setter
+    def reference_data(self, value):
+        """setting the reference data clears the memoized target values"""
+        self._reference_data = value
+        self._targets_tables = {}
+        self._reference_data_filename = None
+
     def initialize(self):
         """lazy initialization to prevent slow import"""
         if self.initialized:
@@ -335,17 +347,22 @@ class RunlengthBasedTargetValues(TargetValues):
 
             from . import bestalg
             self.reference_data = bestalg.load_reference_algorithm(self.reference_algorithm, force=True)
+            if self.reference_algorithm and not self.reference_algorithm.endswith('pickle.gz'):
+                self._reference_data_filename = os.path.join(
+                    toolsdivers.path_in_package(), self.reference_algorithm)
             # TODO: remove targets smaller than 1e-8
         elif isinstance(self.reference_data, string_types):  # self.reference_data in ('RANDOMSEARCH', 'IPOP-CMA-ES') should work
             self._short_info = 'reference budgets from ' + self.reference_data
             # dsl = DataSetList(os.path.join(sys.modules[globals()['__name__']].__file__.split('cocopp')[0],
             #                                'cocopp', 'data', self.reference_data))
-            dsl = DataSetList(archiving.official_archives.all.get(self.reference_data))
+            filename = archiving.official_archives.all.get(self.reference_data)
+            dsl = DataSetList(archiving.wait_for_download(filename))
             dsd = {}
             for ds in dsl:
                 # ds._clean_data()
                 dsd[(ds.funcId, ds.dim)] = ds
             self.reference_data = dsd
+            self._reference_data_filename = filename
         elif isinstance(self.reference_data, list):
             if not isinstance(self.reference_data[0], string_types):
                 raise ValueError("RunlengthBasedTargetValues() expected a string, dict, or list of strings as second argument,"
@@ -359,10 +376,81 @@ class RunlengthBasedTargetValues(TargetValues):
             # of reference data sets
             self.reference_algorithm = self.reference_data[list(self.reference_data.keys())[0]].algId
         self.initialized = True
+        if genericsettings.persist_runlength_based_targets:
+            self.load_targets()
         return self
 
     def __len__(self):
-        return len(self.run_lengths)  
+        return len(self.run_lengths)
+
+    def _targets_key(self):
+        """return the parameters which determine the computed targets"""
+        return (tuple(self.run_lengths), self.smallest_target,
+                self.times_dimension, self.step_to_next_difficult_target,
+                self.force_different_targets_factor)
+
+    def _targets_filename(self):
+        """return the file name of the persisted targets or `None`.
+
+        The file is in ``archiving.cocopp_home``, named by the reference
+        data file name and a hash of its path.
+        """
+        if not self._reference_data_filename:
+            return None
+        path = os.path.abspath(self._reference_data_filename)
+        return os.path.join(archiving.cocopp_home, 'runlength-targets', '%s-%s.pickle'
+                            % (os.path.basename(path), findfiles.hash(path, 12)))
+
+    def load_targets(self, filename=None):
+        """load persisted targets computed from the same reference data.
+
+        The file, by default in ``archiving.cocopp_home``, is only
+        used when it is more recent than the reference data file.
+        Return the number of loaded ``fun_dim`` entries for the current
+        run lengths.
+        """
+        if filename is None:
+            filename = self._targets_filename()
+        if not filename or not os.path.exists(filename):
+            return 0
+        if (self._reference_data_filename and
+                os.path.exists(self._reference_data_filename) and
+                os.path.getmtime(filename) <= os.path.getmtime(self._reference_data_filename)):
+            return 0
+        try:
+            with open(filename, 'rb') as f:
+                tables = pickle.load(f)
+        except Exception as e:
+            warnings.warn("failed to load targets file {} with exception {}"
+                          .format(filename, e))
+            return 0
+        for key, table in tables.items():
+            self._targets_tables.setdefault(key, {}).update(table)
+        return len(self._targets_tables.get(self._targets_key(), {}))
+
+    def save_targets(self, filename=None):
+        """save all computed targets to be used in later runs.
+
+        By default, the file is written into ``archiving.cocopp_home``,
+        see also `load_targets` and
+        `genericsettings.persist_runlength_based_targets`. Newly computed
+        targets are saved once by `save_unsaved_targets`, at the latest
+        at exit.
+        """
+        if filename is None:
+            filename = self._targets_filename()
+        _unsaved_targets.discard(self)
+        if not filename:
+            return
+        try:
+            if not os.path.exists(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+            with open(filename + '.tmp', 'wb') as f:
+                pickle.dump(self._targets_tables, f)
+            os.replace(filename + '.tmp', filename)  # never leave a partially written file
+        except Exception as e:
+            warnings.warn("could not write targets file {} getting exception {}"
+                          .format(filename, e))
 
     def __call__(self, fun_dim=None, discretize=None):
         """Get all target values for the respective function and dimension  
@@ -380,6 +468,9 @@ class RunlengthBasedTargetValues(TargetValues):
         Returned are the ERT for targets that, within the given budget, the
         reference algorithm just failed to achieve.
 
+        The targets are computed only once per `fun_dim` and memoized
+        until `reference_data` is set anew.
+
         """            
         self.initialize()
         if self.force_different_targets_factor**len(self.run_lengths) > 1e3:
@@ -387,7 +478,6 @@ class RunlengthBasedTargetValues(TargetValues):
         if fun_dim is None:
             raise ValueError('call to RunlengthbasedTargetValues class instance needs the parameter ``fun_dim``, none given')
         fun_dim = tuple(fun_dim)
-        dim_fun = tuple(reversed(fun_dim))
         if fun_dim[0] > 100 and self.run_lengths[-1] * fun_dim[1]**self.times_dimension < 1e3:
             ValueError("short running times don't work on noisy functions")
 
@@ -395,7 +485,26 @@ class RunlengthBasedTargetValues(TargetValues):
             raise ValueError('When running with the runlegth based target values ' \
                               'the reference data (e.g. a best algorithm) must exist.')
 
-        ds = self.reference_data[dim_fun]
+        table = self._targets_tables.setdefault(self._targets_key(), {})
+        if fun_dim not in table:
+            table[fun_dim] = self._compute_targets(fun_dim)
+            if genericsettings.persist_runlength_based_targets:
+                _unsaved_targets.add(self)
+        targets = np.array(table[fun_dim])  # a copy
+
+        if self.unique_target_values:
+            #len_ = len(targets)
+            targets = np.array(list(reversed(sorted(set(targets)))))
+            # print(' '.join((str(len(targets)), 'of', str(len_), 'targets kept')))
+        if discretize:
+            return self._discretize(targets)
+        return targets
+
+    get_targets = __call__  # an alias
+
+    def _compute_targets(self, fun_dim):
+        """compute the targets for `fun_dim`, see `__call__`"""
+        ds = self.reference_data[tuple(reversed(fun_dim))]
         if 11 < 3:   
             try:
                 ds._complement_data() # is not fully implemented and not here not necessary
@@ -461,22 +570,23 @@ class RunlengthBasedTargetValues(TargetValues):
         
         # here the actual computation starts
         old_targets = targets
-        targets = [] 
-        for rl in self.run_lengths:
-            # choose best target achieved by reference ERT times step_to_next_difficult_target
-            indices = np.nonzero(ds.ert[:end] <= np.max((1, rl * (fun_dim[1] if self.times_dimension else 1))))[0]
-            if not len(indices):
-                warnings.warn('  too easy run length ' + str(rl) +
-                              ' for (f,dim)=' + str(fun_dim))
-                targets.append(ds.target[0])
-            else:
-                targets.append((1 + 1e-9) * ds.target[indices[-1]]
-                               / self.step_to_next_difficult_target)
-            
-            if (len(targets) > 1 and targets[-1] >= targets[-2] and 
-                self.force_different_targets_factor > 1):
-                targets[-1] = targets[-2] / self.force_different_targets_factor
-        targets = np.asarray(targets)
+        # choose best target achieved by reference ERT times step_to_next_difficult_target
+        budgets = np.maximum(1, np.asarray(self.run_lengths, dtype=float) *
+                                (fun_dim[1] if self.times_dimension else 1))
+        # the smallest ERT of a target and all more difficult targets is
+        # nondecreasing, hence searchsorted finds the last ert <= budget
+        min_erts = np.fmin.accumulate(np.asarray(ds.ert[:end], dtype=float)[::-1])[::-1]
+        indices = np.searchsorted(min_erts, budgets, side='right') - 1
+        for rl in np.asarray(self.run_lengths)[indices < 0]:
+            warnings.warn('  too easy run length ' + str(rl) +
+                          ' for (f,dim)=' + str(fun_dim))
+        targets = np.where(indices < 0, ds.target[0],
+                           (1 + 1e-9) * ds.target[np.maximum(indices, 0)]
+                           / self.step_to_next_difficult_target)
+        if self.force_different_targets_factor > 1:
+            for i in range(1, len(targets)):
+                if targets[i] >= targets[i - 1]:
+                    targets[i] = targets[i - 1] / self.force_different_targets_factor
         targets[targets < self.smallest_target] = self.smallest_target
 
         # a few more sanity checks
@@ -496,17 +606,8 @@ class RunlengthBasedTargetValues(TargetValues):
             print(fun_dim)
             print(targets / old_targets - 1)
             print(targets)
+        return targets
 
-        if self.unique_target_values:
-            #len_ = len(targets)
-            targets = np.array(list(reversed(sorted(set(targets)))))
-            # print(' '.join((str(len(targets)), 'of', str(len_), 'targets kept')))
-        if discretize:
-            return self._discretize(targets)
-        return targets    
-
-    get_targets = __call__  # an alias
-    
     def label(self, i):
         """return i-th target value as string"""
         return toolsdivers.num2str(self.run_lengths[i], significant_digits=2)
@@ -536,6 +637,17 @@ class RunlengthBasedTargetValues(TargetValues):
         """
         raise NotImplementedError
               
+_unsaved_targets = weakref.WeakSet()
+"""`RunlengthBasedTargetValues` instances with targets computed since
+   they were last saved"""
+
+def save_unsaved_targets():
+    """save the targets of all `RunlengthBasedTargetValues` instances
+    which computed new targets, see `RunlengthBasedTargetValues.save_targets`"""
+    for targets in list(_unsaved_targets):
+        targets.save_targets()
+
+atexit.register(save_unsaved_targets)
 
 class DataSet(object):
     """Unit element for the COCO post-processing.
@@ -574,6 +686,9 @@ class DataSet(object):
                      the test function considered (list of int)
       - *isFinalized* -- list of bool for if runs were properly finalized
 
+    `readmaxevals`, `readfinalFminusFtarget` and `isFinalized` are arrays
+    after calling `compact`, see there.
+
     :py:attr:`evals` and :py:attr:`funvals` are arrays of data collected
     from :py:data:`N` data sets.
 
@@ -632,6 +747,7 @@ class DataSet(object):
         info_str
         instance_index_lists
         instance_multipliers
+        instance_weights
         instancenumbers
         instancenumbers_balanced
         isBiobjective
@@ -787,7 +903,8 @@ class DataSet(object):
                     suite = testbedsettings.default_suite_single
         return suite
 
-    def __init__(self, header, comment, data, indexfile):
+    @profiling.profiled('DataSet.__init__')
+    def __init__(self, header, comment, data, indexfile, instances=None):
         """Instantiate a DataSet.
 
         The first three input arguments correspond to three consecutive
@@ -798,8 +915,11 @@ class DataSet(object):
         :keyword string data: information on the runs of the experiment
         :keyword string indexfile: string for the file name from where
                                    the information come
+        :keyword instances: selection of instances whose runs are read,
+                            see `DataSetList.__init__`
 
     """
+        profiling.count('DataSets parsed')
         # Extract information from the header line.
         self._extra_attr = []
         self.__parseHeader(header)
@@ -841,73 +961,53 @@ class DataSet(object):
         if not testbedsettings.current_testbed:
             testbedsettings.load_current_testbed(self.suite_name, TargetValues)
 
+        # We might take only a subset of the given instances, given in
+        # testbedsettings.current_testbed.instancesOfInterest and by `instances`:
+        instances_of_interest = testbedsettings.current_testbed.instancesOfInterest
+        def is_skipped(instance):
+            if not instances_of_interest and instances is None:
+                return False
+            # If this is the best algorithm then the instance number is 0.
+            return instance > 0 and not (_selected(instance, instances_of_interest or None)
+                                         and _selected(instance, instances))
+
         # Split line in data file name(s) and run time information.
-        parts = data.split(', ')
+        filenames, runs = parseinfo_data(data)
+        for filename in filenames:
+            #Windows data to Linux processing
+            filename = filename.replace('\\', os.sep)
+            #Linux data to Windows processing
+            filename = filename.replace('/', os.sep)
+
+            folder = getattr(self, 'folder', '')
+            if folder:
+                filename = os.path.join(folder, filename)
+
+            self.dataFiles.append(filename)
         idx_of_instances_to_load = []
-        for elem in parts:
-            elem = elem.strip()
-            if elem.endswith('dat'):
-                #Windows data to Linux processing
-                filename = elem
-                # while elem.find('\\ ') >= 0:
-                #     filename = filename.replace('\\ ', '\\')
-                filename = filename.replace('\\', os.sep)
-                #Linux data to Windows processing
-                filename = filename.replace('/', os.sep)
-                
-                folder = getattr(self, 'folder', '')
-                if folder:
-                    filename = os.path.join(folder, filename)
-                    
-                self.dataFiles.append(filename)
-            elif '=' in elem: 
-                # It means header info in data line (biobjective). 
-                # We just skip the element.
+        for instance, readmaxevals, readfinalf in runs:
+            if is_skipped(instance):
+                idx_of_instances_to_load.append(False)
                 continue
+            self.instancenumbers.append(instance)
+            idx_of_instances_to_load.append(True)
+            if readmaxevals is None:
+                # the run was not finalized properly. In this case, what
+                # should we do? Either we try to process the corresponding
+                # data anyway or we leave it out. For now we leave it in.
+                self.isFinalized.append(False)
+                warnings.warn('Caught an ill-finalized run in %s for %s'
+                              % (indexfile,
+                                 os.path.join(filepath, self.dataFiles[-1])))
+                self.readmaxevals.append(0)
+                self.readfinalFminusFtarget.append(numpy.inf)
             else:
-                if ':' not in elem:
-                    
-                    # We might take only a subset of the given instances,
-                    # given in testbedsettings.current_testbed.instancesOfInterest:
-                    if testbedsettings.current_testbed.instancesOfInterest:
-                        instance = ast.literal_eval(elem)
-
-                        # If this is the best algorithm then the instance number is 0.
-                        if instance > 0 and instance not in testbedsettings.current_testbed.instancesOfInterest:
-                            idx_of_instances_to_load.append(False)
-                            continue
-
-                    # if elem does not have ':' it means the run was not
-                    # finalized properly.
-                    self.instancenumbers.append(ast.literal_eval(elem))
-                    # In this case, what should we do? Either we try to process
-                    # the corresponding data anyway or we leave it out.
-                    # For now we leave it in.
-                    idx_of_instances_to_load.append(True)
-                    self.isFinalized.append(False)
-                    warnings.warn('Caught an ill-finalized run in %s for %s'
-                                  % (indexfile,
-                                     os.path.join(filepath, self.dataFiles[-1])))
-                    self.readmaxevals.append(0)
-                    self.readfinalFminusFtarget.append(numpy.inf)
-                else:
-                    itrial, info = elem.split(':', 1)
-                    # We might take only a subset of the given instances,
-                    # given in testbedsettings.current_testbed.instancesOfInterest:
-                    if testbedsettings.current_testbed.instancesOfInterest:
-                        instance = ast.literal_eval(itrial)
-
-                        # If this is the best algorithm then the instance number is 0.
-                        if instance > 0 and instance not in testbedsettings.current_testbed.instancesOfInterest:
-                            idx_of_instances_to_load.append(False)
-                            continue
-
-                    self.instancenumbers.append(ast.literal_eval(itrial))
-                    idx_of_instances_to_load.append(True)
-                    self.isFinalized.append(True)
-                    readmaxevals, readfinalf = info.split('|', 1)
-                    self.readmaxevals.append(int(readmaxevals))
-                    self.readfinalFminusFtarget.append(float(readfinalf))
+                self.isFinalized.append(True)
+                self.readmaxevals.append(readmaxevals)
+                self.readfinalFminusFtarget.append(readfinalf)
+
+        if instances is not None and not self.instancenumbers:
+            return  # no data file is read, `DataSetList.processIndexFile` discards the data set
 
         if _using_recommendations and self.dataFiles:  # in DataSet.__init__
             self.dataFiles = [filename.replace('.dat', '.mdat')
@@ -986,7 +1086,7 @@ class DataSet(object):
             # values inconsistent with the previously set evals attribute
             # hence we read _lasttdatfilelines to be used in the maxfgevals property
             # which is constistent with the evals attribute also with constraints
-            self._lasttdatfilelines = [d[-1] for d in datasets]
+            self._lasttdatfilelines = [d[-1].copy() for d in datasets]  # a view would keep all data of d
     
             #extensions = {'.dat':(HMultiReader, 'evals'), '.tdat':(VMultiReader, 'funvals')}
             #for ext, info in extensions.items(): # ext is defined as global
@@ -1115,7 +1215,8 @@ class DataSet(object):
         if not is_consistent:
             warnings.warn('Some DataSet of {0} was not consistent'.format(self.algId))  # should rather be in the previous messages
         assert self._evals.shape[1] - 1 == len(self.instancenumbers), self
-        assert self.evals.shape[1] - 1 == len(self.maxevals), self
+        assert (self.nbRuns() if self._use_weights else self.evals.shape[1] - 1
+                ) == len(self.maxevals), self
         return is_consistent
             
     def computeERTfromEvals(self):
@@ -1124,19 +1225,35 @@ class DataSet(object):
             warnings.warn("computeERT is not executed when maxevals is a `dict`")
             return
         self._ert = []
-        self._ert_nb_of_data = len(self.evals[0]) - 1
         self._target = []  # computed here for historical reasons
-        for row in self.evals:
+        if self._use_weights:  # weighted raw data give the same as the balanced evals
+            evals, weights = self._evals, self.instance_weights
+            maxevals = self.maxevals[:len(weights)]
+            self._ert_nb_of_data = self.nbRuns()
+        else:
+            evals, weights, maxevals = self.evals, None, self.maxevals
+            self._ert_nb_of_data = len(evals[0]) - 1
+        for row in evals:
             data = row[1:]
-            if 1 < 3:
+            if weights is not None:
+                succ = numpy.isfinite(data)
+                if not any(succ):
+                    break
+                s = np.dot(weights[succ], data[succ])
+                if not all(succ):
+                    s += np.dot(weights[~succ], maxevals[~succ])
+                self._ert.append(s / sum(weights[succ]))
+            elif 1 < 3:
                 succ = numpy.isfinite(data)
                 if not any(succ):
                     break
                 s = sum(data[succ])
                 if not all(succ):
-                    s += sum(self.maxevals[np.logical_not(succ)])
+                    s += sum(maxevals[np.logical_not(succ)])
                 self._ert.append(s / sum(succ))
             if np.random.rand() < 0.01:  # old code for cross checking, to be removed TODO
+                if weights is not None:
+                    data = data[self._balanced_columns]
                 succ = (numpy.isnan(data)==False)
                 if any(numpy.isnan(data)):
                     data = data.copy()
@@ -1206,6 +1323,10 @@ class DataSet(object):
             samplesize = 0
             while samplesize < 15:
                 samplesize += self.nbRuns()
+        if instance is None and not bootstrap and self._use_weights:
+            evals_list, weights = self.detWeightedEvals(targets)
+            return self._evals_with_simulated_restarts(evals_list,
+                samplesize, randintfirst, randintrest, bootstrap, weights)
         if instance is None:
             evals_list = self.detEvals(targets, copy=True, bootstrap=bootstrap)
         else:
@@ -1215,13 +1336,21 @@ class DataSet(object):
             samplesize, randintfirst, randintrest, bootstrap)
 
     def _evals_with_simulated_restarts(self, evals_list, samplesize,
-                                       randintfirst, randintrest, bootstrap):
+                                       randintfirst, randintrest, bootstrap,
+                                       weights=None):
         """return simulated runtimes for each 1D-array in `evals_list`.
 
-        See `evals_with_simulated_restarts`
+        With column `weights`, the arrays are raw data rows from
+        `detWeightedEvals` and the runs are drawn as if each column was
+        repeated `weights` times. See `evals_with_simulated_restarts`
         """
+        profiling.count('bootstrap samples', samplesize * len(evals_list))
         res = []  # a list of samplesize runtime arrays (evals)
         for evals in evals_list:
+            if weights is not None:
+                res += [self._weighted_simulated_restarts(evals, weights, samplesize,
+                                                          randintfirst, randintrest)]
+                continue
             # prepare evals array
             evals.sort()  # nan are sorted to the end (since numpy 1.4.0 ~2013)
             indices = np.isfinite(evals)
@@ -1261,6 +1390,40 @@ class DataSet(object):
                 for evals in res]) == set([samplesize])
         return res
 
+    def _weighted_simulated_restarts(self, evals, weights, samplesize,
+                                     randintfirst, randintrest):
+        """return simulated runtimes from the raw data row `evals` with
+        column `weights`.
+
+        Position ``k`` indexes the sorted row with repeated columns, as used
+        in `_evals_with_simulated_restarts`, hence the same random
+        positions give the same runtimes.
+        """
+        order = np.argsort(evals)  # nan are sorted to the end
+        evals, weights = evals[order], weights[order]
+        succ = np.isfinite(evals)
+        ends = np.cumsum(weights[succ])  # of the positions of each successful run
+        nsucc = int(ends[-1]) if len(ends) else 0
+        if nsucc == 0:  # no successes
+            return samplesize * [np.nan]
+        maxevals = self.maxevals  # unsuccessful runs contribute by position like above
+
+        def runtimes(positions):
+            succ_index = np.searchsorted(ends, np.minimum(positions, nsucc - 1), 'right')
+            return np.where(positions < nsucc, evals[succ_index], maxevals[positions])
+        nruns = int(sum(weights))
+        indices = randintfirst(0, nruns, samplesize)
+        sums = runtimes(indices)
+        failing = np.nonzero(indices >= nsucc)[0]
+        while len(failing):  # add "restarts"
+            indices = randintrest(0, nruns, len(failing))
+            sums[failing] += runtimes(indices)
+            # retain failing indices
+            failing = [failing[i] for i in range(len(failing))
+                        if indices[i] >= nsucc]
+        sums.sort()
+        return sums
+
     def __eq__(self, other):
         """Compare indexEntry instances."""
         res = (self.__class__ is other.__class__ and
@@ -1386,7 +1549,7 @@ class DataSet(object):
         if not isinstance(self.maxevals, dict) and (  # bestalg DataSets have correctly computed _ert
             not hasattr(self, '_ert_nb_of_data') or   # evals may contain column copies for balancing
             set((self._ert_nb_of_data,
-                 len(self.evals[0]) - 1,
+                 self.nbRuns() if self._use_weights else len(self.evals[0]) - 1,
                  len(self.maxevals))).__len__() > 1):
             self.computeERTfromEvals()
         return self._ert
@@ -1452,6 +1615,8 @@ class DataSet(object):
     def nbRuns(self):
         """Returns the number of runs depending on `genericsettings.balance_instances`.
         """
+        if self._use_weights:  # the same without building the balanced evals
+            return int(sum(self.instance_multipliers))
         return numpy.shape(self.evals)[1] - 1 
 
     def bootstrap_sample_size(self, sample_size=genericsettings.simulated_runlength_bootstrap_sample_size):
@@ -1460,6 +1625,88 @@ class DataSet(object):
         assert i >= 0
         return (i or 1) * self.nbRuns()
 
+    _compact_list_attributes = {'readmaxevals': int,
+                                'readfinalFminusFtarget': float,
+                                'isFinalized': bool}
+    """list attributes converted to arrays of the given type in `compact`"""
+
+    def compact(self, float32=False):
+        """reduce the memory footprint of this data set and return `self`.
+
+        The lists in `_compact_list_attributes` become arrays, string
+        attributes are interned, data arrays which are views (from
+        truncation) are copied such that their base can be released and the
+        balanced and appended copies of `evals` are discarded (they are
+        recomputed when needed).
+
+        With `float32`, `funvals` and `finalfunvals` are stored in single
+        precision, which is only meant for display-only data like
+        background algorithms. `funvals` stays in double precision if its
+        evaluations are not exactly represented in single precision.
+        `evals` always stays in double precision, because its target
+        values must be compared exactly.
+
+        ``self.nbytes`` gives the resulting memory usage.
+
+        >>> import cocopp
+        >>> from cocopp.benchmark import datagen
+        >>> from cocopp.toolsdivers import InfolderGoneWithTheWind
+        >>> with InfolderGoneWithTheWind():
+        ...     folder = datagen.write_experiment('.', 'bbob', functions=[1], dimensions=[2])
+        ...     print('load data set'); dsl = cocopp.pproc.DataSetList(folder)  # doctest:+ELLIPSIS
+        load data set...
+        >>> ert, nbytes = dsl[0].ert, dsl.nbytes
+        >>> dsl.compact(float32=True).nbytes < nbytes
+        True
+        >>> all(dsl[0].ert == ert)
+        True
+
+        """
+        for name, type_ in self._compact_list_attributes.items():
+            if isinstance(getattr(self, name, None), list):
+                setattr(self, name, np.asarray(getattr(self, name), dtype=type_))
+        for name, value in self.__dict__.items():
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+        self.algs = [sys.intern(a) if type(a) is str else a for a in self.algs]
+        if isinstance(self._evals, np.ndarray) and self._evals.base is not None:
+            target_is_view = isinstance(getattr(self, '_target', None), np.ndarray) and (
+                self._target.base is not None and np.shares_memory(self._target, self._evals))
+            self._evals = self._evals.copy()
+            if target_is_view:
+                self._target = self._target.copy()
+        for name in ('_evals_balanced', '_evals_appended', '_maxevals_appended',
+                     '_instance_groups_cache', '_funvals_budgets'):
+            self.__dict__.pop(name, None)
+        if float32 and isinstance(getattr(self, 'funvals', None), np.ndarray):
+            if np.all(self.funvals[:, 0] < 2**24):  # evaluations are exact in float32
+                self.funvals = self.funvals.astype(np.float32)
+            self.finalfunvals = np.asarray(self.finalfunvals, dtype=np.float32)
+        return self
+
+    def summarize(self, float32=False):
+        """remove the data which are not needed to display runtimes,
+        compact the data set and return `self`.
+
+        `funvals`, the f-values aligned by evaluations, becomes `None`.
+        The runtimes in `evals` and the budgets in `maxevals` are kept
+        unchanged, such that runtime distributions and scaling graphs,
+        for example of background algorithms, are the same as with the
+        full data set. `float32` is passed to `compact`.
+        """
+        self.funvals = None
+        return self.compact(float32)
+
+    @property
+    def nbytes(self):
+        """approximate number of bytes used by the data of this data set.
+
+        Counted are the data of the arrays (their base when they are
+        views), lists, tuples, dictionaries and strings of the instance
+        attributes, each object only once.
+        """
+        return _nbytes(self.__dict__, set()) - sys.getsizeof(self.__dict__)
+
     def __parseHeader(self, header):
         """Extract data from a header line in an index entry."""
         
@@ -1538,11 +1785,7 @@ class DataSet(object):
         The key is the instance Id, the value is a list of index.
 
         """
-        dictinstance = {}
-        for i in range(len(self.instancenumbers)):
-            dictinstance.setdefault(self.instancenumbers[i], []).append(i)
-
-        return dictinstance
+        return dict(self.instance_index_lists())
 
     def createDictInstanceCount(self):
         """Returns a dictionary of the instances and their count.
@@ -1551,7 +1794,8 @@ class DataSet(object):
         repetitions of such instance.
         
         """
-        return dict((j, self.instancenumbers.count(j)) for j in set(self.instancenumbers))
+        instances, _, starts = self._instance_groups()
+        return dict(zip(instances, np.diff(np.append(starts, len(self.instancenumbers))).tolist()))
 
     def splitByTrials(self, whichdata=None):
         """Splits the post-processed data arrays by trials.
@@ -1590,6 +1834,42 @@ class DataSet(object):
 
         return (evals, funvals)
 
+    def funvals_at(self, budgets, side='right'):
+        """return a (budgets x trials) array of the f-values of all trials
+        after each of `budgets` evaluations.
+
+        The f-values are those of the last line of `funvals` with at most
+        (``side='right'``) or with less than (``side='left'``) the budget
+        number of evaluations and `np.inf` when there is no such line.
+        The lines are found with `np.searchsorted` in the cached first
+        column of `funvals`.
+
+        >>> import numpy as np
+        >>> import cocopp
+        >>> from cocopp.benchmark import datagen
+        >>> from cocopp.toolsdivers import InfolderGoneWithTheWind
+        >>> with InfolderGoneWithTheWind():
+        ...     folder = datagen.write_experiment('.', 'bbob', functions=[1], dimensions=[2],
+        ...                                       instances=[1, 2, 3])
+        ...     print('load data set'); ds = cocopp.pproc.DataSetList(folder)[0]  # doctest:+ELLIPSIS
+        load data set...
+        >>> f = ds.funvals_at([0, 10, np.inf])
+        >>> f.shape, all(f[0] == np.inf), all(f[-1] == ds.funvals[-1, 1:])
+        ((3, 3), True, True)
+        >>> all(f[1] == ds.funvals[ds.funvals[:, 0] <= 10][-1, 1:])
+        True
+
+        """
+        budget_index = self.__dict__.get('_funvals_budgets')
+        if (budget_index is None or len(budget_index) != len(self.funvals)
+                or not np.array_equal(budget_index[[0, -1]], self.funvals[[0, -1], 0])):
+            # only an array is cached, which shares and pickles like `funvals`
+            budget_index = self._funvals_budgets = np.ascontiguousarray(self.funvals[:, 0])
+        idx = np.searchsorted(budget_index, np.asarray(budgets), side=side) - 1
+        res = self.funvals[np.maximum(idx, 0), 1:]
+        res[idx < 0] = np.inf  # before the first line
+        return res
+
     def generateRLData(self, targets):
         """Determine the running lengths for reaching the target values.
 
@@ -1642,12 +1922,15 @@ class DataSet(object):
 
         Details: this should be the same as the precomputed `ert` property.
         """
-        assert not any(np.isnan(self.evals[:][0]))  # target value cannot be nan
+        assert not any(np.isnan(self._evals[0]))  # target value cannot be nan
 
         evalsums = []
-        for evalrow in self.detEvals(targets):
+        rows, weights = self.detWeightedEvals(targets)
+        maxevals = self.maxevals[:len(weights)]
+        for evalrow in rows:
             idxnan = np.isnan(evalrow)
-            evalsums.append(sum(evalrow[idxnan==False]) + sum(self.maxevals[idxnan]))
+            evalsums.append(np.dot(weights[~idxnan], evalrow[~idxnan]) +
+                            np.dot(weights[idxnan], maxevals[idxnan]))
         
         averages = np.asarray(evalsums) / self.nbRuns()
             
@@ -1674,6 +1957,9 @@ class DataSet(object):
         if raw_values is True:
             raw_values = len(self._evals[0]) - 1  # number of independent evals data
         succ = []
+        if self._use_weights and not raw_values:
+            rows, weights = self.detWeightedEvals(targets)
+            return [int(sum(weights[np.isfinite(evalrow)])) for evalrow in rows]
         for evalrow in self.detEvals(targets, copy=False):
             assert len(evalrow) == self.nbRuns()
             if raw_values:
@@ -1741,22 +2027,26 @@ class DataSet(object):
         ``np.array(self.nbRuns() * [np.nan])``.
 
         Makes by default a copy of the data, however this might change in
-        future.
+        future. With `genericsettings.balance_instances_with_weights`,
+        balanced rows are always new arrays built from the raw data, see
+        `detWeightedEvals`.
     """
-        evals = self.evals
+        columns = None
         if append_instances:  # TODO: add append_instances=True in toolstats line 709
             warnings.warn("append_instances was never thoroughly tested")
             evals = self.evals_appended
+        elif self._use_weights:  # balance only the rows needed
+            evals, columns = self._evals, self._balanced_columns
+        else:
+            evals = self.evals
         evalsrows = {}  # data rows, easiest target first
-        idata = evals.shape[0] - 1  # current data line index
-        for target in sorted(targets):  # smallest most difficult target first
-            if evals[-1, 0] > target:  # last entry is worse than target
+        for target, row in self._target_rows(evals, targets).items():
+            if row is None:
                 evalsrows[target] = np.array(self.nbRuns() * [np.nan])
-                continue
-            while idata > 0 and evals[idata - 1, 0] <= target:  # idata-1 line is good enough
-                idata -= 1  # move up
-            assert evals[idata, 0] <= target and (idata == 0 or evals[idata - 1, 0] > target)
-            evalsrows[target] = evals[idata, 1:].copy() if copy else evals[idata, 1:]
+            elif columns is not None:
+                evalsrows[target] = row[columns]
+            else:
+                evalsrows[target] = row.copy() if copy else row
         if do_assertion:
             assert all([all((np.isnan(evalsrows[target]) + (evalsrows[target] == self._detEvals2(targets)[i])))
                         for i, target in enumerate(targets)])
@@ -1766,6 +2056,59 @@ class DataSet(object):
                     for t in targets]
         return [evalsrows[t] for t in targets]  # order w.r.t. input targets
 
+    def detWeightedEvals(self, targets):
+        """return ``(rows, weights)``, the raw data rows ``self._evals[i, 1:]``
+        for `targets`, chosen like in `detEvals`, and the weight of each
+        column as `numpy` arrays.
+
+        Weighted statistics of `rows`, like the number of successes
+        ``sum(weights[np.isfinite(row)])``, are the same as those of the
+        balanced rows of `detEvals`, where the columns are repeated
+        according to `instance_multipliers`. Unless
+        `genericsettings.balance_instances_with_weights`, the rows are
+        those of `detEvals` with unit weights.
+
+        >>> import numpy as np
+        >>> import cocopp
+        >>> from cocopp.benchmark import datagen
+        >>> from cocopp.toolsdivers import InfolderGoneWithTheWind
+        >>> with InfolderGoneWithTheWind():
+        ...     folder = datagen.write_experiment('.', 'bbob', functions=[1], dimensions=[2],
+        ...                                       instances=[1, 1, 2, 3, 3, 3])
+        ...     print('load data set'); ds = cocopp.pproc.DataSetList(folder)[0]  # doctest:+ELLIPSIS
+        load data set...
+        >>> rows, weights = ds.detWeightedEvals([1e-8])
+        >>> [int(w) for w in weights], bool(len(ds.detEvals([1e-8])[0]) == sum(weights) == ds.nbRuns())
+        ([3, 3, 6, 2, 2, 2], True)
+        >>> int(sum(weights[np.isfinite(rows[0])])) == ds.detSuccesses([1e-8])[0]
+        True
+
+        """
+        if not self._use_weights:
+            rows = self.detEvals(targets)
+            return rows, np.ones(len(rows[0]) if len(rows) else self.nbRuns())
+        evals = self._evals
+        rows = self._target_rows(evals, targets)
+        return ([np.array((evals.shape[1] - 1) * [np.nan]) if rows[t] is None
+                 else rows[t].copy() for t in targets],
+                self.instance_weights)
+
+    @staticmethod
+    def _target_rows(evals, targets):
+        """return a `dict` with the data row ``evals[i, 1:]`` for each
+        target as in `detEvals` or `None` when the target was not reached"""
+        res = {}
+        idata = evals.shape[0] - 1  # current data line index
+        for target in sorted(targets):  # smallest most difficult target first
+            if evals[-1, 0] > target:  # last entry is worse than target
+                res[target] = None
+                continue
+            while idata > 0 and evals[idata - 1, 0] <= target:  # idata-1 line is good enough
+                idata -= 1  # move up
+            assert evals[idata, 0] <= target and (idata == 0 or evals[idata - 1, 0] > target)
+            res[target] = evals[idata, 1:]
+        return res
+
     def detEvals_by_instance(self, targets, raw_values=True, **kwargs):
         """return result of `detEvals` for each instance individually
 
@@ -1775,12 +2118,56 @@ class DataSet(object):
 
         See `detEvals` for further keyword arguments.
         """
-        evals_list = self.detEvals(targets, **kwargs)
+        evals = np.asarray(self.detEvals(targets, **kwargs)).reshape(len(targets), -1)
         res = collections.OrderedDict()
         for i, idx in self.instance_index_lists(raw_values).items():
-            res[i] = [evals[idx] for evals in evals_list]
+            res[i] = list(evals[:, idx])
         return res
 
+    def detSuccesses_by_instance(self, targets, raw_values=True):
+        """return `OrderedDict` with the number of successes to reach each
+        of `targets` for each instance.
+
+        ``raw_values=True`` means no instance balancing/repetitions.
+        """
+        evals = self.detEvals(targets)
+        successes = self._sum_by_instance(np.isfinite(evals), raw_values)
+        return collections.OrderedDict(zip(self._instance_groups(raw_values)[0],
+                                           successes.T.astype(int).tolist()))
+
+    def detERT_by_instance(self, targets, raw_values=True):
+        """return `OrderedDict` with the ERT to reach each of `targets` for
+        each instance, computed from the runs on the instance only.
+
+        The ERT is `np.inf` when the target was not reached on the
+        instance, like in `detERT`. ``raw_values=True`` means no instance
+        balancing/repetitions.
+
+        >>> import cocopp
+        >>> from cocopp.benchmark import datagen
+        >>> from cocopp.toolsdivers import InfolderGoneWithTheWind
+        >>> with InfolderGoneWithTheWind():
+        ...     folder = datagen.write_experiment('.', 'bbob', functions=[1], dimensions=[2],
+        ...                                       instances=[1, 2, 1, 2, 3])
+        ...     print('load data set'); ds = cocopp.pproc.DataSetList(folder)[0]  # doctest:+ELLIPSIS
+        load data set...
+        >>> ert = ds.detERT_by_instance([1e-8])
+        >>> list(ert), dict(ds.detSuccesses_by_instance([1e-8]))
+        ([1, 2, 3], {1: [0], 2: [2], 3: [1]})
+        >>> ert[1], bool(ert[2][0] == ds.maxevals[1])  # repeated runs are the same here
+        ([inf], True)
+
+        """
+        evals = np.asarray(self.detEvals(targets)).reshape(len(targets), -1)
+        successes = np.isfinite(evals)
+        maxevals = np.asarray(self.maxevals)[:evals.shape[1]]
+        sums = self._sum_by_instance(np.where(successes, evals, maxevals), raw_values)
+        successes = self._sum_by_instance(successes, raw_values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ert = np.where(successes > 0, sums / np.maximum(successes, 1), np.inf)
+        return collections.OrderedDict(zip(self._instance_groups(raw_values)[0],
+                                           ert.T.tolist()))
+
     def _number_of_better_runs(self, target, ref_eval):
         """return the number of ``self.evals(target)`` that are smaller
 
@@ -1895,6 +2282,30 @@ class DataSet(object):
         # self._evals_balanced_instance_numbers = tuple(self.instancenumbers)
         # print('done', self._evals.shape, self._evals_balanced.shape, self.instance_multipliers, self.instancenumbers)
 
+    @property
+    def _use_weights(self):
+        """return True if balancing is needed and done with `instance_weights`"""
+        return genericsettings.balance_instances_with_weights and self._need_balancing
+
+    @property
+    def instance_weights(self):
+        """weight of each column of the raw data ``_evals[:, 1:]``, that
+        is, the `instance_multipliers` as `numpy` array.
+
+        Weighting the raw data gives the same results as the columns
+        of `evals` replicated for balancing, see `detWeightedEvals`.
+        """
+        return np.asarray(self.instance_multipliers)
+
+    @property
+    def _balanced_columns(self):
+        """index of the raw data column of each column of the balanced
+        `evals` (without the first column), in the order of
+        `_balanced_evals_row`"""
+        multipliers = np.asarray(self.instance_multipliers)
+        columns = np.arange(len(multipliers))
+        return np.hstack([columns, np.repeat(columns, multipliers - 1)])
+
     @property
     def _need_balancing(self):
         """return True of gs.balance_instances and self.instance_multipliers are >1"""
@@ -2141,6 +2552,7 @@ class DataSet(object):
               using "isfinite" instead of "np.isfinite" and is not called
               from anywhere)
         """
+        import matplotlib.pyplot as plt
         kwargs.setdefault('clip_on', False)
         for funvals in self.funvals.T[1:]:  # loop over the rows of the transposed array
             idx = np.isfinite(funvals > 1e-19)
@@ -2158,6 +2570,7 @@ class DataSet(object):
         TODO: seems outdated on 19/8/2016
         ("np.isfinite" was "isfinite" hence raising an error)
         """
+        import matplotlib.pyplot as plt
         kwargs.setdefault('clip_on', False)
         for evals in self.evals.T[1:]:  # loop over the rows of the transposed array
             idx = np.logical_and(self.evals[:, 0] > 1e-19, np.isfinite(evals))
@@ -2217,13 +2630,48 @@ class DataSet(object):
         array, column 0 contains f-values and the instance indices start
         with 1.
         """
-        res = collections.OrderedDict()
-        for index, i in enumerate(self.instancenumbers if raw_values
-                                  else self.instancenumbers_balanced):
-            if i not in res:
-                res[i] = []
-            res[i] += [index]
-        return res
+        instances, order, starts = self._instance_groups(raw_values)
+        return collections.OrderedDict(zip(instances, (
+            indices.tolist() for indices in np.split(order, starts[1:]))))
+
+    def _instance_groups(self, raw_values=True):
+        """return ``(instances, order, starts)`` where `instances` are the
+        instance numbers in order of their first appearance and
+        ``order[starts[k]:starts[k+1]]`` are the (increasing) indices of
+        the runs on ``instances[k]``.
+
+        The grouping is computed with `np.unique` and cached as long as
+        `instancenumbers` does not change. See also `instance_index_lists`.
+        """
+        instancenumbers = tuple(self.instancenumbers)
+        cache = self.__dict__.setdefault('_instance_groups_cache', {})
+        if cache.get(raw_values, (None,))[0] != instancenumbers:
+            numbers = np.asarray(instancenumbers if raw_values
+                                 else self.instancenumbers_balanced)
+            values, first, inverse = np.unique(numbers, return_index=True,
+                                               return_inverse=True)
+            rank = np.argsort(first)  # groups by first appearance
+            relabel = np.empty_like(rank)
+            relabel[rank] = np.arange(len(rank))
+            inverse = relabel[inverse.reshape(-1)]
+            order = np.argsort(inverse, kind='stable')
+            starts = np.searchsorted(inverse[order], np.arange(len(rank)))
+            cache[raw_values] = (instancenumbers,
+                                 (values[rank].tolist(), order, starts))
+        return cache[raw_values][1]
+
+    def _sum_by_instance(self, values, raw_values=True):
+        """return the sums of `values` over the runs of each instance.
+
+        The last axis of `values` are the runs, as in the rows of
+        `detEvals`, which is replaced by the instances in the order of
+        `instance_index_lists`.
+        """
+        _, order, starts = self._instance_groups(raw_values)
+        values = np.asarray(values)
+        if not len(starts):
+            return np.zeros(values.shape[:-1] + (0,))
+        return np.add.reduceat(values[..., order], starts, axis=-1)
 
     @property
     def _budget_estimates(self):
@@ -2231,13 +2679,12 @@ class DataSet(object):
 
         This was implemented but never used.
         """
-        res = collections.OrderedDict()
-        for instance, indices in self.instance_index_lists(raw_values=True).items():
-            res[instance] = sum(self.maxevals[i] for i in indices)
-            # res[instance] = max((max(s), sum(u)))
-            # res[instance] = sum(u) + (np.median(s) if s else 0)
-            # res[instance] = sum(u) + (max(s) if s else 0)
-        return res
+        maxevals = np.asarray(self.maxevals)[:len(self.instancenumbers)]
+        # res[instance] = max((max(s), sum(u)))
+        # res[instance] = sum(u) + (np.median(s) if s else 0)
+        # res[instance] = sum(u) + (max(s) if s else 0)
+        return collections.OrderedDict(zip(self._instance_groups()[0],
+                                           self._sum_by_instance(maxevals).tolist()))
 
     @property
     def budget_effective_estimates(self):
@@ -2248,24 +2695,20 @@ class DataSet(object):
         within-instance ERT for the most difficult target
         ``self.precision`` when #successes > 0.
         """
-        res = collections.OrderedDict()
         successes = self.successes_by_instance()
-        for instance, indices in self.instance_index_lists(raw_values=True).items():
-            res[instance] = sum(self.maxevals[i] for i in indices
-                                ) / max((1, successes[instance]))
-        return res
+        return collections.OrderedDict(
+            (instance, budget / max((1, successes[instance])))
+            for instance, budget in self._budget_estimates.items())
 
     def successes_by_instance(self, target=None, raw_values=True):
         """return `OrderedDict` with number of successes for each instance"""
-        res = collections.OrderedDict()
         try:
             target = self.precision
         except AttributeError:  # biobj case
             target = 1e-8  # FIXME: is there a smarter way here?
-        evals = self.detEvals([target])[0]
-        for instance, indices in self.instance_index_lists(raw_values).items():
-            res[instance] = sum(np.isfinite(evals[i]) for i in indices)
-        return res
+        return collections.OrderedDict(
+            (instance, successes[0]) for instance, successes in
+            self.detSuccesses_by_instance([target], raw_values).items())
 
     @property
     def trial_count_by_instance(self):
@@ -2289,7 +2732,7 @@ class DataSet(object):
                                                ds.detEvals(targets))]
         return [t for (t, d) in zip(targets, differ) if d]
 
-    def plot(self, plot_function=plt.semilogy, smallest_target=8e-9,
+    def plot(self, plot_function=None, smallest_target=8e-9,
              median_formats=(('linestyle', '--'), ), color_map=None,
              plot_formats=(), **kwargs):
         """plot all data from `evals` attribute and the median.
@@ -2304,8 +2747,11 @@ class DataSet(object):
         ``plt.cm.brg(np.linspace(0, 0.5, self.nbRuns()))``.
 
         `**kwargs` is updated with `plot_formats` and passed to
-        `plot_function` (for convenience).
+        `plot_function` (for convenience), by default ``plt.semilogy``.
         """
+        import matplotlib.pyplot as plt
+        if plot_function is None:
+            plot_function = plt.semilogy
         if smallest_target > self.evals[0, 0]:
             raise ValueError("smallest_target=%f argument is larger than the largest recorded target %f"
                 % (smallest_target, self.evals[0, 0]))
@@ -2341,6 +2787,22 @@ class DataSet(object):
         plt.grid(True)
         return plt.gca()  # not sure which makes most sense
 
+def _nbytes(obj, seen):
+    """return the bytes used by `obj` and its content not yet in `seen`"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        if obj.base is not None:
+            return _nbytes(obj.base, seen)
+        return obj.nbytes
+    res = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple, set)):
+        res += sum(_nbytes(o, seen) for o in obj)
+    elif isinstance(obj, dict):
+        res += sum(_nbytes(k, seen) + _nbytes(v, seen) for k, v in obj.items())
+    return res
+
 def get_DataSetList(*args, **kwargs):
     """try to load pickle file or fall back to `DataSetList` constructor.
 
@@ -2350,12 +2812,16 @@ def get_DataSetList(*args, **kwargs):
 
     `args[0]` is expected to be either a `list` with one element which is a
     repository filetype name or the name itself. Otherwise, the fallback is
-    executed.
+    executed. The fallback is also executed, without writing a pickle
+    file, when `dims`, `funcs` or `instances` select only part of the
+    data, see `DataSetList.__init__`.
     """
     extension = '.pickle'
+    selection = dict((key, kwargs.pop(key, None)) for key in ('dims', 'funcs', 'instances'))
     def fallback():
-        return DataSetList(*args, **kwargs)
-    if len(args) != 1 or len(kwargs) or sys.version_info[0] < 3:
+        return DataSetList(*args, **dict(kwargs, **selection))
+    if (len(args) != 1 or len(kwargs) or sys.version_info[0] < 3 or
+            any(value is not None for value in selection.values())):
         return fallback()
     arg1 = args[0]
     if isinstance(arg1, string_types):
@@ -2399,6 +2865,163 @@ def get_DataSetList(*args, **kwargs):
                     .format(name, e))
     return dsl
 
+def _selected(value, selection):
+    """return whether `value` is selected by `selection`.
+
+    `selection` is `None` (selecting everything), a number, a callable
+    returning a `bool` or a container of values.
+
+    >>> from cocopp.pproc import _selected
+    >>> _selected(20, None), _selected(20, 20), _selected(3, [2, 5]), _selected(3, lambda d: d < 5)
+    (True, True, False, True)
+
+    """
+    if selection is None:
+        return True
+    if callable(selection):
+        return bool(selection(value))
+    if isinstance(selection, numbers.Number):
+        return value == selection
+    return value in selection
+
+def _entry_selected(header, data, dims=None, funcs=None):
+    """return `False` when the ``.info`` entry with `header` and `data` line
+    is not selected by `dims` or `funcs`, see `DataSetList.__init__`.
+
+    In bi-objective ``.info`` files, function and dimension are given in
+    the `data` line. The entry is selected when either is not found.
+    """
+    if dims is None and funcs is None:
+        return True
+    values = {}
+    for line in (header, data):
+        if '=' in line:
+            for attrname, attrvalue in parseinfo(line):
+                if attrname in ('funcId', 'function', 'DIM', 'dim'):
+                    values[DataSet._attributes[attrname][0]] = attrvalue
+    return ('dim' not in values or _selected(values['dim'], dims)) and (
+            'funcId' not in values or _selected(values['funcId'], funcs))
+
+def _alg_name_from_path(alg_name):
+    """return the algorithm name which overwrites the algId of the data
+    sets read from path `alg_name`, or `None` when `alg_name` is an
+    ``.info`` file"""
+    if alg_name.endswith('.info'):
+        alg_name = None
+    elif alg_name is not None:
+        # algId from data files is usually not set properly, so here we overwrite
+        # algId with the input alg_name which is usually the folder name (as for archives)
+        # Assuming all future archive entries are clean, we could check here
+        # whether alg_name is in the official archive and then not overwrite
+        # algId. To check whether alg_name is in the archive is not entirely
+        # trivial, e.g., ``archiving.official_archives.all.find(alg_name)``
+        # will give too many false positives.
+        # Also, making exception is usually a bad thing. So we should better
+        # rename the zip files to give the standards we want.
+
+        alg_name = toolsdivers.strip_pathname1(alg_name)
+        if archiving.official_archives.bbob.find(alg_name):
+            alg_name = alg_name.replace('noiseless', '').rstrip('_').rstrip()
+        if 11 < 3:  # would break searching of algId in archives
+            alg_name = toolsdivers.str_to_latex(alg_name)  # not really necessary but ' ' seems nicer than '_'
+    return alg_name
+
+def _index_entries(f, indexFile):
+    """generate ``(header, comment, data)`` lines of each entry in the
+    opened index (.info) file `f` named `indexFile`.
+
+    Faulty entries are skipped with a warning. In bi-objective index
+    files, the single header is used for all entries.
+    """
+    nbLine = 1
+    header = ''
+    while True:
+        try:
+            if 'indicator' not in header:
+                header = advance_iterator(f)
+                while not header.strip(): # remove blank lines
+                    header = advance_iterator(f)
+                    nbLine += 1
+                comment = advance_iterator(f)
+                if not comment.startswith('%'):
+                    warnings.warn('Entry in file %s at line %d is faulty: '
+                                % (indexFile, nbLine) +
+                                'it will be skipped.')
+                    nbLine += 2
+                    continue
+
+            data = advance_iterator(f)  # this is the filename of the data file!?
+            nbLine += 3
+        except StopIteration:
+            return
+        yield header, comment, data
+
+background_summary_version = 1
+"""version of the pickled summaries written by `get_DataSetList_summary`,
+   to be incremented when their content changes"""
+
+def _summary_key(name):
+    """return a hash of the data in file or folder `name` and of the
+    settings which change the data sets loaded from them"""
+    h = hashlib.sha256()
+    if os.path.isfile(name):
+        with open(name, 'rb') as f:
+            for block in iter(functools.partial(f.read, 2**20), b''):
+                h.update(block)
+    else:  # a folder is identified by the names, sizes and times of its files
+        for root, dirs, files in os.walk(name):
+            dirs.sort()
+            for filename in sorted(files):
+                stat = os.stat(os.path.join(root, filename))
+                h.update(('%s %d %d\n' % (os.path.relpath(os.path.join(root, filename), name),
+                                           stat.st_size, stat.st_mtime_ns)).encode())
+    testbed = testbedsettings.current_testbed
+    h.update(repr((background_summary_version,
+                   type(testbed).__name__ if testbed else None,
+                   sorted(getattr(testbed, 'instancesOfInterest', None) or []),
+                   genericsettings.background_float32)).encode())
+    return h.hexdigest()
+
+def get_DataSetList_summary(name):
+    """return the summarized `DataSetList` of file or folder `name`.
+
+    The data sets are loaded with `get_DataSetList` and reduced with
+    `DataSet.summarize`. The summaries are cached in a pickle file in
+    ``archiving.cocopp_home`` named by the hash of the data, hence the
+    data of `name` are parsed only once, whatever its location. Like
+    `get_DataSetList`, `testbedsettings.load_current_testbed` is called
+    when no testbed is set.
+    """
+    folder = os.path.join(archiving.cocopp_home, 'background-summaries')
+    filename = os.path.join(folder, _summary_key(name) + '.pickle')
+    if os.path.exists(filename):
+        try:
+            with open(filename, 'rb') as f:
+                dsl = pickle.load(f)
+        except Exception as e:
+            warnings.warn("failed to load summary file {} with exception {}"
+                          .format(filename, e))
+        else:
+            if isinstance(dsl, DataSetList) and len(dsl):
+                if not testbedsettings.current_testbed:
+                    testbedsettings.load_current_testbed(dsl[0].suite_name, TargetValues)
+                if genericsettings.verbose > 0:
+                    print("  using summary {0} of {1}".format(filename, name), end=' ')
+                return dsl
+    dsl = get_DataSetList(name)
+    for ds in dsl:
+        ds.summarize(genericsettings.background_float32)
+    try:
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(filename + '.tmp', 'wb') as f:
+            pickle.dump(dsl, f)
+        os.replace(filename + '.tmp', filename)  # never leave a partially written file
+    except Exception as e:
+        warnings.warn("could not write summary file {} getting exception {}"
+                      .format(filename, e))
+    return dsl
+
 class DataSetList(list):
     """List of instances of :py:class:`DataSet`.
 
@@ -2411,13 +3034,22 @@ class DataSetList(list):
     #Do not inherit from set because DataSet instances are mutable which means
     #they might change over time.
 
-    def __init__(self, args=[], check_data_type=True):
+    def __init__(self, args=[], check_data_type=True, dims=None, funcs=None, instances=None):
         """Instantiate self from a list of folder- or filenames or 
         ``DataSet`` instances.
 
         :keyword list args: strings being either info file names, folder
                             containing info files or pickled data files,
                             or a list of DataSets.
+        :keyword dims: select the dimensions to load from info files
+        :keyword funcs: select the function IDs to load from info files
+        :keyword instances: select the instances to load from info files
+
+        A selection is `None` (everything), a number, a container or a
+        callable, e.g. ``dims=20, funcs=range(1, 6)``. It is applied
+        while reading the info files, hence data files of entries or
+        runs which are not selected are never read. Data sets from
+        pickle files are only selected by dimension and function.
 
         Exceptions:
         Warning -- Unexpected user input.
@@ -2460,7 +3092,7 @@ class DataSetList(list):
                 self.append(name)
                 # we could check here whether name.algId and alg_name are similar or consistent
             elif name.endswith('.info'):
-                self.processIndexFile(name, alg_name)
+                self.processIndexFile(name, alg_name, dims, funcs, instances)
             elif name.endswith('.pickle') or name.endswith('.pickle.gz'):
                 if _using_recommendations:
                     warnings.warn(
@@ -2487,7 +3119,8 @@ class DataSetList(list):
                     except Exception:
                         pass
                     # if not hasattr(entry, 'detAverageEvals')
-                    self.append(entry)
+                    if _selected(entry.dim, dims) and _selected(entry.funcId, funcs):
+                        self.append(entry)
                     #set_trace()
                 except IOError as e:
                     print("I/O error(%s): %s" % (e.errno, e.strerror))
@@ -2506,64 +3139,49 @@ class DataSetList(list):
         if len(self) and data_consistent:
             if genericsettings.warning_level >= 1:
                 print("  Data consistent according to consistency_check() in pproc.DataSet")
-            
-    def processIndexFile(self, indexFile, alg_name=None):
-        """Reads in an index (.info?) file information on the different runs."""
-
-        if alg_name.endswith('.info'):
-            alg_name = None
-        elif alg_name is not None:
-            # algId from data files is usually not set properly, so here we overwrite
-            # algId with the input alg_name which is usually the folder name (as for archives)
-            # Assuming all future archive entries are clean, we could check here
-            # whether alg_name is in the official archive and then not overwrite
-            # algId. To check whether alg_name is in the archive is not entirely
-            # trivial, e.g., ``archiving.official_archives.all.find(alg_name)``
-            # will give too many false positives.
-            # Also, making exception is usually a bad thing. So we should better
-            # rename the zip files to give the standards we want.
-
-            alg_name = toolsdivers.strip_pathname1(alg_name)
-            if archiving.official_archives.bbob.find(alg_name):
-                alg_name = alg_name.replace('noiseless', '').rstrip('_').rstrip()
-            if 11 < 3:  # would break searching of algId in archives
-                alg_name = toolsdivers.str_to_latex(alg_name)  # not really necessary but ' ' seems nicer than '_'
+
+    def compact(self, float32=False):
+        """call `DataSet.compact` on all elements and return `self`"""
+        for ds in self:
+            ds.compact(float32)
+        return self
+
+    @property
+    def nbytes(self):
+        """approximate number of bytes used by the data of all data sets,
+        see `DataSet.nbytes`. Objects shared between data sets are
+        counted only once.
+        """
+        seen = set()
+        return sum(_nbytes(ds.__dict__, seen) - sys.getsizeof(ds.__dict__)
+                   for ds in self)
+
+    def processIndexFile(self, indexFile, alg_name=None, dims=None, funcs=None, instances=None):
+        """Reads in an index (.info?) file information on the different runs.
+
+        Entries and runs not selected by `dims`, `funcs` and `instances`
+        are skipped without reading their data files.
+        """
+
+        alg_name = _alg_name_from_path(alg_name)
         try:
             with openfile(indexFile, errors='replace') as f:  # strange chars in names may cause errors
                 if genericsettings.verbose:
                     print('Processing %s.' % indexFile)
 
                 # Read all data sets within one index file.
-                nbLine = 1
                 data_file_names = []
-                header = ''
-                while True:
-                    try:
-                        if 'indicator' not in header:
-                            header = advance_iterator(f)
-                            while not header.strip(): # remove blank lines
-                                header = advance_iterator(f)
-                                nbLine += 1
-                            comment = advance_iterator(f)
-                            if not comment.startswith('%'):
-                                warnings.warn('Entry in file %s at line %d is faulty: '
-                                            % (indexFile, nbLine) +
-                                            'it will be skipped.')
-                                nbLine += 2
-                                continue
-
-                        data = advance_iterator(f)  # this is the filename of the data file!?
-                        data_file_names.append(data)
-                        nbLine += 3
-                        #TODO: check that something is not wrong with the 3 lines.
-                        ds = DataSet(header, comment, data, indexFile)
-                        # data extension may have been modified to .mdat
-                        if alg_name is not None:
-                            ds.algId = alg_name
-                        if len(ds.instancenumbers) > 0:                    
-                            self.append(ds)
-                    except StopIteration:
-                        break
+                for header, comment, data in _index_entries(f, indexFile):
+                    data_file_names.append(data)
+                    #TODO: check that something is not wrong with the 3 lines.
+                    if not _entry_selected(header, data, dims, funcs):
+                        continue
+                    ds = DataSet(header, comment, data, indexFile, instances)
+                    # data extension may have been modified to .mdat
+                    if alg_name is not None:
+                        ds.algId = alg_name
+                    if len(ds.instancenumbers) > 0:                    
+                        self.append(ds)
             if len(data_file_names) != len(set(data_file_names)):
                 warnings.warn("WARNING: a data file has been referenced" +
                     " several times in file %s:" % indexFile)
@@ -2612,7 +3230,10 @@ class DataSetList(list):
                 if 1 < 3:
                     i.dataFiles.extend(o.dataFiles)
                     i.indexFiles.extend(o.indexFiles)
-                    i.funvals = alignArrayData(VArrayMultiReader([i.funvals, o.funvals]))
+                    if i.funvals is None or o.funvals is None:  # summarized data set
+                        i.funvals = None
+                    else:
+                        i.funvals = alignArrayData(VArrayMultiReader([i.funvals, o.funvals]))
                     i.finalfunvals = numpy.r_[i.finalfunvals, o.finalfunvals]
                     i._evals = alignArrayData(HArrayMultiReader([i._evals, o._evals]))
                     i._maxevals = numpy.r_[i._maxevals, o._maxevals]
@@ -2624,6 +3245,8 @@ class DataSetList(list):
                     for name in i.__dict__:  # was: dir(i) which catches all properties
                         if isinstance(getattr(i, name), list):
                             getattr(i, name).extend(getattr(o, name))
+                        elif name in i._compact_list_attributes:  # `i` was compacted
+                            setattr(i, name, numpy.r_[getattr(i, name), getattr(o, name)])
 
                 else:
                     if getattr(i, 'pickleFile', False):
@@ -3001,6 +3624,7 @@ class DataSetList(list):
             functions = sorted(dictFun.keys())
             nbfuns = len(set(functions))
             splural = 's' if nbfuns > 1 else ''
+            from .ppfig import consecutiveNumbers
             print('%d Function%s with ID%s %s' % (nbfuns, splural, splural, consecutiveNumbers(functions)))
 
             dictDim = self.dictByDim()
@@ -3474,6 +4098,29 @@ def parseinfoold(s):
 
     return res
 
+_info_pair_pattern = re.compile(r'\ *([^,=]+?)\ *=\ *(".*?"|\'.*?\'|[^,]+)\ *(?=,|$)')
+"""key = value pairs of an index entry header, see `parseinfo`"""
+_unescaped_quote_pattern = re.compile(r'(?<!\\)(\')')
+
+def _info_value(s):
+    """return the value of string `s` from an index file as `int`,
+    `float`, `str` or otherwise as evaluated literal"""
+    quote = s[:1]
+    if quote in ('"', "'"):
+        if len(s) > 1 and s[-1] == quote and '\\' not in s and quote not in s[1:-1]:
+            return s[1:-1]  # no escapes to evaluate
+    else:
+        try:
+            return int(s)
+        except ValueError:
+            try:
+                return float(s)
+            except ValueError:
+                pass
+    if s.startswith('\'') and s.endswith('\''): # HACK
+        s = '\'' + _unescaped_quote_pattern.sub(r'\\\1', s[1:-1]) + '\''
+    return ast.literal_eval(s.strip())
+
 def parseinfo(s):
     """Extract data from a header line in an index entry.
 
@@ -3481,23 +4128,63 @@ def parseinfo(s):
     The header line should be a string of comma-separated pairs of
     key=value, for instance: key = value, key = 'value'
 
-    Keys should not use comma or quote characters.
+    Keys should not use comma or quote characters. Numbers are converted
+    directly, only quoted strings (and other literals) go through
+    `ast.literal_eval`.
+
+    >>> from cocopp.pproc import parseinfo
+    >>> parseinfo("funcId = 1, DIM = 20, Precision = 1.000e-08, algId = 'A, B'")
+    [('funcId', 1), ('DIM', 20), ('Precision', 1e-08), ('algId', 'A, B')]
 
     """
-    p = re.compile(r'\ *([^,=]+?)\ *=\ *(".*?"|\'.*?\'|[^,]+)\ *(?=,|$)')
-    res = []
-    for elem0, elem1 in p.findall(s):
-        if elem1.startswith('\'') and elem1.endswith('\''): # HACK
-            elem1 = ('\'' + re.sub(r'(?<!\\)(\')', r'\\\1', elem1[1:-1]) + '\'')
-        try:
-            elem1 = ast.literal_eval(elem1)
-        except:
-            if sys.version.startswith("2.6"):  # doesn't like trailing '\n'
-                elem1 = ast.literal_eval(elem1.strip())  # can be default anyway?
-            else:
-                raise
-        res.append((elem0, elem1))  # DataSet attribute name and value
-    return res
+    return [(key, _info_value(value))  # DataSet attribute name and value
+            for key, value in _info_pair_pattern.findall(s)]
+
+def replaceinfo(s, values):
+    """return header line `s` of an index entry where the values of the
+    keys in `values` are replaced and everything else is kept as is.
+
+    >>> from cocopp.pproc import replaceinfo
+    >>> replaceinfo("funcId = 1, algId = 'A, B', DIM = 2\\n", {'algId': 'C'})
+    "funcId = 1, algId = 'C', DIM = 2\\n"
+
+    """
+    line = s.rstrip('\r\n')
+    def replace(match):
+        if match.group(1) not in values:
+            return match.group(0)
+        start, end = (i - match.start() for i in match.span(2))
+        return match.group(0)[:start] + repr(values[match.group(1)]) + match.group(0)[end:]
+    return _info_pair_pattern.sub(replace, line) + s[len(line):]
+
+def parseinfo_data(s):
+    """Extract data file names and runs from the data line of an index entry.
+
+    Return ``(filenames, runs)``, where `runs` is a list of ``(instance,
+    maxevals, final f-value)`` tuples, the latter two are `None` for
+    runs which were not finalized, that is, without ``:`` in the entry.
+    ``key=value`` elements, like the function and dimension of
+    bi-objective index files, are skipped.
+
+    >>> from cocopp.pproc import parseinfo_data
+    >>> parseinfo_data('data_f1/bbobexp_f1_DIM2.dat, 1:1000|2.1e-09, 2:2000|3.4e+01, 3')
+    (['data_f1/bbobexp_f1_DIM2.dat'], [(1, 1000, 2.1e-09), (2, 2000, 34.0), (3, None, None)])
+
+    """
+    filenames, runs = [], []
+    for elem in s.split(', '):
+        elem = elem.strip()
+        if elem.endswith('dat'):
+            filenames.append(elem)
+        elif '=' in elem:  # header info in the data line (biobjective)
+            continue
+        elif ':' not in elem:  # the run was not finalized properly
+            runs.append((_info_value(elem), None, None))
+        else:
+            instance, info = elem.split(':', 1)
+            maxevals, final_f = info.split('|', 1)
+            runs.append((_info_value(instance), int(maxevals), float(final_f)))
+    return filenames, runs
 
 
 def align_list(list_to_process, evals):
@@ -3530,7 +4217,9 @@ def set_unique_algId(ds_list, ds_list_reference, taken_ids=None):
             ds.algId = algId + ' ' + str(i)
 
 
-def processInputArgs(args, process_background_algorithms=False):
+@profiling.profiled('processInputArgs')
+def processInputArgs(args, process_background_algorithms=False,
+                     dims=None, funcs=None, instances=None, data=None):
     """Process command line arguments.
 
     Returns several instances of :py:class:`DataSetList`, and a list of 
@@ -3544,6 +4233,10 @@ def processInputArgs(args, process_background_algorithms=False):
 
     :keyword list args: string arguments for folder names
     :keyword bool process_background_algorithms: option to process also background algorithms
+    :keyword dims, funcs, instances: load only the selected data, see
+                                     `DataSetList.__init__`
+    :keyword dict data: already loaded `DataSetList` by argument, which
+                        are used instead of loading the argument
 
     :returns (all_datasets, pathnames, datasetlists_by_alg):
       all_datasets
@@ -3562,7 +4255,8 @@ def processInputArgs(args, process_background_algorithms=False):
     sortedAlgs = list()
     dictAlg = {}
     current_hash = None
-    process_arguments(args, current_hash, dictAlg, dsList, sortedAlgs)
+    selection = dict(dims=dims, funcs=funcs, instances=instances)
+    process_arguments(args, current_hash, dictAlg, dsList, sortedAlgs, data=data, **selection)
     global _block_using_recommendations
     _set_using_recommendations(False)
     _block_using_recommendations = True
@@ -3574,20 +4268,34 @@ def processInputArgs(args, process_background_algorithms=False):
             for i in range(len(algs) - 1, -1, -1):
                 if algs[i] in genericsettings.foreground_algorithm_list:
                     algs.pop(i)
+        nb_foreground = len(dsList)
         for value in genericsettings.background.values():
             assert isinstance(value, (list, tuple, set))
-            process_arguments(value, current_hash, dictAlg, dsList, sortedAlgs)
+            process_arguments(value, current_hash, dictAlg, dsList, sortedAlgs,
+                              summary=genericsettings.background_summaries, **selection)
+        if genericsettings.compact_background and not genericsettings.background_summaries:
+            for ds in dsList[nb_foreground:]:
+                ds.compact(genericsettings.background_float32)
 
     store_reference_values(DataSetList(dsList))
 
     return dsList, sortedAlgs, dictAlg
 
 
-def process_arguments(args, current_hash, dictAlg, dsList, sortedAlgs):
+def process_arguments(args, current_hash, dictAlg, dsList, sortedAlgs, summary=False,
+                      dims=None, funcs=None, instances=None, data=None):
+    """load the data of each algorithm in `args` and append it to `dsList`,
+    `sortedAlgs` and `dictAlg`, with `summary` only summarized data sets,
+    see `get_DataSetList_summary`, and with `dims`, `funcs` and `instances`
+    only the selected data, see `DataSetList.__init__`. Arguments in the
+    `dict` `data` are not loaded, their value is used instead."""
+    selection = dict(dims=dims, funcs=funcs, instances=instances)
+    selected = any(value is not None for value in selection.values())
     for ialg, alg in enumerate(args):
         alg = alg.strip().rstrip(os.path.sep)  # lstrip would not be the same folder anymore
         if alg == '':  # might cure an lf+cr problem when using cywin under Windows
             continue
+        alg = archiving.wait_for_download(alg)
         if findfiles.is_recognized_repository_filetype(alg):
             # if 11 < 3:
             #     filelist = findfiles.main(alg)  # this destroys name information
@@ -3596,7 +4304,15 @@ def process_arguments(args, current_hash, dictAlg, dsList, sortedAlgs):
             #     # filelist = list(i for i in filelist if i.count('ppdata_f005'))
             # else:
             _old = _set_using_recommendations(ialg)
-            tmpDsList = get_DataSetList(alg)
+            if data and args[ialg] in data:
+                tmpDsList = data[args[ialg]]
+            elif summary and not selected:  # summaries are cached for the entire data only
+                tmpDsList = get_DataSetList_summary(alg)
+            else:
+                tmpDsList = get_DataSetList(alg, **selection)
+                if summary:
+                    for ds in tmpDsList:
+                        ds.summarize(genericsettings.background_float32)
             _set_using_recommendations(_old)
             for ds in tmpDsList:
                 ds._data_folder = alg
@@ -29,7 +29,7 @@ from . import genericsettings, bestalg, toolsstats, pproc
 from . import testbedsettings
 from .pptex import tableLaTeX, writeFEvals2, writeFEvalsMaxPrec
 from .toolsstats import significancetest
-from .toolsdivers import prepend_to_file
+from .toolsdivers import prepend_to_file, read_lines, write_lines
 from . import captions
 
 # def tablespec(targets):
@@ -111,10 +111,11 @@ def get_table_caption():
     return captions.replace(table_caption)
 
 
-def main(dsList, dims_of_interest, outputdir, latex_commands_file):
+def main(dsList, dims_of_interest, outputdir, latex_commands_file, tex_dims=None):
     """Generate a table of ratio ERT/ERTref vs target precision.
 
-    1 table per dimension will be generated.
+    1 table per dimension will be generated. The ``.tex`` files are only
+    written for the dimensions in `tex_dims`, by default for all.
 
     Rank-sum tests table on "Final Data Points" for only one algorithm.
     that is, for example, using 1/#fevals(ftarget) if ftarget was
@@ -431,9 +432,10 @@ def main(dsList, dims_of_interest, outputdir, latex_commands_file):
                 spec = r'@{}c@{}|' + '*{%d}{@{}r@{}@{}l@{}}' % len(targetsOfInterest) + '|@{}r@{}@{}l@{}'
             # res = r'\providecommand{\algshort}{%s}' % alg1 + '\n'
             res = tableLaTeX(table, spec=spec, extra_eol=extraeol, add_begin_tabular=False, add_end_tabular=False)
-            f = open(output_file, 'w')
-            f.write(res)
-            f.close()
+            if tex_dims is None or d in tex_dims:
+                f = open(output_file, 'w')
+                f.write(res)
+                f.close()
 
         res = ("").join(str(item) for item in tableHtml)
         res = '<table>\n%s</table>\n' % res
@@ -441,15 +443,12 @@ def main(dsList, dims_of_interest, outputdir, latex_commands_file):
         filename = os.path.join(outputdir, 'pptable.html')
         lines = []
         html_string = '<!--pptableHtml_%d-->' % d
-        with open(filename) as infile:
-            for line in infile:
-                if html_string in line:
-                    lines.append(res)
-                lines.append(line)
-
-        with open(filename, 'w') as outfile:
-            for line in lines:
-                outfile.write(line)
+        for line in read_lines(filename):
+            if html_string in line:
+                lines.append(res)
+            lines.append(line)
+
+        write_lines(filename, lines)
 
         if genericsettings.verbose:
             print("Table written in %s" % output_file)
@@ -0,0 +1,255 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Lightweight instrumentation of the post-processing.
+
+Timing spans and counters are recorded by the module instance `profiler`
+while it is enabled, which `rungeneric.main` does when
+``genericsettings.profile`` is true or when called with the ``--profile``
+option. Then a trace in Chrome trace event format, which can be opened
+with ``chrome://tracing`` or https://ui.perfetto.dev, and a text summary
+are written into the output folder.
+
+While disabled, `span` returns a shared do-nothing context manager and
+`count` and `profiled` functions return immediately.
+
+>>> import cocopp.profiling as profiling
+>>> p = profiling.Profiler().start()
+>>> with p.span('outer'):
+...     with p.span('inner', arg=1):
+...         p.count('things', 3)
+>>> p.stop().counters['things']
+3
+>>> sorted(p.totals())
+['inner', 'outer']
+>>> len(p.trace_events()) > 2
+True
+
+"""
+
+from __future__ import absolute_import, print_function
+import os
+import sys
+import json
+import time
+import functools
+import threading
+import collections
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+def _max_rss_kB():
+    """return the peak resident set size in kB or `None`"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss  # bytes on macOS
+
+class _NullSpan(object):
+    """do-nothing context manager returned while the profiler is disabled"""
+    def __enter__(self):
+        return self
+    def __exit__(self, *args):
+        return False
+
+_null_span = _NullSpan()
+
+class _Span(object):
+    """context manager recording a single span of a `Profiler`"""
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+    def __enter__(self):
+        self.rss = _max_rss_kB()
+        self.start = time.perf_counter()
+        return self
+    def __exit__(self, *args):
+        self.profiler._add_span(self.name, self.start, time.perf_counter(),
+                                self.rss, self.args)
+        return False
+
+class Profiler(object):
+    """Record timing spans and counters.
+
+    Spans are recorded with the `span` context manager, the `profiled`
+    function decorator, or with `begin` and `end` for code blocks which
+    are not wrapped otherwise. Counters are incremented with `count`.
+    Nothing is recorded unless `enabled` is true, see `start`.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        """discard all recorded spans and counters"""
+        self.spans = []  # list of (name, start, end, thread id, rss increase, args)
+        self.counters = collections.OrderedDict()
+        self._counter_events = []  # list of (time, name, value)
+        self._open = []  # stack of spans started with `begin`
+        self.t0 = time.perf_counter()
+
+    def start(self):
+        """reset and enable the profiler"""
+        self.reset()
+        self.enabled = True
+        return self
+
+    def stop(self):
+        """disable the profiler and close all spans still open via `begin`"""
+        while self._open:
+            self.end()
+        self.enabled = False
+        return self
+
+    def span(self, name, **args):
+        """return a context manager recording the time spent in its block.
+
+        Keyword arguments are shown with the span in the trace.
+        """
+        if not self.enabled:
+            return _null_span
+        return _Span(self, name, args)
+
+    def begin(self, name, **args):
+        """start a span which is closed by the next call to `end`"""
+        if not self.enabled:
+            return
+        span = _Span(self, name, args)
+        span.__enter__()
+        self._open.append(span)
+
+    def end(self):
+        """close the span which was last started with `begin`"""
+        if self._open:
+            self._open.pop().__exit__()
+
+    def count(self, name, increment=1):
+        """increment counter `name` by `increment`"""
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + increment
+        self._counter_events.append((time.perf_counter(), name, self.counters[name]))
+
+    def _add_span(self, name, start, end, rss, args):
+        rss_increase = None
+        if rss is not None:
+            rss_increase = _max_rss_kB() - rss
+        self.spans.append((name, start, end, threading.current_thread().ident,
+                           rss_increase, args))
+
+    def totals(self):
+        """return an `OrderedDict` mapping span names to a `dict` with the
+        number of calls, the total and the maximal time in seconds and the
+        total increase of the peak memory in kB, sorted by decreasing total
+        time"""
+        res = {}
+        for name, start, end, _tid, rss_increase, _args in self.spans:
+            entry = res.setdefault(name, {'calls': 0, 'total': 0., 'max': 0.,
+                                          'peak memory increase': 0})
+            entry['calls'] += 1
+            entry['total'] += end - start
+            entry['max'] = max((entry['max'], end - start))
+            if rss_increase:
+                entry['peak memory increase'] += rss_increase
+        return collections.OrderedDict(sorted(res.items(),
+                                              key=lambda item: -item[1]['total']))
+
+    def trace_events(self):
+        """return the recorded spans and counters as `list` of Chrome trace
+        events with time stamps in microseconds"""
+        pid = os.getpid()
+        events = []
+        for name, start, end, tid, rss_increase, args in self.spans:
+            args = dict(args)
+            if rss_increase is not None:
+                args['peak memory increase [kB]'] = rss_increase
+            events.append({'name': name, 'cat': 'cocopp', 'ph': 'X',
+                           'ts': 1e6 * (start - self.t0),
+                           'dur': 1e6 * (end - start),
+                           'pid': pid, 'tid': tid,
+                           'args': {key: str(val) if not isinstance(val, (int, float)) else val
+                                    for key, val in args.items()}})
+        for t, name, value in self._counter_events:
+            events.append({'name': name, 'ph': 'C', 'ts': 1e6 * (t - self.t0),
+                           'pid': pid, 'args': {name: value}})
+        return sorted(events, key=lambda event: event['ts'])
+
+    def write_chrome_trace(self, filename):
+        """write the trace into `filename` in Chrome trace event format"""
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': self.trace_events(),
+                       'displayTimeUnit': 'ms'}, f)
+
+    def summary(self):
+        """return a text summary of the recorded spans and counters"""
+        lines = ['%-52s %7s %10s %10s %10s %12s' % ('span', 'calls', 'total[s]',
+                                                   'mean[ms]', 'max[ms]', 'peak mem+[kB]')]
+        for name, entry in self.totals().items():
+            lines.append('%-52s %7d %10.3f %10.3f %10.3f %12d' % (
+                name[:52], entry['calls'], entry['total'],
+                1e3 * entry['total'] / entry['calls'], 1e3 * entry['max'],
+                entry['peak memory increase']))
+        if self.counters:
+            lines.append('')
+            lines.append('%-52s %18s' % ('counter', 'value'))
+            for name, value in self.counters.items():
+                lines.append('%-52s %18d' % (name[:52], value))
+        max_rss = _max_rss_kB()
+        if max_rss is not None:
+            lines.append('')
+            lines.append('peak resident memory: %.1f MB' % (max_rss / 1024.))
+        return '\n'.join(lines) + '\n'
+
+    def write_summary(self, filename):
+        """write `summary` into `filename`"""
+        with open(filename, 'w') as f:
+            f.write(self.summary())
+
+    def write(self, outputdir, basename='cocopp_profile'):
+        """write trace and summary into `outputdir` and return their file names"""
+        names = (os.path.join(outputdir, basename + '.json'),
+                 os.path.join(outputdir, basename + '.txt'))
+        self.write_chrome_trace(names[0])
+        self.write_summary(names[1])
+        return names
+
+profiler = Profiler()
+"""the profiler instance used throughout the package"""
+
+def span(name, **args):
+    """return a context manager recording a span with `profiler`"""
+    if not profiler.enabled:
+        return _null_span
+    return _Span(profiler, name, args)
+
+def count(name, increment=1):
+    """increment counter `name` of `profiler`"""
+    if profiler.enabled:
+        profiler.count(name, increment)
+
+def begin(name, **args):
+    """start a span of `profiler` closed by `end`"""
+    if profiler.enabled:
+        profiler.begin(name, **args)
+
+def end():
+    """close the span last started with `begin`"""
+    if profiler.enabled:
+        profiler.end()
+
+def profiled(name=None):
+    """return a decorator recording each call of the decorated function as
+    span `name`, by default the qualified name of the function"""
+    def decorator(func):
+        span_name = name or getattr(func, '__qualname__', func.__name__)
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with _Span(profiler, span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -23,7 +23,7 @@ import os, sys
 import numpy
 import warnings
 
-from . import genericsettings, testbedsettings, dataformatsettings
+from . import genericsettings, testbedsettings, dataformatsettings, profiling
 
 from pdb import set_trace
 from six import string_types, advance_iterator
@@ -345,6 +345,7 @@ class HArrayMultiReader(ArrayMultiReader, HMultiReader):
 
 
 # FUNCTION DEFINITIONS
+@profiling.profiled('align_data')
 def align_data(data, idx_evals, idx_funvals, rewind_reader=False):
     """Aligns the data from a list of data arrays.
 
@@ -439,46 +440,43 @@ def openfile(filePath, **kwargs):
         return open(filePath, 'r', **kwargs)
 
 
-def split(dataFiles, idx_to_load=None, dim=None):
-    """Split a list of data files into arrays corresponding to data sets.
-       The Boolean list idx_to_load is thereby indicating whether a
-       given part of the split is to be considered or not if None, all
-       instances are considered.
-    """
+class DataFileParser(object):
+    """Parse the lines of a data file into runs.
 
-    data_sets = []
-    algorithms = []
-    success_ratio = []
-    reference_values = {}
-    for fil in dataFiles:
-        with openfile(fil) as f:
-            # This doesnt work with windows.
-            # content = numpy.loadtxt(fil, comments='%')
-            lines = f.readlines()
-
-        content = []
-        idx = 0  # instance index for checking in idx_to_load
-        current_instance = 0
-        current_reference_value = 0
-        is_best_algorithm_data = False
-
-        # Save values in array content. Check for nan and inf.
+    Lines can be fed in several chunks with `feed`, a run continues
+    over chunks. A run begins with a comment line after data lines,
+    consecutive comment lines belong to the same run. `runs` returns
+    the runs with data parsed so far.
+    """
+    def __init__(self, filename, dim=None):
+        self.filename = filename
+        self.dim = dim
+        self.algorithms = []
+        self.success_ratio = []
+        self._runs = []  # closed runs: [instance, reference value, data array]
+        self._new_run()
+
+    def _new_run(self):
+        self._instance = 0
+        self._reference_value = 0
+        self._is_best_algorithm_data = False
+        self._content = []
+
+    def _close_run(self):
+        self._runs.append([self._instance, self._reference_value, numpy.vstack(self._content)])
+        self._new_run()
+
+    def feed(self, lines):
+        """parse `lines`, an iterable of `str` each with a single line"""
+        content = self._content
+        is_best_algorithm_data = self._is_best_algorithm_data
+        dim = self.dim
         for line in lines:
             if line.startswith('%'):
                 if content:
-                    if (idx_to_load is None) or (idx_to_load and len(idx_to_load) > idx and idx_to_load[idx]):
-                        data_sets.append(numpy.vstack(content))
-                    elif genericsettings.verbose:
-                            print('skipped instance...')
-                    # Use only the reference values from instances 1 to 5.
-                    if current_instance in (1, 2, 3, 4, 5):
-                        reference_values[current_instance] = current_reference_value
-
-                    content = []
-                    current_instance = 0
-                    current_reference_value = 0
+                    self._close_run()
+                    content = self._content
                     is_best_algorithm_data = False
-                    idx += 1
 
                 # Get the current instance and reference value.
                 parts = line.strip('\n').strip(r'%').split(', ')
@@ -486,11 +484,11 @@ def split(dataFiles, idx_to_load=None, dim=None):
                     if '=' in elem:
                         key, value = elem.split('=', 1)
                         if key.strip() == 'instance':
-                            current_instance = int(value.strip())
+                            self._instance = int(value.strip())
                         elif key.strip() == 'reference value':
-                            current_reference_value = float(value.strip())
+                            self._reference_value = float(value.strip())
                         elif key.strip() == 'algorithm type':
-                            is_best_algorithm_data = 'best' == value.strip()
+                            is_best_algorithm_data = self._is_best_algorithm_data = 'best' == value.strip()
 
                 continue
 
@@ -504,15 +502,15 @@ def split(dataFiles, idx_to_load=None, dim=None):
                 if index <= 0:
                     warnings.warn('Invalid best algorithm data!')
                 else:
-                    algorithms.append(data[index])
+                    self.algorithms.append(data[index])
                     successful_runs = int(data[index + 1])
                     all_runs = int(data[index + 2])
-                    success_ratio.append([successful_runs, all_runs])
+                    self.success_ratio.append([successful_runs, all_runs])
                     data = data[:-3]  # remove the three processed items from data
 
             if dim and len(data) != dim + 5:
                 warnings.warn('Incomplete line %s in  ' % line +
-                              'data file %s: ' % fil)
+                              'data file %s: ' % self.filename)
                 continue
             for index in range(len(data)):
                 if data[index] in ('Inf', 'inf'):
@@ -532,15 +530,92 @@ def split(dataFiles, idx_to_load=None, dim=None):
                 content.append(numpy.array(data))
             # Check that it always have the same length?
 
-        if content:
+    def runs(self):
+        """return a list of ``[instance, reference value, data array]`` for
+        each run with data"""
+        if not self._content:
+            return self._runs
+        return self._runs + [[self._instance, self._reference_value,
+                              numpy.vstack(self._content)]]
+
+class TailReader(DataFileParser):
+    """Parse a growing data file incrementally.
+
+    `update` parses only the complete lines appended since the last
+    call, an incomplete last line is kept for the next call. A file
+    which became shorter is parsed anew.
+    """
+    def __init__(self, filename, dim=None):
+        super(TailReader, self).__init__(filename, dim)
+        self.offset = 0
+        self._rest = b''
+
+    def update(self):
+        """parse the appended lines and return the number of bytes of the
+        complete lines parsed, which is zero when only the incomplete last
+        line has grown"""
+        if not os.path.isfile(self.filename):
+            raise IOError(2, 'The file "%s" does not exist.' % self.filename)
+        size = os.path.getsize(self.filename)
+        if size < self.offset:  # the file was rewritten
+            self.__init__(self.filename, self.dim)
+        if size == self.offset:
+            return 0
+        with open(self.filename, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+        self.offset += len(chunk)
+        content = self._rest + chunk
+        lines = content.split(b'\n')
+        self._rest = lines.pop()  # empty if the chunk ends with a newline
+        self.feed(line.decode('utf-8', 'replace') for line in lines)
+        return len(content) - len(self._rest)
+
+tail_readers = None
+"""`dict` of `TailReader` instances by file name or `None`. When not
+   `None`, `split` reads data files with these readers, creating them
+   when necessary, hence a file is parsed only as far as it has grown
+   since it was read last, see `cocopp.livedata`"""
+
+@profiling.profiled('split')
+def split(dataFiles, idx_to_load=None, dim=None):
+    """Split a list of data files into arrays corresponding to data sets.
+       The Boolean list idx_to_load is thereby indicating whether a
+       given part of the split is to be considered or not if None, all
+       instances are considered.
+    """
+
+    data_sets = []
+    algorithms = []
+    success_ratio = []
+    reference_values = {}
+    for fil in dataFiles:
+        if tail_readers is not None:
+            if fil not in tail_readers:
+                tail_readers[fil] = TailReader(fil, dim)
+            parser = tail_readers[fil]
+            parser.update()
+        else:
+            with openfile(fil) as f:
+                # This doesnt work with windows.
+                # content = numpy.loadtxt(fil, comments='%')
+                lines = f.readlines()
+            if profiling.profiler.enabled:
+                profiling.count('bytes read', sum(len(line) for line in lines))
+            parser = DataFileParser(fil, dim)
+            parser.feed(lines)
+
+        # Save values in array content. Check for nan and inf.
+        for idx, (instance, reference_value, data) in enumerate(parser.runs()):
             if (idx_to_load is None) or (idx_to_load and len(idx_to_load) > idx and idx_to_load[idx]):
-                data_sets.append(numpy.vstack(content))
+                data_sets.append(data)
             elif genericsettings.verbose:
                     print('skipped instance...')
-
             # Use only the reference values from instances 1 to 5.
-            if current_instance in (1, 2, 3, 4, 5):
-                reference_values[current_instance] = current_reference_value
+            if instance in (1, 2, 3, 4, 5):
+                reference_values[instance] = reference_value
+        algorithms += parser.algorithms
+        success_ratio += parser.success_ratio
 
     if len(algorithms) < len(data_sets):
         algorithms = []
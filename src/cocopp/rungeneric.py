@@ -18,11 +18,13 @@ from __future__ import unicode_literals
 
 import os
 import sys
+import time
 import getopt
 import warnings
 import webbrowser
 import matplotlib
 from . import genericsettings, testbedsettings, rungeneric1, rungenericmany, toolsdivers, bestalg, archiving
+from . import profiling, watch, findfiles, pproc
 from .toolsdivers import truncate_latex_command_file, print_done, diff_attr
 from .ppfig import Usage
 from .compall import ppfigs
@@ -45,7 +47,7 @@ long_options = ["help", "output-dir=", "noisy", "noise-free",
                "expensive", "runlength-based",
                "los-only", "crafting-effort=", "pickle",
                "sca-only", "no-svg",
-               "include-fonts", "no-interactive"]
+               "include-fonts", "no-interactive", "profile", "watch"]
 # thereby, "los-only", "crafting-effort=", and "pickle" affect only rungeneric1
 # and "sca-only" only affects rungenericmany
 
@@ -217,6 +219,20 @@ def main(argv=None):
             generated pdfs will have the fonts included (important for ACM style
             LaTeX submissions)
 
+        --profile
+
+            record where the post-processing spends time and memory and
+            write ``cocopp_profile.json`` (Chrome trace format) and
+            ``cocopp_profile.txt`` into the output folder, see
+            `cocopp.profiling`
+
+        --watch
+
+            after the post-processing, check the input folders for new
+            data every ``genericsettings.watch_interval`` seconds and
+            generate anew only the outputs affected by the new data,
+            until interrupted with Ctrl-C, see `cocopp.watch`
+
 
     Exceptions raised:
 
@@ -251,6 +267,7 @@ def main(argv=None):
         argv = sys.argv[1:]
     if not isinstance(argv, list) and str(argv) == argv:  # get rid of .split in python shell
         argv = argv.split()
+    download_pipeline = archiving.DownloadPipeline(genericsettings.download_ahead)
     try:
         try:
             opts, args = getopt.getopt(argv, short_options,
@@ -276,14 +293,11 @@ def main(argv=None):
             shortoptlist.remove("-o") # 2020/6/5: TODO: not sure why this is done
         longoptlist = list("--" + i.rstrip("=") for i in long_options)
 
-        plt.rc("axes", **genericsettings.rcaxes)
-        plt.rc("xtick", **genericsettings.rctick)
-        plt.rc("ytick", **genericsettings.rctick)
-        plt.rc("font", **genericsettings.rcfont)
-        plt.rc("legend", **genericsettings.rclegend)
+        _set_rc()
 
         genopts = []
         outputdir = genericsettings.outputdir
+        watching = False
         for o, a in opts:
             if o in ("-h", "--help"):
                 usage()
@@ -351,6 +365,10 @@ def main(argv=None):
                 genericsettings.isLogLoss = False
             elif o == "--no-interactive":
                 genericsettings.interactive_mode = False
+            elif o == "--profile":
+                genericsettings.profile = True
+            elif o == "--watch":
+                watching = True
             elif o == "--parameter-sweep":
                 genericsettings.parameter_sweep = True
             elif o == "--parameter-sweep-colormaps":
@@ -386,13 +404,24 @@ def main(argv=None):
             if genericsettings.verbose:
                 print('Folder %s was created.' % outputdir)
 
+        if genericsettings.profile:
+            profiling.profiler.start()
+            profiling.begin('rungeneric.main')
+
         latex_commands_filename = os.path.join(outputdir, 'cocopp_commands.tex')
 
+        # LaTeX commands and html edits are written once in the end
+        toolsdivers.text_file_buffer.activate()
         truncate_latex_command_file(latex_commands_filename)
+        # the commands of earlier calls, restored before each watch update
+        latex_commands_previous = toolsdivers.read_lines(latex_commands_filename)
 
         print('Post-processing (%s)' % ('1' if len(args) == 1 else '2+'))  # to not break doctests
 
-        # manage data paths as given in args
+        # manage data paths as given in args, archived data are downloaded
+        # in the background while the previous ones are parsed
+        if genericsettings.download_ahead > 0:
+            download_pipeline.start()
         data_archive = archiving.official_archives.all  # was: archiving.COCODataArchive()
         args = data_archive.get_extended(args)
         if None in args:
@@ -423,31 +452,47 @@ def main(argv=None):
             raise ValueError("Data from more than two suites %s cannot "
                              "be post-processed together" % str(suites))
 
-        if len(args) == 1 or '--include-single' in dict(opts):
-            genericsettings.foreground_algorithm_list = []
-            for i, alg in enumerate(args):
-                genericsettings.foreground_algorithm_list.append(alg)
-                dsld = rungeneric1.main(alg, outputdir, genopts + ["-o", outputdir, alg])
-
-        if len(args) >= 2 or len(genericsettings.background) > 0:
-            # Reset foreground algorithm list if cocopp.main() is called.
-            # Otherwise the list accumulates arguments passed to cocopp.main().
-            # Arguments are still accumulated if rungeneric.main() is bypassed
-            # and rungenericmany.main() or lower-level functions are called.
-            genericsettings.foreground_algorithm_list = []
-            dsld = rungenericmany.main(args, outputdir)
-            
-        toolsdivers.prepend_to_file(latex_commands_filename,
-                                        ['\\providecommand{\\numofalgs}{%d}' % len(args)]
+        live_data = watch.live_data(args) if watching else {}
+        if watching and not live_data:
+            warnings.warn("--watch is ignored, because no data argument is a local folder")
+        if live_data:  # updates go into the same output folders
+            findfiles.output_folder_time = time.strftime("%m%d%Hh%M%S")
+
+        def postprocess(problems=None):
+            """post-process all data, with `problems` generate only the
+            outputs affected by these ``(funcId, dim)`` pairs"""
+            if len(args) == 1 or '--include-single' in dict(opts):
+                genericsettings.foreground_algorithm_list = []
+                for i, alg in enumerate(args):
+                    genericsettings.foreground_algorithm_list.append(alg)
+                    dsld = rungeneric1.main(alg, outputdir, genopts + ["-o", outputdir, alg],
+                                            live_data.get(alg), problems)
+
+            if len(args) >= 2 or len(genericsettings.background) > 0:
+                # Reset foreground algorithm list if cocopp.main() is called.
+                # Otherwise the list accumulates arguments passed to cocopp.main().
+                # Arguments are still accumulated if rungeneric.main() is bypassed
+                # and rungenericmany.main() or lower-level functions are called.
+                genericsettings.foreground_algorithm_list = []
+                dsld = rungenericmany.main(args, outputdir, live_data, problems)
+            return dsld
+
+        def prepend_latex_commands():
+            toolsdivers.prepend_to_file(latex_commands_filename,
+                                            ['\\providecommand{\\numofalgs}{%d}' % len(args)]
+                                            )
+            toolsdivers.prepend_to_file(latex_commands_filename,
+                                        ['\\providecommand{\\cocoversion}{{\\scriptsize\\sffamily{}' +
+                                         '\\color{Gray}Data produced with COCO %s}}' % (toolsdivers.get_version_label(None))]
+                                        )
+            toolsdivers.prepend_to_file(latex_commands_filename,
+                                        ['\\providecommand{\\bbobecdfcaptionsinglefunctionssingledim}[1]{',
+                                         ppfigs.get_ecdfs_single_functions_single_dim_caption(), '}']
                                         )
-        toolsdivers.prepend_to_file(latex_commands_filename,
-                                    ['\\providecommand{\\cocoversion}{{\\scriptsize\\sffamily{}' +
-                                     '\\color{Gray}Data produced with COCO %s}}' % (toolsdivers.get_version_label(None))]
-                                    )
-        toolsdivers.prepend_to_file(latex_commands_filename,
-                                    ['\\providecommand{\\bbobecdfcaptionsinglefunctionssingledim}[1]{',
-                                     ppfigs.get_ecdfs_single_functions_single_dim_caption(), '}']
-                                    )
+
+        dsld = postprocess()
+        prepend_latex_commands()
+        toolsdivers.text_file_buffer.flush()
             
         open(os.path.join(outputdir,
                           'cocopp_commands.tex'), 'a').close()
@@ -479,6 +524,21 @@ def main(argv=None):
                 webbrowser.open("file://" + os.getcwd() + '/' + outputdir + "/index.html")
             except Exception:
                 pass
+
+        if live_data:
+            def update(problems):
+                _set_rc()
+                toolsdivers.text_file_buffer.activate()
+                try:
+                    # the LaTeX commands are written anew, not prepended again
+                    toolsdivers.write_lines(latex_commands_filename, latex_commands_previous)
+                    postprocess(problems)
+                    prepend_latex_commands()
+                finally:
+                    toolsdivers.text_file_buffer.flush()
+                    pproc.save_unsaved_targets()
+                    plt.rcdefaults()
+            watch.watch(live_data, update)
         return dsld
 
     # TODO prevent loading the data every time...
@@ -487,6 +547,24 @@ def main(argv=None):
         print(err.msg, file=sys.stderr)
         print("For help use -h or --help", file=sys.stderr)
         return 2
+    finally:
+        download_pipeline.stop()
+        findfiles.output_folder_time = None
+        toolsdivers.text_file_buffer.flush()
+        pproc.save_unsaved_targets()
+        if profiling.profiler.enabled:
+            profiling.profiler.stop()
+            trace_file, summary_file = profiling.profiler.write(outputdir)
+            print('Profile written to %s and %s' % (summary_file, trace_file))
+
+
+def _set_rc():
+    """set the `matplotlib` rc parameters from `genericsettings`"""
+    plt.rc("axes", **genericsettings.rcaxes)
+    plt.rc("xtick", **genericsettings.rctick)
+    plt.rc("ytick", **genericsettings.rctick)
+    plt.rc("font", **genericsettings.rcfont)
+    plt.rc("legend", **genericsettings.rclegend)
 
 
 def update_background_algorithms(input_dir):
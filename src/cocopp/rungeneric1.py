@@ -28,7 +28,7 @@ from . import genericsettings, testbedsettings, config, ppfig, pptable, pprldist
 from .pproc import DataSetList, store_reference_values, dictAlgByDim
 from .ppfig import Usage
 from .toolsdivers import print_done, prepend_to_file, strip_pathname1, str_to_latex, get_version_label, replace_in_file
-from . import ppconverrorbars
+from . import ppconverrorbars, profiling, archiving, watch
 from .compall import pprldmany, ppfigs
 
 __all__ = ['main']
@@ -37,7 +37,7 @@ __all__ = ['main']
 def usage():
     print(main.__doc__)
 
-def main(alg, outputdir, argv=None):
+def main(alg, outputdir, argv=None, data=None, problems=None):
     r"""Post-processing COCO data of a single algorithm.
 
     Provided with some data for an algorithm alg, this routine outputs
@@ -56,6 +56,11 @@ def main(alg, outputdir, argv=None):
     Previously possible to be called from the system shell, this
     routine is called via rungeneric.py only and hence any
     system shell arguments are handled there.
+
+    `data` is a `DataSetList` of `alg` which has been loaded already.
+    With `problems`, a `set` of ``(funcId, dim)`` pairs, only the outputs
+    which depend on the data of these problems are generated, see
+    `watch`.
     """
 
     if (not genericsettings.verbose):
@@ -69,7 +74,8 @@ def main(alg, outputdir, argv=None):
     print("\nPost-processing (1)")
     print("  loading data...")
 
-    dsList = DataSetList(alg)
+    with profiling.span('rungeneric1: loading data'):
+        dsList = DataSetList(archiving.wait_for_download(alg)) if data is None else data
 
     if not dsList:
         raise Usage("Nothing to do: post-processing stopped. For more information check the messages above.")
@@ -147,25 +153,32 @@ def main(alg, outputdir, argv=None):
     values_of_interest = testbedsettings.current_testbed.ppfigdim_target_values
     if genericsettings.isFig:
         print("Scaling figures...")
+        profiling.begin('rungeneric1: Scaling figures')
         # ERT/dim vs dim.
-        ppfigdim.main(dsList, values_of_interest, algoutputdir)
+        ppfigdim.main(dsList, values_of_interest, algoutputdir, problems)
 
+        profiling.end()
         print_done()
 
     if testbedsettings.current_testbed.has_constraints:
         print("Scaling wrt constraints...")
+        profiling.begin('rungeneric1: Scaling wrt constraints')
         ppfigcons1.main(dsList, values_of_interest, algoutputdir)
+        profiling.end()
         print_done()
 
     if genericsettings.isConv:
         print("Generating convergence plots...")
-        ppconverrorbars.main(dictAlg,
+        profiling.begin('rungeneric1: Generating convergence plots')
+        ppconverrorbars.main(watch.select_functions(dictAlg, problems),
                              algoutputdir,
                              genericsettings.single_algorithm_file_name)
+        profiling.end()
         print_done()
 
     if genericsettings.isTab:
         print("Generating LaTeX tables...")
+        profiling.begin('rungeneric1: Generating LaTeX tables')
         dictNoise = dsList.dictByNoise()
         dict_dim_list = dictAlgByDim(dictAlg)
         dims = sorted(dict_dim_list)
@@ -178,12 +191,16 @@ def main(alg, outputdir, argv=None):
         replace_in_file(os.path.join(algoutputdir, 'pptable.html'), '??COCOVERSION??',
                         '<br />Data produced with COCO %s' % (get_version_label(None)))
 
+        # the html page is written anew, hence all tables are generated
+        tex_dims = [d for d in dims if watch.affected(dict_dim_list[d], problems)]
         for noise, sliceNoise in dictNoise.items():
-            pptable.main(sliceNoise, dims, algoutputdir, latex_commands_file)
+            pptable.main(sliceNoise, dims, algoutputdir, latex_commands_file, tex_dims)
+        profiling.end()
         print_done()
 
     if genericsettings.isRLDistr:
         print("ECDF graphs...")
+        profiling.begin('rungeneric1: ECDF graphs')
         dictNoise = dsList.dictByNoise()
         if len(dictNoise) > 1:
             warnings.warn('Data for functions from both the noisy and '
@@ -196,6 +213,8 @@ def main(alg, outputdir, argv=None):
                 sliceDim = dictDim[dim]
             except KeyError:
                 continue
+            if not watch.affected(sliceDim, problems):
+                continue
 
             dictNoise = sliceDim.dictByNoise()
 
@@ -214,21 +233,26 @@ def main(alg, outputdir, argv=None):
 
             pprldistr.fmax = None  # Resetting the max final value
             pprldistr.evalfmax = None  # Resetting the max #fevalsfactor
+        profiling.end()
         print_done()
 
         if genericsettings.isRldOnSingleFcts: # copy-paste from above, here for each function instead of function groups
             # ECDFs for each function
             print("ECDF graphs per function...")
+            profiling.begin('rungeneric1: ECDF graphs per function')
             pprldmany.all_single_functions(dictAlg,
                                            True,
                                            None,
                                            algoutputdir,
                                            genericsettings.single_algorithm_file_name,
-                                           settings=genericsettings)
+                                           settings=genericsettings,
+                                           problems=problems)
+            profiling.end()
             print_done()
 
     if genericsettings.isLogLoss:
         print("ERT loss ratio figures and tables...")
+        profiling.begin('rungeneric1: ERT loss ratio figures and tables')
         for ng, sliceNoise in dsList.dictByNoise().items():
             if ng == 'noiselessall':
                 testbed = 'noiseless'
@@ -248,13 +272,17 @@ def main(alg, outputdir, argv=None):
                     sliceDim = dictDim[d]
                 except KeyError:
                     continue
+                if not watch.affected(sliceDim, problems):
+                    continue
                 info = '%s' % ng
-                pplogloss.main(sliceDim, CrE, True, algoutputdir, info)
-                pplogloss.generateTable(sliceDim, CrE, algoutputdir, info)
+                loss_data = pplogloss.loss_ratios(sliceDim, CrE)  # for all figures and the table
+                pplogloss.main(sliceDim, CrE, True, algoutputdir, info, loss_data)
+                pplogloss.generateTable(sliceDim, CrE, algoutputdir, info, loss_data)
                 for fGroup, sliceFuncGroup in sliceDim.dictByFuncGroup().items():
                     info = '%s' % fGroup
                     pplogloss.main(sliceFuncGroup, CrE, True,
-                                   algoutputdir, info)
+                                   algoutputdir, info, loss_data)
+        profiling.end()
         print_done()
 
     prepend_to_file(latex_commands_file,
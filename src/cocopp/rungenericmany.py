@@ -15,7 +15,7 @@ import getopt
 import warnings
 
 from . import genericsettings, config, ppfig, testbedsettings, findfiles
-from . import pproc, pptex, pprldistr
+from . import pproc, pptex, pprldistr, profiling, watch
 from .pproc import DataSetList, processInputArgs
 from .ppfig import Usage
 from .toolsdivers import prepend_to_file, strip_pathname1, str_to_latex, replace_in_file
@@ -32,9 +32,11 @@ def usage():
     print(main.__doc__)
 
 
-def grouped_ecdf_graphs(alg_dict, order, output_dir, function_groups, settings, parent_file_name):
+def grouped_ecdf_graphs(alg_dict, order, output_dir, function_groups, settings, parent_file_name,
+                        problems=None):
     """ Generates ecdf graphs, aggregated over groups as
-        indicated via algdict
+        indicated via algdict, with `problems` only those affected by
+        these ``(funcId, dim)`` pairs
     """
     for gr, tmpdictAlg in alg_dict.items():
         dictDim = pproc.dictAlgByDim(tmpdictAlg)
@@ -51,6 +53,8 @@ def grouped_ecdf_graphs(alg_dict, order, output_dir, function_groups, settings,
 
         for i, d in enumerate(dims):
             entries = dictDim[d]
+            if not watch.affected(entries, problems):
+                continue
 
             pprldmany.main(entries,  # pass expensive flag here?
                            order=order,
@@ -64,7 +68,7 @@ def grouped_ecdf_graphs(alg_dict, order, output_dir, function_groups, settings,
             replace_in_file(file_name, '??COCOVERSION??', '<br />Data produced with COCO %s' % (get_version_label(None)))
 
 
-def main(args, outputdir):
+def main(args, outputdir, data=None, problems=None):
     r"""Main routine for post-processing the data of multiple algorithms.
 
     Provided with some data in argument args, this routine outputs figure and TeX files
@@ -82,6 +86,11 @@ def main(args, outputdir):
     routine is called via rungeneric.py only and hence any
     system shell arguments are handled there.
 
+    `data` is a `dict` of already loaded `DataSetList` by argument in
+    `args`. With `problems`, a `set` of ``(funcId, dim)`` pairs, only
+    the outputs which depend on the data of these problems are
+    generated, see `watch`.
+
     """
 
     print("\nPost-processing (2+)");
@@ -110,7 +119,8 @@ def main(args, outputdir):
 
     print("  loading data...")
     pproc._block_using_recommendations = False
-    dsList, sortedAlgs, dictAlg = processInputArgs(args, True)
+    with profiling.span('rungenericmany: loading data'):
+        dsList, sortedAlgs, dictAlg = processInputArgs(args, True, data=data)
     pproc._block_using_recommendations = True
     # TODO: dictAlg not really needed here anymore as we filter
     #       dsList and then get dictAlg from there...
@@ -210,6 +220,7 @@ def main(args, outputdir):
 
         if len(genericsettings.foreground_algorithm_list) == 2:
             print("ECDF runlength ratio graphs...")
+            profiling.begin('rungenericmany: ECDF runlength ratio graphs')
 
             ds_list0 = dictAlg[sortedAlgs[0]]
             dict_fun0 = ds_list0.dictByNoise()
@@ -238,6 +249,8 @@ def main(args, outputdir):
             dic_dim0 = ds_list0.dictByDim()
             dic_dim1 = ds_list1.dictByDim()
             for dim in set(dic_dim0.keys()) & set(dic_dim1.keys()):
+                if not watch.affected(dic_dim0[dim] + dic_dim1[dim], problems):
+                    continue
                 if dim in testbedsettings.current_testbed.rldDimsOfInterest:
                     # ECDF for all functions altogether
                     try:
@@ -276,12 +289,16 @@ def main(args, outputdir):
                              # on maxfevals
                              '}'
                              ])
+            profiling.end()
             print_done()
 
             if testbedsettings.current_testbed not in [testbedsettings.GECCOBiObjBBOBTestbed,
                                                        testbedsettings.GECCOBiObjExtBBOBTestbed]:
                 print("ECDF runlength graphs...")
+                profiling.begin('rungenericmany: ECDF runlength graphs')
                 for dim in set(dic_dim0.keys()) & set(dic_dim1.keys()):
+                    if not watch.affected(dic_dim0[dim] + dic_dim1[dim], problems):
+                        continue
                     pprldistr.fmax = None  # Resetting the max final value
                     pprldistr.evalfmax = None  # Resetting the max #fevalsfactor
                     # ECDFs of all functions altogether
@@ -314,30 +331,38 @@ def main(args, outputdir):
                                            testbedsettings.current_testbed.rldValsOfInterest, True,
                                            many_algorithms_output,
                                            '%s' % fGroup)
+                profiling.end()
                 print_done()  # of "ECDF runlength graphs..."
 
         # ECDFs per noise groups
         print("ECDF graphs per noise group...")
+        profiling.begin('rungenericmany: ECDF graphs per noise group')
         grouped_ecdf_graphs(pproc.dictAlgByNoi(dictAlg),
                             sortedAlgs,
                             many_algorithms_output,
                             dictAlg[sortedAlgs[0]].getFuncGroups(),
                             genericsettings,
-                            genericsettings.many_algorithm_file_name)
+                            genericsettings.many_algorithm_file_name,
+                            problems)
+        profiling.end()
         print_done()
 
         # ECDFs per function groups
         print("ECDF graphs per function group...")
+        profiling.begin('rungenericmany: ECDF graphs per function group')
         grouped_ecdf_graphs(pproc.dictAlgByFuncGroup(dictAlg),
                             sortedAlgs,
                             many_algorithms_output,
                             dictAlg[sortedAlgs[0]].getFuncGroups(),
                             genericsettings,
-                            genericsettings.many_algorithm_file_name)
+                            genericsettings.many_algorithm_file_name,
+                            problems)
+        profiling.end()
         print_done()
 
         # copy-paste from above, here for each function instead of function groups:
         print("ECDF graphs per function...")
+        profiling.begin('rungenericmany: ECDF graphs per function')
         if genericsettings.isRldOnSingleFcts:
             # ECDFs for each function
             if 1 < 3:
@@ -346,7 +371,8 @@ def main(args, outputdir):
                                                sortedAlgs,
                                                many_algorithms_output,
                                                genericsettings.many_algorithm_file_name,
-                                               settings=genericsettings)
+                                               settings=genericsettings,
+                                               problems=problems)
             else:  # subject to removal
                 dictFG = pproc.dictAlgByFun(dictAlg)
                 for fg, tmpdictAlg in dictFG.items():
@@ -373,10 +399,12 @@ def main(args, outputdir):
                         dimensions=dims,
                         htmlPage=ppfig.HtmlPage.NON_SPECIFIED,
                         header=ppfig.pprldmany_per_func_dim_header)
+        profiling.end()
         print_done()
 
     if genericsettings.isTab:
         print("Generating comparison tables...")
+        profiling.begin('rungenericmany: Generating comparison tables')
         prepend_to_file(latex_commands_file,
                         [r'\providecommand{\bbobpptablesmanylegend}[1]{' +
                          pptables.get_table_caption() + '}'])
@@ -384,17 +412,21 @@ def main(args, outputdir):
         for ng, tmpdictng in dictNoi.items():
             dictDim = pproc.dictAlgByDim(tmpdictng)
             for d, tmpdictdim in sorted(dictDim.items()):
+                # the html page is written anew, hence all tables are generated
                 pptables.main(
                     tmpdictdim,
                     sortedAlgs,
                     many_algorithms_output,
                     ([1, 20, 38] if (testbedsettings.current_testbed.name ==
                                      testbedsettings.suite_name_bi) else True),
-                    latex_commands_file)
+                    latex_commands_file,
+                    write_tex=watch.affected(tmpdictdim, problems))
+        profiling.end()
         print_done()
 
     if genericsettings.isScatter and len(genericsettings.foreground_algorithm_list) == 2:
         print("Scatter plots...")
+        profiling.begin('rungenericmany: Scatter plots')
 
         ds_list0 = dictAlg[sortedAlgs[0]]
         algorithm_name0 = str_to_latex(strip_pathname1(sortedAlgs[0]))
@@ -412,7 +444,9 @@ def main(args, outputdir):
 
         html_file_name = os.path.join(many_algorithms_output, genericsettings.ppscatter_file_name + '.html')
 
-        ppscatter.main(ds_list1, ds_list0, many_algorithms_output, genericsettings)
+        ppscatter.main(watch.select_functions(ds_list1, problems),
+                       watch.select_functions(ds_list0, problems),
+                       many_algorithms_output, genericsettings)
         prepend_to_file(latex_commands_file,
                         ['\\providecommand{\\bbobppscatterlegend}[1]{',
                          ppscatter.figure_caption(),
@@ -423,24 +457,29 @@ def main(args, outputdir):
         for i, alg in enumerate(args):
             replace_in_file(html_file_name, 'algorithm' + pptex.numtotext(i), str_to_latex(strip_pathname1(alg)))
 
+        profiling.end()
         print_done()
 
     if genericsettings.isFig:
         print("Scaling figures...")
-        ppfigs.main(dictAlg,
+        profiling.begin('rungenericmany: Scaling figures')
+        ppfigs.main(watch.select_functions(dictAlg, problems),
                     genericsettings.ppfigs_file_name,
                     sortedAlgs,
                     many_algorithms_output,
                     latex_commands_file)
+        profiling.end()
         print_done()
 
     if testbedsettings.current_testbed.has_constraints:
         print("Scaling wrt constraints...")
+        profiling.begin('rungenericmany: Scaling wrt constraints')
         ppfigcons.main(dictAlg,
                        genericsettings.ppfigcons_file_name,
                        sortedAlgs,
                        many_algorithms_output,
                        latex_commands_file)
+        profiling.end()
         print_done()
 
     print("Output data written to folder %s" %
@@ -20,10 +20,9 @@ import sys
 import warnings
 import getopt
 import pickle
-import ast
 
 from . import findfiles
-from .pproc import parseinfo
+from .pproc import parseinfo, parseinfo_data
 from .readalign import split
 from .ppfig import Usage
 from . import rungeneric
@@ -57,39 +56,27 @@ def checkinfofile(filename, verbose=True):
         These are the lines with data files and run times information.
 
         """
-        parts = s.split(', ')
+        filenames, runs = parseinfo_data(s)  # raises ValueError on faulty runs
         datfiles = []
-        trials = []
-        for elem in parts:
-            if elem.endswith('dat'):
-                filename = elem.replace('\\', os.sep)
-                # *nix data to Windows processing
-                filename = filename.replace('/', os.sep)
-                root, ext = os.path.splitext(elem)
-                root = os.path.join(filepath, root)
-                dat = os.path.join(root + '.dat')
-                tdat = os.path.join(root + '.tdat')
-                if not (os.path.exists(dat) and os.path.exists(tdat)):
-                    raise IOError
-                else:
-                    if verbose:
-                        print('Found data files %s.dat and %s.tdat' % (root, root))
-                datfiles.extend((dat, tdat))
+        for elem in filenames:
+            name = elem.replace('\\', os.sep)
+            # *nix data to Windows processing
+            name = name.replace('/', os.sep)
+            root, ext = os.path.splitext(name)
+            root = os.path.join(filepath, root)
+            dat = os.path.join(root + '.dat')
+            tdat = os.path.join(root + '.tdat')
+            if not (os.path.exists(dat) and os.path.exists(tdat)):
+                raise IOError
             else:
-                if ':' not in elem:
-                    warnings.warn('Caught an ill-finalized run in %s'
-                                  % (filename))
-                    trials.append(ast.literal_eval(elem))
-                else:
-                    itrial, info = elem.split(':', 1)
-                    trials.append(ast.literal_eval(itrial))
-                    readmaxevals, readfinalf = info.split('|', 1)
-                    try:
-                        float(readmaxevals)
-                        float(readfinalf)
-                    except ValueError:
-                        raise
-        return datfiles, trials
+                if verbose:
+                    print('Found data files %s.dat and %s.tdat' % (root, root))
+            datfiles.extend((dat, tdat))
+        for trial, maxevals, finalf in runs:
+            if maxevals is None:
+                warnings.warn('Caught an ill-finalized run of instance %s in %s'
+                              % (trial, filename))
+        return datfiles, [trial for trial, _, _ in runs]
 
     with open(filename) as f:
         for i, line in enumerate(f):
@@ -0,0 +1,182 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Transport of data sets to worker processes via shared memory.
+
+`SharedDataSets` copies the `numpy` arrays of data sets, like `_evals`,
+`_maxevals` and `funvals` of a `pproc.DataSet`, once into a single
+`multiprocessing.shared_memory` block. `SharedDataSets.handles` replaces
+data sets in a (nested) `DataSetList`, `list` or `dict` by lightweight
+handles, which are pickled without the array data. Unpickling a handle,
+as done in the worker process receiving it, returns a data set whose
+arrays are read-only views into the shared block.
+
+The block is released with `SharedDataSets.release`, when leaving the
+``with`` block, when the `SharedDataSets` instance or the shared
+`DataSetList` is garbage collected or at exit, whichever comes first.
+
+>>> import pickle
+>>> import cocopp
+>>> from cocopp import shareddata
+>>> from cocopp.benchmark import datagen
+>>> from cocopp.toolsdivers import InfolderGoneWithTheWind
+>>> with InfolderGoneWithTheWind():
+...     folder = datagen.write_experiment('.', 'bbob', functions=[1, 2], dimensions=[2])
+...     print('load data set'); dsl = cocopp.pproc.DataSetList(folder)  # doctest:+ELLIPSIS
+load data set...
+>>> with shareddata.SharedDataSets(dsl) as shared:
+...     dsl2 = pickle.loads(pickle.dumps(shared.handles(dsl)))
+...     len(pickle.dumps(shared.handles(dsl))) < len(pickle.dumps(dsl)) / 2
+...     ds2 = dsl2[0]
+...     type(dsl2).__name__, all(ds2.ert == dsl[0].ert), ds2._evals.flags.writeable
+True
+('DataSetList', True, False)
+
+"""
+
+from __future__ import absolute_import, division, print_function
+import sys
+import weakref
+import numpy as np
+
+_alignment = 64
+"""byte alignment of each array in the shared block"""
+
+_attached = {}
+"""shared memory blocks attached in this process by name, they are kept
+   open as long as the process lives, because views may still refer to them"""
+
+def _shared_memory(**kwargs):
+    """return a `SharedMemory` instance which, when attached to an existing
+    block, is not tracked by this process.
+
+    Otherwise, before Python 3.13, the resource tracker of a worker
+    process would remove the block when the worker exits.
+    """
+    from multiprocessing import shared_memory, resource_tracker
+    if kwargs.get('create') or sys.platform == 'win32':
+        return shared_memory.SharedMemory(**kwargs)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(track=False, **kwargs)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(**kwargs)
+    finally:
+        resource_tracker.register = register
+
+def _attach(block_name):
+    """return the buffer of the shared memory block `block_name`"""
+    if block_name not in _attached:
+        _attached[block_name] = _shared_memory(name=block_name)
+    return _attached[block_name].buf
+
+def _rebuild_dataset(cls, state, arrays):
+    """return a `cls` instance with `state` and read-only views of `arrays`"""
+    ds = cls.__new__(cls)
+    ds.__dict__.update(state)
+    for name, (block_name, offset, shape, dtype) in arrays.items():
+        array = np.ndarray(shape, dtype, buffer=_attach(block_name), offset=offset)
+        array.flags.writeable = False
+        ds.__dict__[name] = array
+    return ds
+
+def _rebuild_list(cls, items, state):
+    """return a `cls` instance, a `list` subclass, with `items` and `state`"""
+    res = list.__new__(cls)
+    list.extend(res, items)
+    res.__dict__.update(state)
+    return res
+
+class _DataSetHandle(object):
+    """pickles to a data set with arrays in shared memory"""
+    def __init__(self, cls, state, arrays):
+        self.cls = cls
+        self.state = state
+        self.arrays = arrays  # name: (block name, offset, shape, dtype)
+    def __reduce__(self):
+        return _rebuild_dataset, (self.cls, self.state, self.arrays)
+
+class _ListHandle(object):
+    """pickles to a `list` subclass, like `DataSetList`, of handles"""
+    def __init__(self, cls, items, state):
+        self.cls = cls
+        self.items = items
+        self.state = state
+    def __reduce__(self):
+        return _rebuild_list, (self.cls, self.items, self.state)
+
+def _release(block):
+    block.close()
+    block.unlink()
+
+class SharedDataSets(object):
+    """Hold the arrays of data sets in a shared memory block.
+
+    `datasets` is an iterable of data sets, typically a `DataSetList`.
+    Only array attributes with a numeric data type are shared, all other
+    attributes are pickled with the handles as usual.
+    """
+    def __init__(self, datasets):
+        self._handles = {}  # id(dataset): handle
+        layout = []
+        size = 0
+        for ds in datasets:
+            if id(ds) in self._handles:
+                continue
+            state, arrays = {}, {}
+            for name, value in ds.__dict__.items():
+                if isinstance(value, np.ndarray) and value.dtype.kind in 'biuf':
+                    arrays[name] = [None, size, value.shape, value.dtype.str]
+                    layout.append((value, size))
+                    size += -(-value.nbytes // _alignment) * _alignment
+                else:
+                    state[name] = value
+            self._handles[id(ds)] = _DataSetHandle(type(ds), state, arrays)
+        self.nbytes = size
+        self._block = _shared_memory(create=True, size=max((size, 1)))
+        for value, offset in layout:
+            view = np.ndarray(value.shape, value.dtype, buffer=self._block.buf, offset=offset)
+            view[...] = value
+            del view  # a remaining view would prevent closing the block
+        for handle in self._handles.values():
+            for spec in handle.arrays.values():
+                spec[0] = self._block.name
+            handle.arrays = dict((name, tuple(spec)) for name, spec in handle.arrays.items())
+        self._finalizer = weakref.finalize(self, _release, self._block)
+        if isinstance(datasets, list):  # release also when `datasets` is freed
+            try:
+                weakref.finalize(datasets, self._finalizer)
+            except TypeError:  # `list` itself has no weak references
+                pass
+
+    def handles(self, obj):
+        """return `obj` with its data sets replaced by handles.
+
+        `obj` is a data set or a `list` or `dict` (or subclass thereof)
+        possibly nested, like a `DataSetList` or a `dict` of those. A
+        data set which was not given when instantiating raises a
+        `KeyError`.
+        """
+        if isinstance(obj, dict):
+            return type(obj)((key, self.handles(value)) for key, value in obj.items())
+        if isinstance(obj, list):
+            items = [self.handles(item) for item in obj]
+            if type(obj) is list:
+                return items
+            return _ListHandle(type(obj), items, dict(getattr(obj, '__dict__', {})))
+        if isinstance(obj, tuple):
+            return tuple(self.handles(item) for item in obj)
+        return self._handles[id(obj)]
+
+    def release(self):
+        """close and remove the shared memory block, calling this more
+        than once has no effect"""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+        return False
@@ -5,11 +5,13 @@
 
 """
 import os, time, warnings
+import io as _io
 import tempfile, shutil
 from collections import OrderedDict as _OrderedDict
 import re as _re
+import bisect as _bisect
+import functools as _functools
 import numpy as np
-from matplotlib import pyplot as plt
 from subprocess import CalledProcessError, STDOUT
 
 from . import genericsettings, testbedsettings
@@ -111,6 +113,87 @@ class InfolderGoneWithTheWind:
                              % (self._target_dir, self.target_dir))
 
 
+@_functools.lru_cache(maxsize=1024)
+def _compile_ignorecase(pattern):
+    """return the compiled case insensitive regular expression `pattern`"""
+    return _re.compile(pattern, _re.IGNORECASE)
+
+_regex_special_characters = '.^$*+?{}[]\\|()'
+
+def _literal_prefix(pattern):
+    """return the lower case string which any match of the regular
+    expression `pattern` with `re.match` starts with.
+
+    >>> from cocopp.toolsdivers import _literal_prefix
+    >>> _literal_prefix('bbob/2009.*cma'), _literal_prefix('ab*c'), _literal_prefix('a|b')
+    ('bbob/2009', 'a', '')
+
+    """
+    if '|' in pattern:
+        return ''
+    prefix = ''
+    for c in pattern:
+        if c in _regex_special_characters:
+            break
+        prefix += c
+    else:
+        return prefix.lower()
+    if pattern[len(prefix)] in '*?{':  # the last character is optional
+        prefix = prefix[:-1]
+    return prefix.lower()
+
+class _SearchIndex(object):
+    """index of the entries of a `StrList` to answer `StrList.find` queries.
+
+    Substrings are searched with `str.find` in the concatenation of all
+    lower case entries, jumping to the next entry after each hit.
+    Regular expressions are only matched against the entries starting
+    with their literal prefix, found by bisection in the sorted lower
+    case entries. The matching indices are memoized per query string.
+    """
+    separator = '\x00'
+    def __init__(self, names):
+        self.names = list(names)
+        self.lower = [name.lower() for name in self.names]
+        self.joined = self.separator.join(self.lower)
+        self.starts = [0]  # start of each entry in `joined`
+        for name in self.lower[:-1]:
+            self.starts.append(self.starts[-1] + len(name) + 1)
+        order = sorted(range(len(self.lower)), key=self.lower.__getitem__)
+        self.sorted_lower = [self.lower[i] for i in order]
+        self.sorted_indices = order
+        self._matches = {}
+
+    def matches(self, s):
+        """return the `frozenset` of indices of the entries matching `s`
+        as substring or as regular expression (see `StrList.find`)"""
+        if s not in self._matches:
+            rex = _compile_ignorecase(s)
+            self._matches[s] = frozenset(self._substring_matches(s.lower())
+                                         | self._regex_matches(rex, s))
+        return self._matches[s]
+
+    def _substring_matches(self, substr):
+        if len(substr) < 3 or self.separator in substr:  # likely to match many entries
+            return set(i for i, name in enumerate(self.lower) if substr in name)
+        res = set()
+        pos = self.joined.find(substr)
+        while pos >= 0:
+            i = _bisect.bisect_right(self.starts, pos) - 1
+            res.add(i)
+            if i + 1 == len(self.starts):
+                break
+            pos = self.joined.find(substr, self.starts[i + 1])
+        return res
+
+    def _regex_matches(self, rex, pattern):
+        if not any(c in _regex_special_characters for c in pattern):
+            return set()  # a match is also a substring match
+        prefix = _literal_prefix(pattern)
+        start = _bisect.bisect_left(self.sorted_lower, prefix)
+        end = _bisect.bisect_left(self.sorted_lower, prefix + '\U0010ffff') if prefix else None
+        return set(i for i in self.sorted_indices[start:end] if rex.match(self.names[i]))
+
 class StrList(list):
     """A list of `str` with search/find functionality.
 
@@ -192,21 +275,73 @@ class StrList(list):
             elif substrs and isinstance(substrs[0], int):  # or a list of indices
                 self._names_found = [self[i] for i in substrs]
                 return StrList(self._names_found)
-        names = list(self)
+        self._names_found = self._find(substrs, leading_strs, self._search_index())
+        return StrList(self._names_found)
+
+    def find_all(self, patterns, leading_strs=()):
+        """return a `list` with the result of `find` for each of `patterns`.
+
+        Each element of `patterns` is a `str` or a `list` of substrings
+        as the argument of `find`. The search index is built or validated
+        only once for all patterns, hence this is much faster than calling
+        `find` for each pattern on a long list.
+
+        >>> from cocopp.toolsdivers import StrList
+        >>> s = StrList(['abc', 'bcd', 'cde', ' cde'])
+        >>> s.find_all(['bc', ['a', 'b'], '.c'])
+        [['abc', 'bcd'], ['abc'], ['bcd', ' cde']]
+
+        Details: `found` is set to the result of the last pattern.
+        """
+        index = self._search_index()
+        res = [StrList(self._find([pattern] if isinstance(pattern, str) else pattern,
+                                  leading_strs, index))
+               for pattern in patterns]
+        if res:
+            self._names_found = list(res[-1])
+        return res
+
+    def _find(self, substrs, leading_strs, index):
+        """return the `list` of names matching all `substrs` using the
+        `_SearchIndex` `index` if it is not `None`"""
+        names = list(self) if index is None else None
+        indices = None  # set of indices of the matching names when using the index
         for s in substrs:
             for ss in leading_strs:
                 for i in range(len(ss)):
                     if s.startswith(ss[i:]):
                         s = s[len(ss[i:]):]  # remove leading part
-            rex = _re.compile(s, _re.IGNORECASE)
+            rex = _compile_ignorecase(s)
             try:
-                names = [name for name in names if rex.match(name) or s.lower() in name.lower()]
+                if index is not None:
+                    matches = index.matches(s)
+                    indices = set(matches) if indices is None else indices & matches
+                else:
+                    names = [name for name in names if rex.match(name) or s.lower() in name.lower()]
             except AttributeError:
                 warnings.warn("arguments to `find` must be strings or a "
                               "single integer or an integer list")
                 raise
-        self._names_found = names
-        return StrList(names)
+        if index is not None:
+            names = list(index.names) if indices is None else [index.names[i] for i in sorted(indices)]
+        return names
+
+    _search_index_min_length = 100
+    """lists with less entries are searched without index"""
+
+    def _search_index(self):
+        """return a `_SearchIndex` of the current entries, or `None` for a
+        short list.
+
+        The index is built on the first search and built anew when the
+        entries have changed since.
+        """
+        if len(self) < self._search_index_min_length:
+            return None
+        index = self.__dict__.get('_index')
+        if index is None or index.names != self:
+            index = self._index = _SearchIndex(self)
+        return index
 
     def find_indices(self, *substrs):
         """same as `find` but returns indices instead of names"""
@@ -296,48 +431,123 @@ def diff_attr(m1, m2, exclude=('_', )):
                     not any(key.startswith(s) for s in exclude)
                     and np.all(getattr(m1, key) != getattr(m2, key))]
 
+class TextFileBuffer(object):
+    """In-memory buffer for text output files which are edited repeatedly.
+
+    `prepend_to_file`, `replace_in_file`, `truncate_latex_command_file`,
+    `read_lines` and `write_lines` use the `text_file_buffer` instance.
+    While it is `active`, edits are kept in memory and each file is
+    written only once by `flush`, via a temporary file which then
+    replaces the original file. The written files are identical to
+    those written without buffer.
+
+    Files written by other means must be `discard`-ed from the buffer.
+
+    >>> import os
+    >>> import cocopp.toolsdivers as td
+    >>> with td.InfolderGoneWithTheWind():
+    ...     _ = td.text_file_buffer.activate()
+    ...     td.prepend_to_file('a.tex', ['b'])
+    ...     td.prepend_to_file('a.tex', ['a'])
+    ...     td.replace_in_file('a.tex', 'b', 'c')
+    ...     assert not os.path.exists('a.tex')
+    ...     td.text_file_buffer.flush()
+    ...     with open('a.tex') as f:
+    ...         print(f.read().split())
+    ['a', 'c']
+
+    """
+    def __init__(self):
+        self.active = False
+        self._texts = _OrderedDict()  # absolute filename -> file content
+
+    def activate(self):
+        """buffer all edits until `flush` is called"""
+        self.active = True
+        return self
+
+    def exists(self, filename):
+        return os.path.abspath(filename) in self._texts or os.path.exists(filename)
+
+    def read_lines(self, filename):
+        """return the lines of `filename` like ``list(open(filename))``"""
+        name = os.path.abspath(filename)
+        if name in self._texts:
+            return list(_io.StringIO(self._texts[name], newline=None))
+        with open(filename, 'r') as f:
+            return list(f)
+
+    def write(self, filename, text):
+        """write `text` into `filename` or into the buffer if `active`"""
+        if self.active:
+            self._texts[os.path.abspath(filename)] = text
+        else:
+            with open(filename, 'w') as f:
+                f.write(text)
+
+    def discard(self, filename):
+        """remove buffered edits of `filename`, which is about to be
+        overwritten"""
+        self._texts.pop(os.path.abspath(filename), None)
+
+    def flush(self, deactivate=True):
+        """write all buffered files, each atomically, and by default
+        stop buffering"""
+        try:
+            for name, text in self._texts.items():
+                tmp_name = '%s.%d.tmp' % (name, os.getpid())
+                with open(tmp_name, 'w') as f:
+                    f.write(text)
+                os.replace(tmp_name, name)
+        finally:
+            self._texts.clear()
+            if deactivate:
+                self.active = False
+
+text_file_buffer = TextFileBuffer()
+"""the buffer used by `prepend_to_file` and friends, activated in
+   `rungeneric.main`"""
+
+def read_lines(filename):
+    """return the lines of `filename` taking into account `text_file_buffer`"""
+    return text_file_buffer.read_lines(filename)
+
+def write_lines(filename, lines):
+    """write `lines` (with line endings) into `filename` or into `text_file_buffer`"""
+    text_file_buffer.write(filename, ''.join(lines))
+
 def prepend_to_file(filename, lines, maxlines=1000, warn_message=None):
     """"prepend lines the tex-command filename """
     try:
-        with open(filename, 'r') as f:
-            lines_to_append = list(f)
+        lines_to_append = text_file_buffer.read_lines(filename)
     except IOError:
         lines_to_append = []
-    with open(filename, 'w') as f:
-        for line in lines:
-            f.write(line + '\n')
-        for i, line in enumerate(lines_to_append):
-            f.write(line)
-            if i > maxlines:
-                print(warn_message)
-                break
-        
+    if len(lines_to_append) > maxlines + 1:
+        lines_to_append = lines_to_append[:maxlines + 2]
+        print(warn_message)
+    write_lines(filename, [line + '\n' for line in lines] + lines_to_append)
+
 def replace_in_file(filename, old_text, new_text):
     """"replace a string in the file with another string"""
 
-    lines = []    
+    lines = []
     try:
-        with open(filename, 'r') as f:
-            lines = list(f)
+        lines = text_file_buffer.read_lines(filename)
     except IOError:
         print('File %s does not exist.' % filename)
-    
-    if lines:    
-        with open(filename, 'w') as f:
-            for line in lines:
-                f.write(line.replace(old_text, new_text))
-        
+
+    if lines:
+        write_lines(filename, [line.replace(old_text, new_text) for line in lines])
+
 def truncate_latex_command_file(filename, keeplines=200):
     """truncate file but keep in good latex shape"""
-    open(filename, 'a').close()
-    with open(filename, 'r') as f:
-        lines = list(f)
-    with open(filename, 'w') as f:
-        for i, line in enumerate(lines):
-            if i > keeplines and line.startswith(r'\providecommand'):
-                break
-            f.write(line)
-    
+    lines = text_file_buffer.read_lines(filename) if text_file_buffer.exists(filename) else []
+    for i, line in enumerate(lines):
+        if i > keeplines and line.startswith(r'\providecommand'):
+            lines = lines[:i]
+            break
+    write_lines(filename, lines)
+
 def strip_pathname(name):
     """remove ../ and ./ and leading/trailing blanks and path separators
     from input string ``name`` and replace any remaining path separator
@@ -472,6 +682,7 @@ def number_to_html(number_as_string):
     return s
 
 def legend(*args, **kwargs):
+   from matplotlib import pyplot as plt
    kwargs.setdefault('framealpha', 0.2)
    try:
       plt.legend(*args, **kwargs)
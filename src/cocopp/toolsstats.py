@@ -6,7 +6,7 @@
 from __future__ import absolute_import, print_function
 import warnings
 import numpy as np
-from . import genericsettings
+from . import genericsettings, profiling
 
 def _has_len(thing):
     try: len(thing)
@@ -250,6 +250,7 @@ def drawSP(runlengths_succ, runlengths_unsucc, percentiles,
                      func=sum
                      # func=lambda x: [sum(x)]
                      ), sorted(runlengths_unsucc))
+    profiling.count('bootstrap samples', int(samplesize))
     # if Nunsucc == 0: # Special case: all success, how can we improve efficiency?
     #    return 
     if 11 < 3 and Nunsucc == 0:  # not tested yet: draw each once without replacement and repeat  
@@ -430,6 +431,7 @@ def draw(data, percentiles, samplesize=1e3, func=sp1, args=()):
        unexpected results.
 
     """
+    profiling.count('bootstrap samples', int(samplesize))
     arrStats = []
     N = len(data)
     adata = np.array(data)  # more efficient indexing
@@ -759,13 +761,7 @@ def significancetest(entry0, entry1, targets):
                         else:
                             FE_umin = np.inf
                         # Determine the function values for FE_umin
-                        prevline = np.array([np.inf] * (entry.funvals.shape[1] - 1))
-                        for curline in entry.funvals:
-                            # only works because the funvals are monotonous
-                            if curline[0] > FE_umin:
-                                break
-                            prevline = curline[1:]
-                        tmpfvalues = prevline.copy()
+                        tmpfvalues = entry.funvals_at([FE_umin])[0]
                         # tmpfvalues = entry.finalfunvals
                         # if (tmpfvalues != entry.finalfunvals).any():
                             # set_trace()
@@ -788,13 +784,7 @@ def significancetest(entry0, entry1, targets):
                     # 2) determine the function values for FE_umin
                     fvalues = []
                     for j, entry in enumerate((entry0, entry1)):
-                        prevline = np.array([np.inf] * entry.nbRuns())
-                        for curline in entry.funvals:
-                            # only works because the funvals are monotonous
-                            if curline[0] > FE_umin:
-                                break
-                            prevline = curline[1:]
-                        fvalues.append(prevline)
+                        fvalues.append(entry.funvals_at([FE_umin])[0])
 
         # 2. 3. 4. Collect data for the significance test:
         curdata = []  # current data 
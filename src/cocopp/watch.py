@@ -0,0 +1,140 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Regeneration of the post-processing outputs while experiments run.
+
+With option ``--watch``, `cocopp.main` first post-processes all data as
+usual and then checks the local input folders for new data every
+`genericsettings.watch_interval` seconds. New data are read
+incrementally with `livedata.LiveDataSetList`. The changed data sets are
+identified by their ``(function, dimension)`` pair, the problem, and
+only the figures, tables and html pages depending on these problems are
+generated anew, see the `problems` argument of `rungeneric1.main` and
+`rungenericmany.main`.
+
+>>> from cocopp import watch
+>>> from cocopp.benchmark import datagen
+>>> from cocopp.toolsdivers import InfolderGoneWithTheWind
+>>> with InfolderGoneWithTheWind():
+...     folder = datagen.write_experiment('.', 'bbob', functions=[1, 2], dimensions=[2, 3],
+...                                       instances=[1, 2])
+...     print('load data set'); data = watch.live_data([folder])  # doctest:+ELLIPSIS
+...     _ = datagen.write_experiment('.', 'bbob', functions=[2], dimensions=[2, 3],
+...                                  instances=[1, 2, 3])  # appends to the files of f2
+...     print('refresh'); changed = watch.refresh(data)  # doctest:+ELLIPSIS
+load data set...
+refresh...
+>>> sorted(changed)
+[(2, 2), (2, 3)]
+>>> dsl = data[folder]
+>>> watch.affected(dsl.dictByFunc()[1], changed), watch.affected(dsl.dictByDim(), changed)
+(False, True)
+>>> [ds.funcId for ds in watch.select_functions(dsl, changed)]
+[2, 2]
+
+Pages which are written anew, like ``pptable.html``, keep the tables of
+the dimensions without new data (up to the bootstrapped dispersions):
+
+>>> import glob, os, re
+>>> import cocopp
+>>> def table(html, dim):
+...     marker = '<!--pptableHtml_%d-->' % dim
+...     end = html.index(marker)
+...     return re.sub(r' \(.*?\)', '', html[html.rindex('<table', 0, end):end])
+>>> with InfolderGoneWithTheWind():
+...     folder = datagen.write_experiment('.', 'bbob', functions=[1, 2], dimensions=[2, 3],
+...                                       instances=[1, 2])
+...     cocopp.findfiles.output_folder_time = 'watch'  # as in `cocopp.main` with --watch
+...     print('postprocess'); _ = cocopp.main(['--tab-only', '--no-interactive',
+...                                            '-o', 'out', folder])  # doctest:+ELLIPSIS
+...     cocopp.findfiles.output_folder_time = 'watch'
+...     filename = glob.glob(os.path.join('out', '*', 'pptable.html'))[0]
+...     with open(filename) as f:
+...         before = f.read()
+...     print('update'); _ = cocopp.rungeneric1.main(folder, 'out', ['--tab-only', '-o', 'out', folder],
+...                                                  None, {(2, 2)})  # doctest:+ELLIPSIS
+...     cocopp.findfiles.output_folder_time = None
+...     with open(filename) as f:
+...         after = f.read()
+postprocess...
+update...
+>>> table(after, 3) == table(before, 3), after.count('<table')
+(True, 2)
+
+"""
+
+from __future__ import absolute_import, division, print_function
+import os
+import time
+from . import genericsettings, pproc
+
+
+def live_data(args):
+    """return a `dict` of a `livedata.LiveDataSetList` for each local
+    folder in `args`, archived data are not expected to change"""
+    from .livedata import LiveDataSetList
+    return dict((arg, LiveDataSetList(arg)) for arg in args if os.path.isdir(arg))
+
+def refresh(data):
+    """read new data into the `dict` `data` from `live_data` and return
+    the `set` of ``(funcId, dim)`` pairs of the changed data sets"""
+    res = set()
+    for dsl in data.values():
+        res.update((ds.funcId, ds.dim) for ds in dsl.refresh())
+    return res
+
+def affected(data, problems):
+    """return whether `data` contain a data set of `problems`.
+
+    `data` is a list of data sets or a (nested) `dict` of those, like
+    the ``dictAlg`` used in the post-processing. With ``problems is
+    None`` all outputs are generated and `True` is returned.
+    """
+    if problems is None:
+        return True
+    if isinstance(data, dict):
+        return any(affected(value, problems) for value in data.values())
+    return any((ds.funcId, ds.dim) in problems for ds in data)
+
+def select_functions(data, problems):
+    """return `data` with only the data sets of the functions in `problems`.
+
+    `data` is a `DataSetList` or a `dict` of those. Outputs of a single
+    function over all dimensions, like the scaling figures, are
+    generated anew from the returned data. With ``problems is None``,
+    `data` is returned.
+    """
+    if problems is None:
+        return data
+    if isinstance(data, dict):
+        return type(data)((key, select_functions(value, problems))
+                          for key, value in data.items())
+    functions = set(f for f, _ in problems)
+    return pproc.DataSetList([ds for ds in data if ds.funcId in functions])
+
+def watch(data, postprocess, interval=None, cycles=None):
+    """call ``postprocess(problems)`` whenever `refresh` finds new `data`.
+
+    Check for new data every `interval` seconds, by default
+    `genericsettings.watch_interval`, until `cycles` checks are done or
+    the user interrupts with Ctrl-C.
+    """
+    if interval is None:
+        interval = genericsettings.watch_interval
+    print('Watching %d folder%s for new data every %s seconds, stop with Ctrl-C'
+          % (len(data), 's' if len(data) != 1 else '', str(interval)))
+    cycle = 0
+    try:
+        while cycles is None or cycle < cycles:
+            cycle += 1
+            time.sleep(interval)
+            t0 = time.time()
+            problems = refresh(data)
+            if not problems:
+                continue
+            print('\n%s: new data of %d problem%s' % (time.strftime('%H:%M:%S'), len(problems),
+                                                     's' if len(problems) > 1 else ''))
+            postprocess(problems)
+            print('  outputs updated in %.1f seconds' % (time.time() - t0))
+    except KeyboardInterrupt:
+        print('\nWatching stopped')